@@ -0,0 +1,481 @@
+"""Benchmarks of the overhead of the agent loop, independent of any model provider.
+
+The models used are `TestModel` and `FunctionModel`, so the benchmarks run offline and measure only the cost of the
+framework: preparing tools, building and validating messages, running tools, validating results and processing
+streamed events.
+
+The `agent_*` benchmarks measure start up: creating agents with new tool functions, and completing their first
+run, when tools' schemas are built. `agent_warm_start` reuses the same functions, whose schemas are cached.
+
+The `import` benchmarks measure importing a module in a new process, as reported by `python -X importtime`.
+
+Run all benchmarks and write the results to a JSON file with:
+
+    uv run python -m benchmarks.agent_overhead --output benchmarks.json
+
+then compare the results of another commit against them with:
+
+    uv run python -m benchmarks.agent_overhead --compare benchmarks.json
+"""
+
+from __future__ import annotations as _annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from collections.abc import AsyncIterator, Awaitable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Literal
+
+from pydantic import BaseModel
+
+import pydantic_ai
+from pydantic_ai import Agent, Tool
+from pydantic_ai._parts_manager import ModelResponsePartsManager
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+TOOL_COUNTS = 1, 10, 50, 200
+HISTORY_LENGTHS = 1, 10, 100, 500
+CONCURRENT_RUNS = 1, 10, 100, 1000
+STARTUP_TOOL_COUNTS = 10, 100
+IMPORT_MODULES = 'pydantic_ai', 'pydantic_ai.messages', 'pydantic_graph'
+STREAM_EVENTS = 1000
+LONG_STREAM_EVENTS = 1000, 20_000
+STREAMED_LIST_ITEMS = 100, 1000
+
+
+@dataclass
+class Case:
+    """A benchmark, timing an operation which is repeated `iterations` times."""
+
+    name: str
+    setup: Callable[[], Callable[[int], float]]
+    """Prepares the benchmark and returns a function which runs the operation `n` times and returns the elapsed time."""
+    iterations: int
+    params: dict[str, int | str] = field(default_factory=dict)
+    units: int = 1
+    """Number of units, e.g. runs or events, processed by each operation."""
+    unit: str = 'run'
+    steps: int = 1
+    """Number of model requests in each run."""
+
+    @property
+    def key(self) -> str:
+        """Identifies the benchmark and its parameters, to compare results between commits."""
+        return ' '.join([self.name, *(f'{k}={v}' for k, v in self.params.items())])
+
+
+@dataclass
+class Result:
+    """The timings of a benchmark."""
+
+    case: Case
+    iterations: int
+    times: list[float]
+    """Elapsed time in seconds of each repeat."""
+
+    @property
+    def seconds_per_unit(self) -> float:
+        """Time per unit of the fastest repeat, which is least affected by noise from other processes."""
+        return min(self.times) / (self.iterations * self.case.units)
+
+    def to_dict(self) -> dict[str, Any]:
+        case = self.case
+        per_unit = self.seconds_per_unit
+        return {
+            'key': case.key,
+            'name': case.name,
+            'params': case.params,
+            'unit': case.unit,
+            'units': self.iterations * case.units,
+            'repeats': len(self.times),
+            'min_time': min(self.times),
+            'median_time': statistics.median(self.times),
+            'per_second': 1 / per_unit,
+            'us_per_unit': per_unit * 1e6,
+            'us_per_step': per_unit * 1e6 / case.steps if case.unit == 'run' else None,
+        }
+
+
+def _async_timer(operation: Callable[[], Awaitable[Any]]) -> Callable[[int], float]:
+    """Time `operation` in a new event loop, after running it once to warm up."""
+
+    def timer(n: int) -> float:
+        async def main() -> float:
+            await operation()
+            start = perf_counter()
+            for _ in range(n):
+                await operation()
+            return perf_counter() - start
+
+        return asyncio.run(main())
+
+    return timer
+
+
+def _sync_timer(operation: Callable[[], Any]) -> Callable[[int], float]:
+    def timer(n: int) -> float:
+        operation()
+        start = perf_counter()
+        for _ in range(n):
+            operation()
+        return perf_counter() - start
+
+    return timer
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    postcode: str
+
+
+class Person(BaseModel):
+    name: str
+    age: int
+    email: str
+    addresses: list[Address]
+    tags: list[str]
+
+
+def _run(agent: Agent[None, Any], **kwargs: Any) -> Callable[[], Awaitable[Any]]:
+    return lambda: agent.run('Hello', **kwargs)
+
+
+def _run_sync_timer(agent: Agent[None, Any]) -> Callable[[int], float]:
+    timer = _sync_timer(lambda: agent.run_sync('Hello'))
+
+    def run_sync_timer(n: int) -> float:
+        # `run_sync` runs in the current event loop, which `asyncio.run` unsets when it completes
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return timer(n)
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    return run_sync_timer
+
+
+def _run_stream(agent: Agent[None, Any]) -> Callable[[], Awaitable[Any]]:
+    async def operation() -> Any:
+        async with agent.run_stream('Hello') as result:
+            return await result.get_data()
+
+    return operation
+
+
+def _call_first_tool(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+    """Call the first tool, then respond with text once it has returned."""
+    if any(isinstance(part, ToolReturnPart) for part in messages[-1].parts):
+        return ModelResponse.from_text('done')
+    return ModelResponse(parts=[ToolCallPart.from_raw_args(info.function_tools[0].name, {'x': 1})])
+
+
+def _tools_agent(count: int) -> Agent[None, str]:
+    def tool(x: int) -> int:
+        return x
+
+    tools = [Tool(tool, name=f'tool_{i}', description=f'Tool number {i}.') for i in range(count)]
+    return Agent(FunctionModel(_call_first_tool), tools=tools)
+
+
+def _new_tool_functions(count: int) -> list[Callable[..., Any]]:
+    """Create new tool functions, which haven't had their schemas built, like those of a freshly started process."""
+
+    def make_tool(i: int) -> Callable[..., Any]:
+        def tool(city: str, days: int = 1, units: Literal['metric', 'imperial'] = 'metric') -> str:
+            """Get the weather forecast for a city.
+
+            Args:
+                city: The city to get the forecast for.
+                days: The number of days to forecast.
+                units: The units of the forecast.
+            """
+            return city
+
+        tool.__name__ = tool.__qualname__ = f'tool_{i}'
+        return tool
+
+    return [make_tool(i) for i in range(count)]
+
+
+def _construct_agent(count: int) -> Callable[[], Any]:
+    """Create an agent with new tools."""
+    return lambda: Agent(TestModel(call_tools=[]), tools=_new_tool_functions(count))
+
+
+def _start_agent(count: int, functions: list[Callable[..., Any]] | None = None) -> Callable[[], Awaitable[Any]]:
+    """Create an agent and complete its first run, with new tools unless `functions` are given."""
+
+    async def operation() -> Any:
+        agent = Agent(TestModel(call_tools=[]), tools=functions or _new_tool_functions(count))
+        return await agent.run('Hello')
+
+    return operation
+
+
+def import_time(module: str) -> float:
+    """Time importing `module` in a new process, in seconds, as reported by `python -X importtime`."""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True, check=True
+    )
+    # the last line is the module itself: "import time: <self us> | <cumulative us> | <module>"
+    _, cumulative, name = process.stderr.splitlines()[-1].removeprefix('import time:').split('|')
+    assert name.strip() == module, f'unexpected importtime output for {module}'
+    return int(cumulative) / 1e6
+
+
+def _import_timer(module: str) -> Callable[[int], float]:
+    def timer(n: int) -> float:
+        return sum(import_time(module) for _ in range(n))
+
+    return timer
+
+
+def _history(length: int) -> list[ModelMessage]:
+    messages: list[ModelMessage] = []
+    for i in range(length):
+        if i % 2:
+            messages.append(ModelResponse(parts=[TextPart(content=f'Response {i}')]))
+        else:
+            messages.append(ModelRequest(parts=[UserPromptPart(content=f'Prompt {i}')]))
+    return messages
+
+
+def _concurrent_runs(agent: Agent[None, str], count: int) -> Callable[[], Awaitable[Any]]:
+    return lambda: asyncio.gather(*(agent.run('Hello') for _ in range(count)))
+
+
+def _text_deltas(count: int = STREAM_EVENTS) -> None:
+    manager = ModelResponsePartsManager()
+    for _ in range(count):
+        manager.handle_text_delta(vendor_part_id='content', content='token ')
+    manager.get_parts()
+
+
+def _tool_call_deltas(count: int = STREAM_EVENTS) -> None:
+    manager = ModelResponsePartsManager()
+    manager.handle_tool_call_delta(vendor_part_id='call', tool_name='tool', args='{"x": "', tool_call_id='call-1')
+    for _ in range(count - 1):
+        manager.handle_tool_call_delta(vendor_part_id='call', tool_name=None, args='token ', tool_call_id=None)
+    manager.get_parts()
+
+
+def _stream_list(count: int) -> Callable[[], Awaitable[Any]]:
+    async def stream_function(_messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        assert info.result_tools is not None
+        person = '{"name": "person", "age": 42, "email": "person@example.com", "addresses": [], "tags": ["a", "b"]}'
+        yield {0: DeltaToolCall(name=info.result_tools[0].name, json_args='{"response": [')}
+        for _ in range(count - 1):
+            yield {0: DeltaToolCall(json_args=f'{person}, ')}
+        yield {0: DeltaToolCall(json_args=f'{person}]}}')}
+
+    agent = Agent(FunctionModel(stream_function=stream_function), result_type=list[Person])
+
+    async def operation() -> Any:
+        async with agent.run_stream('Hello') as result:
+            async for _ in result.stream(debounce_by=None):
+                pass
+
+    return operation
+
+
+def cases() -> Iterator[Case]:
+    """All the benchmarks, each one is only set up when it runs."""
+    yield Case('run', lambda: _async_timer(_run(Agent(TestModel()))), iterations=2000)
+    yield Case('run_sync', lambda: _run_sync_timer(Agent(TestModel())), iterations=500)
+    yield Case('run_stream', lambda: _async_timer(_run_stream(Agent(TestModel()))), iterations=1000)
+    yield Case('structured_result', lambda: _async_timer(_run(Agent(TestModel(), result_type=Person))), iterations=1000)
+    yield Case(
+        'structured_result_stream',
+        lambda: _async_timer(_run_stream(Agent(TestModel(), result_type=Person))),
+        iterations=500,
+    )
+    for count in TOOL_COUNTS:
+        yield Case(
+            'tools',
+            lambda count=count: _async_timer(_run(_tools_agent(count))),
+            iterations=max(20, 2000 // count),
+            params={'tools': count},
+            steps=2,
+        )
+    for length in HISTORY_LENGTHS:
+        history = _history(length)
+        yield Case(
+            'history',
+            lambda history=history: _async_timer(_run(Agent(TestModel()), message_history=history)),
+            iterations=max(20, 2000 // length),
+            params={'messages': length},
+        )
+    for count in CONCURRENT_RUNS:
+        yield Case(
+            'concurrent_runs',
+            lambda count=count: _async_timer(_concurrent_runs(Agent(TestModel()), count)),
+            iterations=max(2, 2000 // count),
+            params={'concurrency': count},
+            units=count,
+        )
+    for count in STARTUP_TOOL_COUNTS:
+        yield Case(
+            'agent_construction',
+            lambda count=count: _sync_timer(_construct_agent(count)),
+            iterations=max(5, 2000 // count),
+            params={'tools': count},
+            unit='agent',
+        )
+        yield Case(
+            'agent_cold_start',
+            lambda count=count: _async_timer(_start_agent(count)),
+            iterations=max(5, 500 // count),
+            params={'tools': count},
+            unit='agent',
+        )
+        yield Case(
+            'agent_warm_start',
+            lambda count=count: _async_timer(_start_agent(count, _new_tool_functions(count))),
+            iterations=max(5, 500 // count),
+            params={'tools': count},
+            unit='agent',
+        )
+    for module in IMPORT_MODULES:
+        yield Case(
+            'import',
+            lambda module=module: _import_timer(module),
+            iterations=5,
+            params={'module': module},
+            unit='import',
+        )
+    yield Case('text_deltas', lambda: _sync_timer(_text_deltas), iterations=200, units=STREAM_EVENTS, unit='event')
+    for count in LONG_STREAM_EVENTS:
+        # the time per event should be independent of the length of the stream
+        yield Case(
+            'long_text_stream',
+            lambda count=count: _sync_timer(lambda: _text_deltas(count)),
+            iterations=max(5, 200_000 // count),
+            params={'events': count},
+            units=count,
+            unit='event',
+        )
+    yield Case(
+        'tool_call_deltas', lambda: _sync_timer(_tool_call_deltas), iterations=200, units=STREAM_EVENTS, unit='event'
+    )
+    for count in LONG_STREAM_EVENTS:
+        yield Case(
+            'long_tool_call_stream',
+            lambda count=count: _sync_timer(lambda: _tool_call_deltas(count)),
+            iterations=max(5, 200_000 // count),
+            params={'events': count},
+            units=count,
+            unit='event',
+        )
+
+    for count in STREAMED_LIST_ITEMS:
+        # the time per item should be independent of the length of the list
+        yield Case(
+            'streamed_list_result',
+            lambda count=count: _async_timer(_stream_list(count)),
+            iterations=max(2, 20_000 // count),
+            params={'items': count},
+            units=count,
+            unit='item',
+        )
+
+
+def run_benchmarks(
+    *, repeat: int = 5, scale: float = 1, match: str | None = None, print_results: bool = True
+) -> list[Result]:
+    """Run the benchmarks.
+
+    Args:
+        repeat: Number of times each benchmark is timed.
+        scale: Factor applied to the number of iterations of each benchmark.
+        match: Only run benchmarks whose key contains this string.
+        print_results: Whether to print each result once it's complete.
+    """
+    results: list[Result] = []
+    for case in cases():
+        if match is not None and match not in case.key:
+            continue
+        iterations = max(1, round(case.iterations * scale))
+        timer = case.setup()
+        result = Result(case, iterations, [timer(iterations) for _ in range(repeat)])
+        results.append(result)
+        if print_results:
+            data = result.to_dict()
+            print(
+                f'{case.key:<32} {data["per_second"]:>12,.0f} {case.unit}s/s {data["us_per_unit"]:>10.1f} us/{case.unit}'
+            )
+    return results
+
+
+def metadata() -> dict[str, Any]:
+    """Details of the environment the benchmarks ran in."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'pydantic_ai_version': pydantic_ai.__version__,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'commit': commit,
+        'timestamp': datetime.now(tz=timezone.utc).isoformat(),
+    }
+
+
+def compare(results: list[Result], baseline: dict[str, Any]) -> list[str]:
+    """Compare results with those of a previous run, returning a line for each benchmark in both."""
+    baseline_results = {r['key']: r for r in baseline['results']}
+    lines: list[str] = []
+    for result in results:
+        if (previous := baseline_results.get(result.case.key)) is not None:
+            current = result.to_dict()['us_per_unit']
+            change = current / previous['us_per_unit'] - 1
+            lines.append(
+                f'{result.case.key:<32} {previous["us_per_unit"]:>10.1f} -> {current:>10.1f} us {change:>+8.1%}'
+            )
+    return lines
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument('--output', type=Path, help='Write the results as JSON to this file.')
+    parser.add_argument('--compare', type=Path, help='Compare the results with a JSON file written by `--output`.')
+    parser.add_argument('-k', '--match', help='Only run benchmarks whose name and parameters contain this string.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of times each benchmark is timed.')
+    parser.add_argument('--quick', action='store_true', help='Run each benchmark for fewer iterations.')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(repeat=args.repeat, scale=0.05 if args.quick else 1, match=args.match)
+    if args.output:
+        data = {'metadata': metadata(), 'results': [r.to_dict() for r in results]}
+        args.output.write_text(json.dumps(data, indent=2) + '\n')
+    if args.compare:
+        print(f'\nCompared with {args.compare}:')
+        for line in compare(results, json.loads(args.compare.read_text())):
+            print(line)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,19 +1,52 @@
+from importlib import import_module
 from importlib.metadata import version
+from typing import TYPE_CHECKING, Any
 
-from .agent import Agent, capture_run_messages
-from .exceptions import AgentRunError, ModelRetry, UnexpectedModelBehavior, UsageLimitExceeded, UserError
-from .tools import RunContext, Tool
+from .exceptions import (
+    AgentRunError,
+    AllModelsFailed,
+    ModelRetry,
+    ToolTimeout,
+    UnexpectedModelBehavior,
+    UsageLimitExceeded,
+    UserError,
+)
+
+if TYPE_CHECKING:
+    from .agent import Agent, capture_run_messages
+    from .tools import RunContext, Tool, ToolCache
 
 __all__ = (
     'Agent',
     'capture_run_messages',
     'RunContext',
     'Tool',
+    'ToolCache',
     'AgentRunError',
+    'AllModelsFailed',
     'ModelRetry',
     'UnexpectedModelBehavior',
+    'ToolTimeout',
     'UsageLimitExceeded',
     'UserError',
     '__version__',
 )
 __version__ = version('pydantic_ai_slim')
+
+# the agent and tools are imported on first use, so importing e.g. `pydantic_ai.messages` doesn't import
+# the agent's dependencies
+_lazy_imports = {
+    'Agent': 'agent',
+    'capture_run_messages': 'agent',
+    'RunContext': 'tools',
+    'Tool': 'tools',
+    'ToolCache': 'tools',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if module := _lazy_imports.get(name):
+        value = getattr(import_module(f'.{module}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,222 @@
+from __future__ import annotations as _annotations
+
+import json
+import re
+from typing import Any, Union
+
+from . import _utils
+
+__all__ = ('PartialJsonParser',)
+
+_WHITESPACE_RE = re.compile(r'[ \t\r\n]*')
+_STRING_SPECIAL_RE = re.compile(r'["\\]')
+_SCALAR_RE = re.compile(r'[^ \t\r\n"\[\]{},:]*')
+_NUMBER_RE = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?')
+_LITERALS: dict[str, Any] = {'true': True, 'false': False, 'null': None}
+
+# what the parser expects to come next, outside strings and scalars
+_VALUE = 0
+_VALUE_OR_END = 1
+_KEY = 2
+_KEY_OR_END = 3
+_COLON = 4
+_COMMA_OR_END = 5
+
+JsonContainer = Union[dict[str, Any], list[Any]]
+
+
+class PartialJsonParser:
+    """Parser of a JSON document received in chunks, which can produce the value received so far after each chunk.
+
+    Unlike parsing all the text received so far with `pydantic_core.from_json(text, allow_partial='trailing-strings')`
+    after each chunk, each character is only parsed once, so the cost of each chunk is proportional to its length.
+
+    The partial value matches `from_json`'s: an incomplete trailing string is included, incomplete numbers, literals
+    and keys are omitted. Anything after the end of the document is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._root: Any = _utils.UNSET
+        self._done = False
+        self._expect = _VALUE
+        # the containers being parsed, outermost first, and the key of the value being parsed in each dict
+        self._stack: list[JsonContainer] = []
+        self._keys: list[str | None] = []
+        # the raw text of the string or scalar being parsed, if any
+        self._string: list[str] | None = None
+        self._string_is_key = False
+        self._escaped = False
+        self._scalar: list[str] | None = None
+        # the container an incomplete trailing value was added to by `partial_value`, removed by the next `feed`
+        self._tail_container: JsonContainer | None = None
+
+    def feed(self, chunk: str) -> None:
+        """Parse the next chunk of the document.
+
+        Raises:
+            ValueError: If the document isn't valid JSON.
+        """
+        self._remove_tail()
+        pos = 0
+        end = len(chunk)
+        while pos < end:
+            if self._string is not None:
+                pos = self._feed_string(chunk, pos)
+                continue
+            if self._scalar is not None:
+                match = _SCALAR_RE.match(chunk, pos)
+                assert match is not None
+                self._scalar.append(match.group())
+                pos = match.end()
+                if pos < end:
+                    self._end_scalar()
+                continue
+            if self._done:
+                break
+
+            pos = _WHITESPACE_RE.match(chunk, pos).end()  # pyright: ignore[reportOptionalMemberAccess]
+            if pos == end:
+                break
+            char = chunk[pos]
+            expect = self._expect
+            top = self._stack[-1] if self._stack else None
+            if char == '"' and expect in (_VALUE, _VALUE_OR_END, _KEY, _KEY_OR_END):
+                self._string = []
+                self._string_is_key = expect in (_KEY, _KEY_OR_END)
+                pos += 1
+            elif char in '{[' and expect in (_VALUE, _VALUE_OR_END):
+                container: JsonContainer = {} if char == '{' else []
+                self._add_value(container)
+                self._stack.append(container)
+                self._keys.append(None)
+                self._expect = _KEY_OR_END if char == '{' else _VALUE_OR_END
+                pos += 1
+            elif (char == '}' and expect in (_KEY_OR_END, _COMMA_OR_END) and isinstance(top, dict)) or (
+                char == ']' and expect in (_VALUE_OR_END, _COMMA_OR_END) and isinstance(top, list)
+            ):
+                self._stack.pop()
+                self._keys.pop()
+                self._end_value()
+                pos += 1
+            elif char == ',' and expect == _COMMA_OR_END:
+                self._expect = _KEY if isinstance(top, dict) else _VALUE
+                pos += 1
+            elif char == ':' and expect == _COLON:
+                self._expect = _VALUE
+                pos += 1
+            elif char not in '"{}[],:' and expect in (_VALUE, _VALUE_OR_END):
+                self._scalar = []
+            else:
+                raise ValueError(f'Invalid JSON: unexpected {char!r}')
+
+    @property
+    def complete(self) -> bool:
+        """Whether the whole document has been received."""
+        return self._done
+
+    def partial_value(self) -> Any:
+        """Get the value parsed so far, or `None` if no value has been started.
+
+        Containers in the value are updated in place by later calls to `feed`, so must be copied to be kept.
+
+        Raises:
+            ValueError: If the document ended with an invalid literal or number.
+        """
+        tail: Any = _utils.UNSET
+        if self._string is not None and not self._string_is_key:
+            raw = ''.join(self._string)
+            self._string[:] = [raw]
+            try:
+                tail = _decode_string(raw)
+            except ValueError:
+                # the string ends part way through an escape sequence
+                pass
+        elif self._scalar is not None:
+            raw = ''.join(self._scalar)
+            if raw in _LITERALS or _NUMBER_RE.fullmatch(raw):
+                tail = _parse_scalar(raw)
+
+        if not isinstance(tail, _utils.Unset):
+            if not self._stack:
+                return tail
+            self._add_value(tail)
+            self._tail_container = self._stack[-1]
+        return None if isinstance(self._root, _utils.Unset) else self._root
+
+    def _feed_string(self, chunk: str, pos: int) -> int:
+        assert self._string is not None
+        start = pos
+        if self._escaped:
+            self._escaped = False
+            pos += 1
+        while True:
+            match = _STRING_SPECIAL_RE.search(chunk, pos)
+            if match is None:
+                self._string.append(chunk[start:])
+                return len(chunk)
+            if match.group() == '\\':
+                if match.end() == len(chunk):
+                    self._escaped = True
+                    self._string.append(chunk[start:])
+                    return len(chunk)
+                pos = match.end() + 1
+                continue
+
+            self._string.append(chunk[start : match.start()])
+            value = _decode_string(''.join(self._string))
+            self._string = None
+            if self._string_is_key:
+                self._keys[-1] = value
+                self._expect = _COLON
+            else:
+                self._add_value(value)
+                self._end_value()
+            return match.end()
+
+    def _end_scalar(self) -> None:
+        assert self._scalar is not None
+        value = _parse_scalar(''.join(self._scalar))
+        self._scalar = None
+        self._add_value(value)
+        self._end_value()
+
+    def _add_value(self, value: Any) -> None:
+        if not self._stack:
+            self._root = value
+        else:
+            top = self._stack[-1]
+            if isinstance(top, dict):
+                key = self._keys[-1]
+                assert key is not None
+                top[key] = value
+            else:
+                top.append(value)
+
+    def _end_value(self) -> None:
+        if self._stack:
+            self._expect = _COMMA_OR_END
+        else:
+            self._done = True
+
+    def _remove_tail(self) -> None:
+        container = self._tail_container
+        if container is not None:
+            self._tail_container = None
+            if isinstance(container, dict):
+                del container[self._keys[-1]]  # pyright: ignore[reportArgumentType]
+            else:
+                container.pop()
+
+
+def _decode_string(raw: str) -> str:
+    return json.loads(f'"{raw}"')
+
+
+def _parse_scalar(raw: str) -> Any:
+    try:
+        return _LITERALS[raw]
+    except KeyError:
+        pass
+    if _NUMBER_RE.fullmatch(raw):
+        return json.loads(raw)
+    raise ValueError(f'Invalid JSON: unexpected value {raw!r}')
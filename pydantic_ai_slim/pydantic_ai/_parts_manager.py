@@ -14,11 +14,12 @@ event-emitting logic.
 from __future__ import annotations as _annotations
 
 from collections.abc import Hashable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Any, Union
 
 from pydantic_ai.exceptions import UnexpectedModelBehavior
 from pydantic_ai.messages import (
+    ArgsJson,
     ModelResponsePart,
     ModelResponseStreamEvent,
     PartDeltaEvent,
@@ -53,6 +54,12 @@ class ModelResponsePartsManager:
     """A list of parts (text or tool calls) that make up the current state of the model's response."""
     _vendor_id_to_part_index: dict[VendorId, int] = field(default_factory=dict, init=False)
     """Maps a vendor's "part" ID (if provided) to the index in `_parts` where that part resides."""
+    _chunks: dict[int, list[str]] = field(default_factory=dict, init=False)
+    """Text deltas, or JSON argument deltas, not yet applied to the `TextPart` or `ToolCallPart` at each index.
+
+    Deltas are only joined onto their part when the parts are requested, since appending each delta to the part's
+    content or arguments would copy the whole string every time, taking quadratic time for long responses.
+    """
 
     def get_parts(self) -> list[ModelResponsePart]:
         """Return only model response parts that are complete (i.e., not ToolCallPartDelta's).
@@ -60,6 +67,8 @@ class ModelResponsePartsManager:
         Returns:
             A list of ModelResponsePart objects. ToolCallPartDelta objects are excluded.
         """
+        for part_index in list(self._chunks):
+            self._apply_chunks(part_index)
         return [p for p in self._parts if not isinstance(p, ToolCallPartDelta)]
 
     def handle_text_delta(
@@ -114,11 +123,10 @@ class ModelResponsePartsManager:
             self._parts.append(part)
             return PartStartEvent(index=new_part_index, part=part)
         else:
-            # Update the existing TextPart with the new content delta
-            existing_text_part, part_index = existing_text_part_and_index
-            part_delta = TextPartDelta(content_delta=content)
-            self._parts[part_index] = part_delta.apply(existing_text_part)
-            return PartDeltaEvent(index=part_index, delta=part_delta)
+            # Record the content delta, it's applied to the existing TextPart when the parts are requested
+            _, part_index = existing_text_part_and_index
+            self._chunks.setdefault(part_index, []).append(content)
+            return PartDeltaEvent(index=part_index, delta=TextPartDelta(content_delta=content))
 
     def handle_tool_call_delta(
         self,
@@ -185,9 +193,23 @@ class ModelResponsePartsManager:
             if isinstance(part, ToolCallPart):
                 return PartStartEvent(index=new_part_index, part=part)
         else:
-            # Update the existing part or delta with the new information
             existing_part, part_index = existing_matching_part_and_index
             delta = ToolCallPartDelta(tool_name_delta=tool_name, args_delta=args, tool_call_id=tool_call_id)
+            if (
+                isinstance(existing_part, ToolCallPart)
+                and isinstance(existing_part.args, ArgsJson)
+                and tool_name is None
+                and isinstance(args, str)
+                and tool_call_id in (None, existing_part.tool_call_id)
+            ):
+                # Only JSON arguments are being added, record them, they're applied when the parts are requested
+                self._chunks.setdefault(part_index, []).append(args)
+                return PartDeltaEvent(index=part_index, delta=delta)
+
+            # Update the existing part or delta with the new information
+            self._apply_chunks(part_index)
+            existing_part = self._parts[part_index]
+            assert isinstance(existing_part, (ToolCallPart, ToolCallPartDelta)), 'the part was checked above'
             updated_part = delta.apply(existing_part)
             self._parts[part_index] = updated_part
             if isinstance(updated_part, ToolCallPart):
@@ -232,8 +254,54 @@ class ModelResponsePartsManager:
             if maybe_part_index is not None:
                 new_part_index = maybe_part_index
                 self._parts[new_part_index] = new_part
+                self._chunks.pop(new_part_index, None)
             else:
                 new_part_index = len(self._parts)
                 self._parts.append(new_part)
             self._vendor_id_to_part_index[vendor_part_id] = new_part_index
         return PartStartEvent(index=new_part_index, part=new_part)
+
+    def _apply_chunks(self, part_index: int) -> None:
+        """Join the pending deltas of the part at `part_index` onto it."""
+        chunks = self._chunks.pop(part_index, None)
+        if chunks is None:
+            return
+        part = self._parts[part_index]
+        if isinstance(part, TextPart):
+            self._parts[part_index] = replace(part, content=part.content + ''.join(chunks))
+        else:
+            assert isinstance(part, ToolCallPart) and isinstance(part.args, ArgsJson), 'unexpected part with deltas'
+            self._parts[part_index] = replace(part, args=ArgsJson(part.args.args_json + ''.join(chunks)))
+
+    def handle_event(self, event: ModelResponseStreamEvent) -> ModelResponseStreamEvent | None:
+        """Apply an event emitted by another parts manager, e.g. to replay a recorded stream.
+
+        The event's part index is used as the vendor part ID, so the parts built up are the same as those of the
+        manager which emitted the events.
+
+        Args:
+            event: The event to apply.
+
+        Returns:
+            The event emitted by this manager, or `None` if no event is emitted.
+        """
+        if isinstance(event, PartStartEvent):
+            part = event.part
+            if isinstance(part, TextPart):
+                return self.handle_text_delta(vendor_part_id=event.index, content=part.content)
+            else:
+                return self.handle_tool_call_part(
+                    vendor_part_id=event.index,
+                    tool_name=part.tool_name,
+                    args=part.args.args_json if isinstance(part.args, ArgsJson) else part.args.args_dict,
+                    tool_call_id=part.tool_call_id,
+                )
+        elif isinstance(event.delta, TextPartDelta):
+            return self.handle_text_delta(vendor_part_id=event.index, content=event.delta.content_delta)
+        else:
+            return self.handle_tool_call_delta(
+                vendor_part_id=event.index,
+                tool_name=event.delta.tool_name_delta,
+                args=event.delta.args_delta,
+                tool_call_id=event.delta.tool_call_id,
+            )
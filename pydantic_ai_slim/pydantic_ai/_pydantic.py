@@ -5,8 +5,12 @@ This module has to use numerous internal Pydantic APIs and is therefore brittle
 
 from __future__ import annotations as _annotations
 
-from inspect import Parameter, signature
+import copy
+import threading
+from collections.abc import Mapping
+from inspect import Parameter, Signature, signature
 from typing import TYPE_CHECKING, Any, Callable, TypedDict, cast, get_origin
+from weakref import WeakKeyDictionary
 
 from pydantic import ConfigDict
 from pydantic._internal import _decorators, _generate_schema, _typing_extra
@@ -16,29 +20,142 @@ from pydantic.json_schema import GenerateJsonSchema
 from pydantic.plugin._schema_validator import create_schema_validator
 from pydantic_core import SchemaValidator, core_schema
 
-from ._griffe import doc_descriptions
+from . import schema_cache
 from ._utils import check_object_json_schema, is_model_like
 
 if TYPE_CHECKING:
     from .tools import DocstringFormat, ObjectJsonSchema
 
 
-__all__ = ('function_schema',)
+__all__ = ('function_schema', 'function_json_schema', 'check_function')
 
 
-class FunctionSchema(TypedDict):
-    """Internal information about a function schema."""
+class FunctionJsonSchema(TypedDict):
+    """The description and JSON schema of a function, what's needed to define a tool."""
 
     description: str
-    validator: SchemaValidator
     json_schema: ObjectJsonSchema
+
+
+class FunctionSchema(FunctionJsonSchema):
+    """Internal information about a function schema."""
+
+    validator: SchemaValidator
     # if not None, the function takes a single by that name (besides potentially `info`)
     single_arg_name: str | None
     positional_fields: list[str]
     var_positional_field: str | None
 
 
-def function_schema(  # noqa: C901
+_SchemaKey = tuple[bool, str, bool]
+_schema_cache: WeakKeyDictionary[Callable[..., Any], dict[_SchemaKey, FunctionSchema]] = WeakKeyDictionary()
+_schema_cache_lock = threading.Lock()
+
+
+def function_schema(
+    function: Callable[..., Any],
+    takes_ctx: bool,
+    docstring_format: DocstringFormat,
+    require_parameter_descriptions: bool,
+) -> FunctionSchema:
+    """Get the Pydantic validator and JSON schema of a tool function.
+
+    Schemas are cached for as long as the function exists, so a function registered as a tool by many agents is only
+    compiled once. Each call returns its own copy of the JSON schema, since it may be modified.
+
+    Args:
+        function: The function to build a validator and JSON schema for.
+        takes_ctx: Whether the function takes a `RunContext` first argument.
+        docstring_format: The docstring format to use.
+        require_parameter_descriptions: Whether to require descriptions for all tool function parameters.
+
+    Returns:
+        A `FunctionSchema` instance.
+    """
+    key: _SchemaKey = takes_ctx, docstring_format, require_parameter_descriptions
+    schema = _get_built_schema(function, key)
+    if schema is None:
+        schema = _build_function_schema(function, takes_ctx, docstring_format, require_parameter_descriptions)
+        try:
+            with _schema_cache_lock:
+                _schema_cache.setdefault(function, {})[key] = schema
+        except TypeError:
+            # the function can't be weakly referenced, e.g. it's a builtin, so its schema isn't cached
+            pass
+
+        disk_cache = schema_cache.get_schema_cache()
+        if disk_cache is not None and (disk_key := schema_cache.function_key(function, *key)):
+            disk_cache.set(disk_key, {'description': schema['description'], 'json_schema': schema['json_schema']})
+
+    schema = schema.copy()
+    schema['json_schema'] = copy.deepcopy(schema['json_schema'])
+    return schema
+
+
+def function_json_schema(
+    function: Callable[..., Any],
+    takes_ctx: bool,
+    docstring_format: DocstringFormat,
+    require_parameter_descriptions: bool,
+) -> FunctionJsonSchema:
+    """Get the description and JSON schema of a tool function, without building its validator if possible.
+
+    If the schema hasn't been built in this process, it's loaded from the
+    [schema cache][pydantic_ai.schema_cache] if one is configured and it has the schema.
+    """
+    key: _SchemaKey = takes_ctx, docstring_format, require_parameter_descriptions
+    disk_cache = schema_cache.get_schema_cache()
+    if disk_cache is not None and _get_built_schema(function, key) is None:
+        if (disk_key := schema_cache.function_key(function, *key)) and (cached := disk_cache.get(disk_key)):
+            try:
+                return FunctionJsonSchema(description=cached['description'], json_schema=cached['json_schema'])
+            except KeyError:
+                pass
+    return function_schema(function, takes_ctx, docstring_format, require_parameter_descriptions)
+
+
+def _get_built_schema(function: Callable[..., Any], key: _SchemaKey) -> FunctionSchema | None:
+    try:
+        with _schema_cache_lock:
+            return _schema_cache.get(function, {}).get(key)
+    except TypeError:
+        return None
+
+
+def check_function(
+    function: Callable[..., Any],
+    takes_ctx: bool | None,
+    docstring_format: DocstringFormat,
+    require_parameter_descriptions: bool,
+) -> bool:
+    """Check a tool function's signature, without the cost of building its schema.
+
+    This raises the same errors about the function's parameters as `function_schema`, so mistakes are reported when
+    a tool is created rather than when it's first used. The docstring is only parsed if
+    `require_parameter_descriptions` is set.
+
+    Returns:
+        Whether the function takes a `RunContext` first argument, inferred from its annotation if `takes_ctx` is `None`.
+    """
+    sig = signature(function)
+    type_hints = _typing_extra.get_function_type_hints(function)
+    if takes_ctx is None:
+        takes_ctx = _first_param_is_ctx(sig, type_hints)
+    errors: list[str] = []
+    if require_parameter_descriptions:
+        from ._griffe import doc_descriptions
+
+        _, field_descriptions = doc_descriptions(function, sig, docstring_format=docstring_format)
+        if error := _missing_descriptions_error(sig.parameters, field_descriptions):
+            errors.append(error)
+    for index, (name, p) in enumerate(sig.parameters.items()):
+        if p.annotation is not sig.empty and (error := _context_error(index, type_hints[name], takes_ctx)):
+            errors.append(error)
+    _raise_errors(function, errors)
+    return takes_ctx
+
+
+def _build_function_schema(
     function: Callable[..., Any],
     takes_ctx: bool,
     docstring_format: DocstringFormat,
@@ -70,12 +187,13 @@ def function_schema(  # noqa: C901
     errors: list[str] = []
     decorators = _decorators.DecoratorInfos()
 
+    from ._griffe import doc_descriptions
+
     description, field_descriptions = doc_descriptions(function, sig, docstring_format=docstring_format)
 
     if require_parameter_descriptions:
-        if len(field_descriptions) != len(sig.parameters):
-            missing_params = set(sig.parameters) - set(field_descriptions)
-            errors.append(f'Missing parameter descriptions for {", ".join(missing_params)}')
+        if error := _missing_descriptions_error(sig.parameters, field_descriptions):
+            errors.append(error)
 
     for index, (name, p) in enumerate(sig.parameters.items()):
         if p.annotation is sig.empty:
@@ -87,15 +205,10 @@ def function_schema(  # noqa: C901
         else:
             annotation = type_hints[name]
 
-            if index == 0 and takes_ctx:
-                if not _is_call_ctx(annotation):
-                    errors.append('First parameter of tools that take context must be annotated with RunContext[...]')
-                continue
-            elif not takes_ctx and _is_call_ctx(annotation):
-                errors.append('RunContext annotations can only be used with tools that take context')
-                continue
-            elif index != 0 and _is_call_ctx(annotation):
-                errors.append('RunContext annotations can only be used as the first argument')
+            error = _context_error(index, annotation, takes_ctx)
+            if error:
+                errors.append(error)
+            if error or (index == 0 and takes_ctx):
                 continue
 
         field_name = p.name
@@ -124,11 +237,7 @@ def function_schema(  # noqa: C901
             elif p.kind == Parameter.VAR_POSITIONAL:
                 var_positional_field = field_name
 
-    if errors:
-        from .exceptions import UserError
-
-        error_details = '\n  '.join(errors)
-        raise UserError(f'Error generating schema for {function.__qualname__}:\n  {error_details}')
+    _raise_errors(function, errors)
 
     core_config = config_wrapper.core_config(None)
     # noinspection PyTypedDict
@@ -170,22 +279,38 @@ def function_schema(  # noqa: C901
     )
 
 
-def takes_ctx(function: Callable[..., Any]) -> bool:
-    """Check if a function takes a `RunContext` first argument.
+def _missing_descriptions_error(parameters: Mapping[str, Parameter], field_descriptions: dict[str, str]) -> str | None:
+    if len(field_descriptions) != len(parameters):
+        missing_params = set(parameters) - set(field_descriptions)
+        return f'Missing parameter descriptions for {", ".join(missing_params)}'
 
-    Args:
-        function: The function to check.
 
-    Returns:
-        `True` if the function takes a `RunContext` as first argument, `False` otherwise.
-    """
-    sig = signature(function)
+def _context_error(index: int, annotation: Any, takes_ctx: bool) -> str | None:
+    """Check the use of `RunContext` by the annotation of the parameter at `index`."""
+    if index == 0 and takes_ctx:
+        if not _is_call_ctx(annotation):
+            return 'First parameter of tools that take context must be annotated with RunContext[...]'
+    elif not takes_ctx and _is_call_ctx(annotation):
+        return 'RunContext annotations can only be used with tools that take context'
+    elif index != 0 and _is_call_ctx(annotation):
+        return 'RunContext annotations can only be used as the first argument'
+
+
+def _raise_errors(function: Callable[..., Any], errors: list[str]) -> None:
+    if errors:
+        from .exceptions import UserError
+
+        error_details = '\n  '.join(errors)
+        raise UserError(f'Error generating schema for {function.__qualname__}:\n  {error_details}')
+
+
+def _first_param_is_ctx(sig: Signature, type_hints: dict[str, Any]) -> bool:
+    """Check if a function takes a `RunContext` first argument."""
     try:
         first_param_name = next(iter(sig.parameters.keys()))
     except StopIteration:
         return False
     else:
-        type_hints = _typing_extra.get_function_type_hints(function)
         annotation = type_hints[first_param_name]
         return annotation is not sig.empty and _is_call_ctx(annotation)
 
@@ -2,15 +2,17 @@ from __future__ import annotations as _annotations
 
 import inspect
 import sys
+import threading
 import types
 from collections.abc import Awaitable, Iterable
 from dataclasses import dataclass, field
 from typing import Any, Callable, Generic, Literal, Union, cast, get_args, get_origin
 
+import pydantic_core
 from pydantic import TypeAdapter, ValidationError
 from typing_extensions import Self, TypeAliasType, TypedDict
 
-from . import _utils, messages as _messages
+from . import _partial_json, _utils, messages as _messages, schema_cache
 from .exceptions import ModelRetry
 from .result import ResultData, ResultValidatorFunc
 from .tools import AgentDeps, RunContext, ToolDefinition
@@ -19,6 +21,8 @@ from .tools import AgentDeps, RunContext, ToolDefinition
 @dataclass
 class ResultValidator(Generic[AgentDeps, ResultData]):
     function: ResultValidatorFunc[AgentDeps, ResultData]
+    partial: bool = True
+    """Whether to call the function on partial results while streaming, not just the final result."""
     _takes_ctx: bool = field(init=False)
     _is_async: bool = field(init=False)
 
@@ -54,7 +58,7 @@ class ResultValidator(Generic[AgentDeps, ResultData]):
                 result_data = await function(*args)
             else:
                 function = cast(Callable[[Any], ResultData], self.function)
-                result_data = await _utils.run_in_executor(function, *args)
+                result_data = await run_context.executor.run(function, *args)
         except ModelRetry as r:
             m = _messages.RetryPromptPart(content=r.message)
             if tool_call is not None:
@@ -73,6 +77,10 @@ class ToolRetryError(Exception):
         super().__init__()
 
 
+_result_schema_cache: _utils.LRUCache[tuple[Any, str, str | None], ResultSchema[Any]] = _utils.LRUCache(maxsize=128)
+_result_schema_cache_lock = threading.Lock()
+
+
 @dataclass
 class ResultSchema(Generic[ResultData]):
     """Model the final response from an agent run.
@@ -85,10 +93,30 @@ class ResultSchema(Generic[ResultData]):
 
     @classmethod
     def build(cls, response_type: type[ResultData], name: str, description: str | None) -> Self | None:
-        """Build a ResultSchema dataclass from a response type."""
+        """Build a ResultSchema dataclass from a response type.
+
+        Schemas are cached by response type, name and description, since building them is expensive and runs may set
+        their own `result_type`.
+        """
         if response_type is str:
             return None
 
+        key = response_type, name, description
+        try:
+            with _result_schema_cache_lock:
+                schema = _result_schema_cache.get(key)
+        except TypeError:
+            # the response type isn't hashable, e.g. it's `Annotated` with unhashable metadata
+            return cls._build(response_type, name, description)
+
+        if schema is None:
+            schema = cls._build(response_type, name, description)
+            with _result_schema_cache_lock:
+                _result_schema_cache.set(key, schema)
+        return cast(Self, schema)
+
+    @classmethod
+    def _build(cls, response_type: type[ResultData], name: str, description: str | None) -> Self:
         if response_type_option := extract_str_from_union(response_type):
             response_type = response_type_option.value
             allow_text_result = True
@@ -144,25 +172,35 @@ DEFAULT_DESCRIPTION = 'The final response which ends this conversation'
 @dataclass(init=False)
 class ResultTool(Generic[ResultData]):
     tool_def: ToolDefinition
-    type_adapter: TypeAdapter[Any]
+    _response_type: type[Any] = field(repr=False)
+    _type_adapter: TypeAdapter[Any] | None = field(repr=False)
+    _item_type_adapter: TypeAdapter[Any] | None | _utils.Unset = field(repr=False)
 
     def __init__(self, response_type: type[ResultData], name: str, description: str | None, multiple: bool):
-        """Build a ResultTool dataclass from a response type."""
-        assert response_type is not str, 'ResultTool does not support str as a response type'
+        """Build a ResultTool dataclass from a response type.
 
-        if _utils.is_model_like(response_type):
-            self.type_adapter = TypeAdapter(response_type)
-            outer_typed_dict_key: str | None = None
-            # noinspection PyArgumentList
-            parameters_json_schema = _utils.check_object_json_schema(self.type_adapter.json_schema())
+        The JSON schema is loaded from the [schema cache][pydantic_ai.schema_cache] if one is configured and it has
+        the schema, in which case the type adapter is only built when it's first used.
+        """
+        assert response_type is not str, 'ResultTool does not support str as a response type'
+        self._response_type = response_type
+        self._type_adapter = None
+        self._item_type_adapter = _utils.UNSET
+
+        outer_typed_dict_key = None if _utils.is_model_like(response_type) else 'response'
+        disk_cache = schema_cache.get_schema_cache()
+        disk_key = schema_cache.type_key(response_type, 'result') if disk_cache is not None else None
+        cached = disk_cache.get(disk_key) if disk_cache is not None and disk_key else None
+        if cached is not None:
+            parameters_json_schema = _utils.check_object_json_schema(cached)
         else:
-            response_data_typed_dict = TypedDict('response_data_typed_dict', {'response': response_type})  # noqa
-            self.type_adapter = TypeAdapter(response_data_typed_dict)
-            outer_typed_dict_key = 'response'
             # noinspection PyArgumentList
             parameters_json_schema = _utils.check_object_json_schema(self.type_adapter.json_schema())
-            # including `response_data_typed_dict` as a title here doesn't add anything and could confuse the LLM
-            parameters_json_schema.pop('title')
+            if outer_typed_dict_key is not None:
+                # including `response_data_typed_dict` as a title here doesn't add anything and could confuse the LLM
+                parameters_json_schema.pop('title')
+            if disk_cache is not None and disk_key:
+                disk_cache.set(disk_key, parameters_json_schema)
 
         if json_schema_description := parameters_json_schema.pop('description', None):
             if description is None:
@@ -181,6 +219,30 @@ class ResultTool(Generic[ResultData]):
             outer_typed_dict_key=outer_typed_dict_key,
         )
 
+    @property
+    def type_adapter(self) -> TypeAdapter[Any]:
+        """Type adapter validating the arguments of calls to the tool, built when it's first used."""
+        if self._type_adapter is None:
+            if _utils.is_model_like(self._response_type):
+                self._type_adapter = TypeAdapter(self._response_type)
+            else:
+                self._type_adapter = TypeAdapter(_response_data_typed_dict(self._response_type))
+        return self._type_adapter
+
+    @property
+    def item_type_adapter(self) -> TypeAdapter[Any] | None:
+        """Type adapter validating the items of the result if it's a list, `None` otherwise."""
+        if isinstance(self._item_type_adapter, _utils.Unset):
+            item_type = None
+            if get_origin(self._response_type) is list and (args := get_args(self._response_type)):
+                item_type = args[0]
+            self._item_type_adapter = TypeAdapter(item_type) if item_type is not None else None
+        return self._item_type_adapter
+
+    def partial_validator(self) -> PartialResultValidator[ResultData]:
+        """Create a validator of the arguments of a call to this tool as they're streamed."""
+        return PartialResultValidator(self)
+
     def validate(
         self, tool_call: _messages.ToolCallPart, allow_partial: bool = False, wrap_validation_errors: bool = True
     ) -> ResultData:
@@ -220,6 +282,78 @@ class ResultTool(Generic[ResultData]):
             return result
 
 
+@dataclass
+class PartialResultValidator(Generic[ResultData]):
+    """Validates the partial arguments of a result tool call each time more of them have been streamed.
+
+    For results which are lists, the JSON arguments are parsed incrementally, and each item is validated once it's
+    complete, so only the last item is validated again on each call. Other results are validated from scratch with
+    `ResultTool.validate`.
+    """
+
+    result_tool: ResultTool[ResultData]
+    _incremental: bool = field(init=False)
+    _args_json: str = field(default='', init=False)
+    _parser: _partial_json.PartialJsonParser = field(default_factory=_partial_json.PartialJsonParser, init=False)
+    _items: list[Any] = field(default_factory=list, init=False)
+
+    def __post_init__(self):
+        self._incremental = self.result_tool.item_type_adapter is not None
+
+    def validate(self, tool_call: _messages.ToolCallPart) -> ResultData:
+        """Validate the partial arguments of a tool call, raising `ValidationError` if they're invalid."""
+        if self._incremental and isinstance(tool_call.args, _messages.ArgsJson):
+            try:
+                result = self._validate_items(tool_call.args.args_json)
+            except ValueError:
+                # the arguments or an item are invalid, validate from scratch so the error is the same as usual
+                self._incremental = False
+            else:
+                if not isinstance(result, _utils.Unset):
+                    return cast(ResultData, result)
+        return self.result_tool.validate(tool_call, allow_partial=True, wrap_validation_errors=False)
+
+    def _validate_items(self, args_json: str) -> list[Any] | _utils.Unset:
+        if not args_json.startswith(self._args_json):
+            # the arguments have been replaced, rather than added to
+            self._args_json = ''
+            self._parser = _partial_json.PartialJsonParser()
+            self._items = []
+        self._parser.feed(args_json[len(self._args_json) :])
+        self._args_json = args_json
+
+        value = self._parser.partial_value()
+        key = self.result_tool.tool_def.outer_typed_dict_key
+        items: Any = cast(dict[str, Any], value).get(key) if isinstance(value, dict) and key else None
+        if not isinstance(items, list):
+            return _utils.UNSET
+        items = cast(list[Any], items)
+
+        item_type_adapter = self.result_tool.item_type_adapter
+        assert item_type_adapter is not None
+        # items are validated in JSON mode like the whole result, since e.g. strict models only accept datetimes as
+        # strings in JSON; all but the last item are complete, so they're only validated once
+        for item in items[len(self._items) : -1]:
+            self._items.append(item_type_adapter.validate_json(pydantic_core.to_json(item)))
+        result = self._items.copy()
+        if len(items) > len(self._items):
+            try:
+                result.append(
+                    item_type_adapter.validate_json(
+                        pydantic_core.to_json(items[-1]), experimental_allow_partial='trailing-strings'
+                    )
+                )
+            except ValidationError:
+                # as with partial validation of the whole list, an invalid last item is omitted
+                pass
+        return result
+
+
+def _response_data_typed_dict(response_type: type[ResultData]) -> type[Any]:
+    """Wrap a type which isn't model-like in a `TypedDict`, since tool arguments must be an object."""
+    return TypedDict('response_data_typed_dict', {'response': response_type})
+
+
 def union_tool_name(base_name: str, union_arg: Any) -> str:
     return f'{base_name}_{union_arg_name(union_arg)}'
 
@@ -1,11 +1,15 @@
 from __future__ import annotations as _annotations
 
+import hashlib
 import inspect
+import weakref
 from collections.abc import Awaitable
 from dataclasses import dataclass, field
 from typing import Any, Callable, Generic, cast
 
-from . import _utils
+import pydantic_core
+
+from . import _utils, messages as _messages
 from .tools import AgentDeps, RunContext, SystemPromptFunc
 
 
@@ -13,14 +17,31 @@ from .tools import AgentDeps, RunContext, SystemPromptFunc
 class SystemPromptRunner(Generic[AgentDeps]):
     function: SystemPromptFunc[AgentDeps]
     dynamic: bool = False
+    cache_ttl: float | None = None
+    """Time in seconds the function's result is reused for, `None` to call the function on every run."""
+    cache_by_deps: bool = False
+    """Whether cached results are only reused by runs with the same deps."""
     _takes_ctx: bool = field(init=False)
     _is_async: bool = field(init=False)
+    _cache: _utils.LRUCache[str, str] = field(init=False, repr=False)
 
     def __post_init__(self):
         self._takes_ctx = len(inspect.signature(self.function).parameters) > 0
         self._is_async = inspect.iscoroutinefunction(self.function)
+        self._cache = _utils.LRUCache(maxsize=128, ttl=self.cache_ttl)
 
     async def run(self, run_context: RunContext[AgentDeps]) -> str:
+        if self.cache_ttl is None:
+            return await self._run(run_context)
+
+        key = hashlib.sha256(pydantic_core.to_json(run_context.deps)).hexdigest() if self.cache_by_deps else ''
+        prompt = self._cache.get(key)
+        if prompt is None:
+            prompt = await self._run(run_context)
+            self._cache.set(key, prompt)
+        return prompt
+
+    async def _run(self, run_context: RunContext[AgentDeps]) -> str:
         if self._takes_ctx:
             args = (run_context,)
         else:
@@ -31,4 +52,69 @@ class SystemPromptRunner(Generic[AgentDeps]):
             return await function(*args)
         else:
             function = cast(Callable[[Any], str], self.function)
-            return await _utils.run_in_executor(function, *args)
+            return await run_context.executor.run(function, *args)
+
+
+@dataclass
+class _IndexedPrompt:
+    message_index: int
+    part_index: int
+    message: weakref.ref[_messages.ModelMessage]
+    dynamic_ref: str
+
+
+@dataclass
+class _IndexedHistory:
+    first_message: weakref.ref[_messages.ModelMessage]
+    last_message: weakref.ref[_messages.ModelMessage]
+    length: int
+    prompts: list[_IndexedPrompt]
+
+
+class DynamicPromptIndex:
+    """Positions of dynamic system prompt parts in message histories.
+
+    Histories are usually those of previous runs, extended with each run, so rather than scanning the whole of a
+    history each time it's passed to a run, only the messages added since it was last seen are scanned.
+    Histories are identified by their first and last scanned messages, so a history which is copied or deserialized
+    is scanned again, as is one which is shorter than when it was scanned. The whole history is also scanned again
+    if any of the indexed messages has been replaced, or no longer has the same dynamic part at the same position.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self._histories = _utils.LRUCache[int, _IndexedHistory](maxsize)
+
+    def positions(self, messages: list[_messages.ModelMessage]) -> list[tuple[int, int]]:
+        """Get the `(message index, part index)` of each `SystemPromptPart` with a `dynamic_ref` in `messages`."""
+        if not messages:
+            return []
+        key = id(messages[0])
+        history = self._histories.get(key)
+        if (
+            history is None
+            or history.first_message() is not messages[0]
+            or history.length > len(messages)
+            or history.last_message() is not messages[history.length - 1]
+            or not all(_still_indexed(messages, prompt) for prompt in history.prompts)
+        ):
+            history = _IndexedHistory(weakref.ref(messages[0]), weakref.ref(messages[0]), 0, [])
+
+        for i in range(history.length, len(messages)):
+            message = messages[i]
+            if isinstance(message, _messages.ModelRequest):
+                for j, part in enumerate(message.parts):
+                    if isinstance(part, _messages.SystemPromptPart) and part.dynamic_ref is not None:
+                        history.prompts.append(_IndexedPrompt(i, j, weakref.ref(message), part.dynamic_ref))
+        history.length = len(messages)
+        history.last_message = weakref.ref(messages[-1])
+        self._histories.set(key, history)
+        return [(prompt.message_index, prompt.part_index) for prompt in history.prompts]
+
+
+def _still_indexed(messages: list[_messages.ModelMessage], prompt: _IndexedPrompt) -> bool:
+    """Whether the indexed message is still in the history, with the same dynamic part at the same position."""
+    message = messages[prompt.message_index]
+    if prompt.message() is not message or prompt.part_index >= len(message.parts):
+        return False
+    part = message.parts[prompt.part_index]
+    return isinstance(part, _messages.SystemPromptPart) and part.dynamic_ref == prompt.dynamic_ref
@@ -2,11 +2,13 @@ from __future__ import annotations as _annotations
 
 import asyncio
 import time
-from collections.abc import AsyncIterable, AsyncIterator, Iterator
+import weakref
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
 from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass, is_dataclass
 from datetime import datetime, timezone
-from functools import partial
+from functools import cache, partial
 from types import GenericAlias
 from typing import TYPE_CHECKING, Any, Callable, Generic, TypeVar, Union, cast, overload
 
@@ -15,6 +17,8 @@ from pydantic.json_schema import JsonSchemaValue
 from typing_extensions import ParamSpec, TypeAlias, TypeGuard, is_typeddict
 
 if TYPE_CHECKING:
+    import logfire_api
+
     from . import messages as _messages
     from .tools import ObjectJsonSchema
 
@@ -248,6 +252,27 @@ def now_utc() -> datetime:
     return datetime.now(tz=timezone.utc)
 
 
+@cache
+def get_logfire() -> logfire_api.Logfire:
+    """Get the `Logfire` instance used to create PydanticAI's spans.
+
+    `logfire_api` is imported on first use since it imports `logfire` if it's installed, which is slow.
+    """
+    import logfire_api
+
+    # while waiting for https://github.com/pydantic/logfire/issues/745
+    try:
+        import logfire._internal.stack_info
+    except ImportError:
+        pass
+    else:
+        from pathlib import Path
+
+        logfire._internal.stack_info.NON_USER_CODE_PREFIXES += (str(Path(__file__).parent.absolute()),)
+
+    return logfire_api.Logfire(otel_scope='pydantic-ai')
+
+
 def guard_tool_call_id(
     t: _messages.ToolCallPart | _messages.ToolReturnPart | _messages.RetryPromptPart, model_source: str
 ) -> str:
@@ -324,3 +349,136 @@ class PeekableAsyncStream(Generic[T]):
         except StopAsyncIteration:
             self._exhausted = True
             raise
+
+
+K = TypeVar('K')
+
+
+class IdentityCache(Generic[K, T]):
+    """Cache of values derived from objects, keyed by the identity of those objects rather than their value.
+
+    Each entry holds a weak reference to its key, and is evicted when the key is garbage collected, so the cache
+    never keeps the objects it describes alive.
+
+    `dependencies` are objects (compared by identity) the cached value was derived from, e.g. the parts of a message:
+    if any of them have been replaced since the value was computed, the value is recomputed.
+    """
+
+    __slots__ = ('_entries',)
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[weakref.ref[K], tuple[object, ...], T]] = {}
+
+    def get(self, obj: K, compute: Callable[[K], T], dependencies: Iterable[object] = ()) -> T:
+        """Get the value for `obj`, calling `compute(obj)` if it's not cached or is stale."""
+        key = id(obj)
+        deps = tuple(dependencies)
+        entry = self._entries.get(key)
+        if entry is not None:
+            ref, cached_deps, value = entry
+            if ref() is obj and len(cached_deps) == len(deps) and all(a is b for a, b in zip(cached_deps, deps)):
+                return value
+
+        value = compute(obj)
+        self._entries[key] = weakref.ref(obj, partial(self._evict, key)), deps, value
+        return value
+
+    def _evict(self, key: int, ref: weakref.ref[K]) -> None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is ref:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+V = TypeVar('V')
+
+
+class LRUCache(Generic[K, V]):
+    """Cache bounded by its number of entries and optionally their age, evicting the least recently used entry first."""
+
+    __slots__ = ('maxsize', 'ttl', '_entries')
+
+    def __init__(self, maxsize: int | None = 128, ttl: float | None = None) -> None:
+        """Create a cache.
+
+        Args:
+            maxsize: Maximum number of entries, `None` for no limit.
+            ttl: Maximum age of entries in seconds, `None` for no limit.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float | None, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Get the value for `key`, or `None` if it's not cached or has expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Set the value for `key`, evicting the least recently used entry if the cache is full."""
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self._entries[key] = expires, value
+        self._entries.move_to_end(key)
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """Remove `key` from the cache, returning its value if it was cached."""
+        entry = self._entries.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class IdentitySequenceCache(Generic[K, T]):
+    """Cache of the values derived from each object of a sequence, keyed by the identity of the objects.
+
+    The list of values derived from a sequence is cached as a whole, so the same sequence of objects, e.g. the tools
+    of each step of a run, gets the same list back without looking up each object. Sequences which aren't cached only
+    compute the values of objects which aren't in an [`IdentityCache`][pydantic_ai._utils.IdentityCache] of values.
+
+    Like `IdentityCache`, values are recomputed if any of an object's `dependencies` have been replaced. The objects of
+    the last `maxsize` sequences are kept alive.
+    """
+
+    __slots__ = ('_sequences', '_values')
+
+    def __init__(self, maxsize: int = 16) -> None:
+        self._sequences: LRUCache[tuple[int, ...], tuple[tuple[K, ...], tuple[tuple[object, ...], ...], list[T]]] = (
+            LRUCache(maxsize)
+        )
+        self._values: IdentityCache[K, T] = IdentityCache()
+
+    def get(
+        self, objs: Iterable[K], compute: Callable[[K], T], dependencies: Callable[[K], Iterable[object]]
+    ) -> list[T]:
+        """Get the values for `objs`, calling `compute(obj)` for objects which aren't cached or are stale.
+
+        The returned list is shared by calls with the same objects, so mustn't be modified.
+        """
+        objs = tuple(objs)
+        deps = tuple(tuple(dependencies(obj)) for obj in objs)
+        # the cached objects are kept alive, so their ids can't have been reused by other objects
+        key = tuple(map(id, objs))
+        entry = self._sequences.get(key)
+        if entry is not None:
+            _, cached_deps, values = entry
+            if all(len(a) == len(b) and all(x is y for x, y in zip(a, b)) for a, b in zip(cached_deps, deps)):
+                return values
+
+        values = [self._values.get(obj, compute, obj_deps) for obj, obj_deps in zip(objs, deps)]
+        self._sequences.set(key, (objs, deps, values))
+        return values
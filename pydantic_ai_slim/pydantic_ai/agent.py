@@ -4,15 +4,16 @@ import asyncio
 import dataclasses
 import inspect
 from collections.abc import AsyncIterator, Awaitable, Iterator, Sequence
-from contextlib import AbstractAsyncContextManager, asynccontextmanager, contextmanager
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager, contextmanager
 from contextvars import ContextVar
+from time import perf_counter
 from types import FrameType
 from typing import Any, Callable, Generic, Literal, cast, final, overload
 
-import logfire_api
 from typing_extensions import TypeVar, assert_never, deprecated
 
 from . import (
+    _partial_json,
     _result,
     _system_prompt,
     _utils,
@@ -22,13 +23,16 @@ from . import (
     result,
     usage as _usage,
 )
+from .executors import Executor, ProcessExecutor, default_executor
 from .result import ResultData
 from .settings import ModelSettings, merge_model_settings
+from .timings import StepTimings
 from .tools import (
     AgentDeps,
     DocstringFormat,
     RunContext,
     Tool,
+    ToolCache,
     ToolDefinition,
     ToolFuncContext,
     ToolFuncEither,
@@ -39,17 +43,6 @@ from .tools import (
 
 __all__ = 'Agent', 'capture_run_messages', 'EndStrategy'
 
-_logfire = logfire_api.Logfire(otel_scope='pydantic-ai')
-
-# while waiting for https://github.com/pydantic/logfire/issues/745
-try:
-    import logfire._internal.stack_info
-except ImportError:
-    pass
-else:
-    from pathlib import Path
-
-    logfire._internal.stack_info.NON_USER_CODE_PREFIXES += (str(Path(__file__).parent.absolute()),)
 
 NoneType = type(None)
 EndStrategy = Literal['early', 'exhaustive']
@@ -96,6 +89,24 @@ class Agent(Generic[AgentDeps, ResultData]):
     end_strategy: EndStrategy
     """Strategy for handling tool calls when a final result is found."""
 
+    eager_tool_execution: bool
+    """Whether to start function tools while a streamed response is still being received.
+
+    If `True`, [`run_stream`][pydantic_ai.Agent.run_stream] starts each function tool as soon as the arguments of
+    its call are complete, so tools run while the model is still generating the rest of the response. Tool results
+    are still returned to the model in the order of the calls.
+
+    If a response contains a final result after some function tool calls, those tools may already have started,
+    with the `'early'` end strategy they're cancelled once the final result is found.
+    """
+
+    executor: Executor | None
+    """Executor used to run the agent's sync tools, system prompts and result validators.
+
+    Tools registered with their own executor use that instead. If `None`,
+    [`default_executor`][pydantic_ai.executors.default_executor] is used.
+    """
+
     model_settings: ModelSettings | None
     """Optional model request settings to use for this agents's runs, by default.
 
@@ -113,6 +124,7 @@ class Agent(Generic[AgentDeps, ResultData]):
     _system_prompt_dynamic_functions: dict[str, _system_prompt.SystemPromptRunner[AgentDeps]] = dataclasses.field(
         repr=False
     )
+    _dynamic_prompt_index: _system_prompt.DynamicPromptIndex = dataclasses.field(repr=False)
     _deps_type: type[AgentDeps] = dataclasses.field(repr=False)
     _max_result_retries: int = dataclasses.field(repr=False)
     _override_deps: _utils.Option[AgentDeps] = dataclasses.field(default=None, repr=False)
@@ -134,6 +146,8 @@ class Agent(Generic[AgentDeps, ResultData]):
         tools: Sequence[Tool[AgentDeps] | ToolFuncEither[AgentDeps, ...]] = (),
         defer_model_check: bool = False,
         end_strategy: EndStrategy = 'early',
+        eager_tool_execution: bool = False,
+        executor: Executor | None = None,
     ):
         """Create an agent.
 
@@ -163,13 +177,23 @@ class Agent(Generic[AgentDeps, ResultData]):
                 [override the model][pydantic_ai.Agent.override] for testing.
             end_strategy: Strategy for handling tool calls that are requested alongside a final result.
                 See [`EndStrategy`][pydantic_ai.agent.EndStrategy] for more information.
+            eager_tool_execution: Whether to start function tools while a streamed response is still being received,
+                as soon as the arguments of each call are complete.
+            executor: Executor used to run sync tools, system prompts and result validators, see
+                [`pydantic_ai.executors`][pydantic_ai.executors]. Defaults to the event loop's default executor.
         """
+        if isinstance(executor, ProcessExecutor):
+            raise exceptions.UserError(
+                "A `ProcessExecutor` can't run functions which take `RunContext`, it can only be used by plain tools"
+            )
         if model is None or defer_model_check:
             self.model = model
         else:
             self.model = models.infer_model(model)
 
         self.end_strategy = end_strategy
+        self.eager_tool_execution = eager_tool_execution
+        self.executor = executor
         self.name = name
         self.model_settings = model_settings
         self._result_tool_name = result_tool_name
@@ -189,6 +213,7 @@ class Agent(Generic[AgentDeps, ResultData]):
         self._deps_type = deps_type
         self._system_prompt_functions = []
         self._system_prompt_dynamic_functions = {}
+        self._dynamic_prompt_index = _system_prompt.DynamicPromptIndex()
         self._max_result_retries = result_retries if result_retries is not None else retries
         self._result_validators = []
 
@@ -272,32 +297,38 @@ class Agent(Generic[AgentDeps, ResultData]):
         new_message_index = len(message_history) if message_history else 0
         result_schema = self._prepare_result_schema(result_type)
 
-        with _logfire.span(
+        with _utils.get_logfire().span(
             '{agent_name} run {prompt=}',
             prompt=user_prompt,
             agent=self,
             model_name=model_used.name(),
             agent_name=self.name or 'agent',
         ) as run_span:
-            run_context = RunContext(deps, model_used, usage or _usage.Usage(), user_prompt)
+            run_context = RunContext(
+                deps, model_used, usage or _usage.Usage(), user_prompt, executor=self.executor or default_executor
+            )
             messages = await self._prepare_messages(user_prompt, message_history, run_context)
             run_context.messages = messages
 
-            for tool in self._function_tools.values():
-                tool.current_retry = 0
-
             model_settings = merge_model_settings(self.model_settings, model_settings)
             usage_limits = usage_limits or _usage.UsageLimits()
+            run_tools = await self._prepare_static_tools(run_context)
 
             while True:
                 usage_limits.check_before_request(run_context.usage)
 
                 run_context.run_step += 1
-                with _logfire.span('preparing model and tools {run_step=}', run_step=run_context.run_step):
-                    agent_model = await self._prepare_model(run_context, result_schema)
-
-                with _logfire.span('model request', run_step=run_context.run_step) as model_req_span:
-                    model_response, request_usage = await agent_model.request(messages, model_settings)
+                step_timings = run_context.timings.start_step(run_context.run_step)
+                with _utils.get_logfire().span('preparing model and tools {run_step=}', run_step=run_context.run_step):
+                    started_at = perf_counter()
+                    agent_model = await self._prepare_model(run_context, result_schema, run_tools)
+                    step_timings.prepare_model = perf_counter() - started_at
+
+                with _utils.get_logfire().span('model request', run_step=run_context.run_step) as model_req_span:
+                    step_timings.request_started()
+                    with step_timings.record_message_mapping():
+                        model_response, request_usage = await agent_model.request(messages, model_settings)
+                    step_timings.response_received()
                     model_req_span.set_attribute('response', model_response)
                     model_req_span.set_attribute('usage', request_usage)
 
@@ -305,7 +336,7 @@ class Agent(Generic[AgentDeps, ResultData]):
                 run_context.usage.incr(request_usage, requests=1)
                 usage_limits.check_tokens(run_context.usage)
 
-                with _logfire.span('handle model response', run_step=run_context.run_step) as handle_span:
+                with _utils.get_logfire().span('handle model response', run_step=run_context.run_step) as handle_span:
                     final_result, tool_responses = await self._handle_model_response(
                         model_response, run_context, result_schema
                     )
@@ -322,8 +353,14 @@ class Agent(Generic[AgentDeps, ResultData]):
                         run_span.set_attribute('usage', run_context.usage)
                         handle_span.set_attribute('result', result_data)
                         handle_span.message = 'handle model response -> final result'
+                        run_context.timings.finish()
                         return result.RunResult(
-                            messages, new_message_index, result_data, result_tool_name, run_context.usage
+                            messages,
+                            new_message_index,
+                            result_data,
+                            result_tool_name,
+                            run_context.usage,
+                            run_context.timings,
                         )
                     else:
                         # continue the conversation
@@ -503,41 +540,51 @@ class Agent(Generic[AgentDeps, ResultData]):
         new_message_index = len(message_history) if message_history else 0
         result_schema = self._prepare_result_schema(result_type)
 
-        with _logfire.span(
+        with _utils.get_logfire().span(
             '{agent_name} run stream {prompt=}',
             prompt=user_prompt,
             agent=self,
             model_name=model_used.name(),
             agent_name=self.name or 'agent',
         ) as run_span:
-            run_context = RunContext(deps, model_used, usage or _usage.Usage(), user_prompt)
+            run_context = RunContext(
+                deps, model_used, usage or _usage.Usage(), user_prompt, executor=self.executor or default_executor
+            )
             messages = await self._prepare_messages(user_prompt, message_history, run_context)
             run_context.messages = messages
 
-            for tool in self._function_tools.values():
-                tool.current_retry = 0
-
             model_settings = merge_model_settings(self.model_settings, model_settings)
             usage_limits = usage_limits or _usage.UsageLimits()
+            run_tools = await self._prepare_static_tools(run_context)
 
             while True:
                 run_context.run_step += 1
                 usage_limits.check_before_request(run_context.usage)
+                step_timings = run_context.timings.start_step(run_context.run_step)
 
-                with _logfire.span('preparing model and tools {run_step=}', run_step=run_context.run_step):
-                    agent_model = await self._prepare_model(run_context, result_schema)
+                with _utils.get_logfire().span('preparing model and tools {run_step=}', run_step=run_context.run_step):
+                    started_at = perf_counter()
+                    agent_model = await self._prepare_model(run_context, result_schema, run_tools)
+                    step_timings.prepare_model = perf_counter() - started_at
 
-                with _logfire.span('model request {run_step=}', run_step=run_context.run_step) as model_req_span:
-                    async with agent_model.request_stream(messages, model_settings) as model_response:
+                with _utils.get_logfire().span(
+                    'model request {run_step=}', run_step=run_context.run_step
+                ) as model_req_span:
+                    async with _request_stream(agent_model, messages, model_settings, step_timings) as model_response:
                         run_context.usage.requests += 1
                         model_req_span.set_attribute('response_type', model_response.__class__.__name__)
                         # We want to end the "model request" span here, but we can't exit the context manager
                         # in the traditional way
                         model_req_span.__exit__(None, None, None)
 
-                        with _logfire.span('handle model response') as handle_span:
+                        with _utils.get_logfire().span('handle model response') as handle_span:
+                            eager_tools = (
+                                _EagerToolCalls(self._function_tools, run_context)
+                                if self.eager_tool_execution
+                                else None
+                            )
                             maybe_final_result = await self._handle_streamed_response(
-                                model_response, run_context, result_schema
+                                model_response, run_context, result_schema, eager_tools
                             )
 
                             # Check if we got a final result
@@ -558,23 +605,29 @@ class Agent(Generic[AgentDeps, ResultData]):
                                         part for part in last_message.parts if isinstance(part, _messages.ToolCallPart)
                                     ]
                                     parts = await self._process_function_tools(
-                                        tool_calls, result_tool_name, run_context, result_schema
+                                        tool_calls, result_tool_name, run_context, result_schema, eager_tools
                                     )
                                     if parts:
                                         messages.append(_messages.ModelRequest(parts))
                                     run_span.set_attribute('all_messages', messages)
-
-                                yield result.StreamedRunResult(
-                                    messages,
-                                    new_message_index,
-                                    usage_limits,
-                                    result_stream,
-                                    result_schema,
-                                    run_context,
-                                    self._result_validators,
-                                    result_tool_name,
-                                    on_complete,
-                                )
+                                    run_context.timings.finish()
+
+                                try:
+                                    yield result.StreamedRunResult(
+                                        messages,
+                                        new_message_index,
+                                        usage_limits,
+                                        result_stream,
+                                        result_schema,
+                                        run_context,
+                                        self._result_validators,
+                                        result_tool_name,
+                                        on_complete,
+                                    )
+                                finally:
+                                    if eager_tools is not None:
+                                        # cancel tools whose results weren't used, e.g. if the stream wasn't completed
+                                        eager_tools.cancel()
                                 return
                             else:
                                 # continue the conversation
@@ -593,6 +646,299 @@ class Agent(Generic[AgentDeps, ResultData]):
                                 run_context.usage.incr(model_response_usage)
                                 usage_limits.check_tokens(run_context.usage)
 
+    @overload
+    async def run_many(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: None = None,
+        message_history: list[_messages.ModelMessage] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDeps = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        batch_usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        max_concurrency: int = 10,
+        return_exceptions: Literal[False] = False,
+        infer_name: bool = True,
+    ) -> list[result.RunResult[ResultData]]: ...
+
+    @overload
+    async def run_many(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: type[RunResultData],
+        message_history: list[_messages.ModelMessage] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDeps = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        batch_usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        max_concurrency: int = 10,
+        return_exceptions: Literal[False] = False,
+        infer_name: bool = True,
+    ) -> list[result.RunResult[RunResultData]]: ...
+
+    @overload
+    async def run_many(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: None = None,
+        message_history: list[_messages.ModelMessage] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDeps = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        batch_usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        max_concurrency: int = 10,
+        return_exceptions: Literal[True],
+        infer_name: bool = True,
+    ) -> list[result.RunResult[ResultData] | Exception]: ...
+
+    @overload
+    async def run_many(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: type[RunResultData],
+        message_history: list[_messages.ModelMessage] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDeps = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        batch_usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        max_concurrency: int = 10,
+        return_exceptions: Literal[True],
+        infer_name: bool = True,
+    ) -> list[result.RunResult[RunResultData] | Exception]: ...
+
+    async def run_many(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: type[RunResultData] | None = None,
+        message_history: list[_messages.ModelMessage] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDeps = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        batch_usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        max_concurrency: int = 10,
+        return_exceptions: bool = False,
+        infer_name: bool = True,
+    ) -> list[Any]:
+        """Run the agent with each of a batch of user prompts concurrently, returning the results in order.
+
+        All runs share the same model, and therefore the same HTTP client and connection pool.
+
+        Example:
+        ```python
+        from pydantic_ai import Agent
+        from pydantic_ai.usage import Usage
+
+        agent = Agent('openai:gpt-4o')
+
+        async def main():
+            usage = Usage()
+            results = await agent.run_many(
+                ['What is the capital of France?', 'What is the capital of Italy?'],
+                max_concurrency=2,
+                usage=usage,
+            )
+            print([r.data for r in results])
+            #> ['Paris', 'Rome']
+            print(usage.requests)
+            #> 2
+        ```
+
+        Args:
+            user_prompts: User inputs, each starts a separate run.
+            result_type: Custom result type to use for these runs, `result_type` may only be used if the agent has no
+                result validators since result validators would expect an argument that matches the agent's result type.
+            message_history: History of the conversation so far, shared by all runs.
+            model: Optional model to use for these runs, required if `model` was not set when creating the agent.
+            deps: Optional dependencies to use for these runs.
+            model_settings: Optional settings to use for this model's requests.
+            usage_limits: Optional limits on model request count or token usage of each run.
+            batch_usage_limits: Optional limits on model request count or token usage of the whole batch.
+            usage: Optional usage to start with, the usage of every run in the batch is added to it.
+            max_concurrency: Maximum number of runs in progress at once.
+            return_exceptions: If `True`, exceptions raised by runs are returned in place of their results,
+                otherwise the first exception is raised and the remaining runs are cancelled.
+            infer_name: Whether to try to infer the agent name from the call frame if it's not set.
+
+        Returns:
+            The results of the runs, in the same order as `user_prompts`.
+        """
+        if infer_name and self.name is None:
+            self._infer_name(inspect.currentframe())
+        results: list[Any] = [None] * len(user_prompts)
+        async with self._run_many(
+            user_prompts,
+            result_type=result_type,
+            message_history=message_history,
+            model=model,
+            deps=deps,
+            model_settings=model_settings,
+            usage_limits=usage_limits,
+            batch_usage_limits=batch_usage_limits,
+            usage=usage,
+            max_concurrency=max_concurrency,
+            return_exceptions=return_exceptions,
+        ) as completed:
+            async for index, run_result in completed:
+                results[index] = run_result
+        return results
+
+    @overload
+    def run_many_as_completed(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: None = None,
+        message_history: list[_messages.ModelMessage] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDeps = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        batch_usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        max_concurrency: int = 10,
+        return_exceptions: Literal[False] = False,
+        infer_name: bool = True,
+    ) -> AbstractAsyncContextManager[AsyncIterator[tuple[int, result.RunResult[ResultData]]]]: ...
+
+    @overload
+    def run_many_as_completed(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: type[RunResultData],
+        message_history: list[_messages.ModelMessage] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDeps = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        batch_usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        max_concurrency: int = 10,
+        return_exceptions: Literal[False] = False,
+        infer_name: bool = True,
+    ) -> AbstractAsyncContextManager[AsyncIterator[tuple[int, result.RunResult[RunResultData]]]]: ...
+
+    @overload
+    def run_many_as_completed(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: None = None,
+        message_history: list[_messages.ModelMessage] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDeps = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        batch_usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        max_concurrency: int = 10,
+        return_exceptions: Literal[True],
+        infer_name: bool = True,
+    ) -> AbstractAsyncContextManager[AsyncIterator[tuple[int, result.RunResult[ResultData] | Exception]]]: ...
+
+    @overload
+    def run_many_as_completed(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: type[RunResultData],
+        message_history: list[_messages.ModelMessage] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDeps = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        batch_usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        max_concurrency: int = 10,
+        return_exceptions: Literal[True],
+        infer_name: bool = True,
+    ) -> AbstractAsyncContextManager[AsyncIterator[tuple[int, result.RunResult[RunResultData] | Exception]]]: ...
+
+    def run_many_as_completed(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: type[RunResultData] | None = None,
+        message_history: list[_messages.ModelMessage] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDeps = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        batch_usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        max_concurrency: int = 10,
+        return_exceptions: bool = False,
+        infer_name: bool = True,
+    ) -> AbstractAsyncContextManager[AsyncIterator[tuple[int, Any]]]:
+        """Run the agent with each of a batch of user prompts concurrently, yielding results as runs complete.
+
+        This returns a context manager usable as an async iterator of `(index, result)` tuples, where `index` is the
+        position of the run's prompt in `user_prompts`; runs still in progress are cancelled when the context exits.
+
+        Example:
+        ```python
+        from pydantic_ai import Agent
+
+        agent = Agent('openai:gpt-4o')
+
+        async def main():
+            prompts = ['What is the capital of France?', 'What is the capital of Italy?']
+            async with agent.run_many_as_completed(prompts) as completed:
+                answers = {index: result.data async for index, result in completed}
+            print(sorted(answers.items()))
+            #> [(0, 'Paris'), (1, 'Rome')]
+        ```
+
+        Args:
+            user_prompts: User inputs, each starts a separate run.
+            result_type: Custom result type to use for these runs, `result_type` may only be used if the agent has no
+                result validators since result validators would expect an argument that matches the agent's result type.
+            message_history: History of the conversation so far, shared by all runs.
+            model: Optional model to use for these runs, required if `model` was not set when creating the agent.
+            deps: Optional dependencies to use for these runs.
+            model_settings: Optional settings to use for this model's requests.
+            usage_limits: Optional limits on model request count or token usage of each run.
+            batch_usage_limits: Optional limits on model request count or token usage of the whole batch.
+            usage: Optional usage to start with, the usage of every run in the batch is added to it.
+            max_concurrency: Maximum number of runs in progress at once.
+            return_exceptions: If `True`, exceptions raised by runs are yielded in place of their results,
+                otherwise the first exception is raised and the remaining runs are cancelled.
+            infer_name: Whether to try to infer the agent name from the call frame if it's not set.
+
+        Returns:
+            A context manager usable as an async iterator of `(index, result)` tuples, in order of completion.
+        """
+        if infer_name and self.name is None:
+            self._infer_name(inspect.currentframe())
+        return self._run_many(
+            user_prompts,
+            result_type=result_type,
+            message_history=message_history,
+            model=model,
+            deps=deps,
+            model_settings=model_settings,
+            usage_limits=usage_limits,
+            batch_usage_limits=batch_usage_limits,
+            usage=usage,
+            max_concurrency=max_concurrency,
+            return_exceptions=return_exceptions,
+        )
+
     @contextmanager
     def override(
         self,
@@ -649,7 +995,7 @@ class Agent(Generic[AgentDeps, ResultData]):
 
     @overload
     def system_prompt(
-        self, /, *, dynamic: bool = False
+        self, /, *, dynamic: bool = False, cache_ttl: float | None = None, cache_by_deps: bool = False
     ) -> Callable[[_system_prompt.SystemPromptFunc[AgentDeps]], _system_prompt.SystemPromptFunc[AgentDeps]]: ...
 
     def system_prompt(
@@ -658,6 +1004,8 @@ class Agent(Generic[AgentDeps, ResultData]):
         /,
         *,
         dynamic: bool = False,
+        cache_ttl: float | None = None,
+        cache_by_deps: bool = False,
     ) -> (
         Callable[[_system_prompt.SystemPromptFunc[AgentDeps]], _system_prompt.SystemPromptFunc[AgentDeps]]
         | _system_prompt.SystemPromptFunc[AgentDeps]
@@ -677,6 +1025,11 @@ class Agent(Generic[AgentDeps, ResultData]):
             func: The function to decorate
             dynamic: If True, the system prompt will be reevaluated even when `messages_history` is provided,
                 see [`SystemPromptPart.dynamic_ref`][pydantic_ai.messages.SystemPromptPart.dynamic_ref]
+            cache_ttl: Time in seconds the function's result is reused for by later runs, rather than calling the
+                function on every run, `None` to not cache it. This suits prompts loaded from templates or
+                configuration which rarely change.
+            cache_by_deps: Whether a cached result is only reused by runs with the same deps, which must be
+                serializable by pydantic. Otherwise the result is reused regardless of deps.
 
         Example:
         ```python
@@ -691,6 +1044,10 @@ class Agent(Generic[AgentDeps, ResultData]):
         @agent.system_prompt(dynamic=True)
         async def async_system_prompt(ctx: RunContext[str]) -> str:
             return f'{ctx.deps} is the best'
+
+        @agent.system_prompt(cache_ttl=3600)
+        def cached_system_prompt() -> str:
+            return 'loaded from a template'
         ```
         """
         if func is None:
@@ -698,7 +1055,9 @@ class Agent(Generic[AgentDeps, ResultData]):
             def decorator(
                 func_: _system_prompt.SystemPromptFunc[AgentDeps],
             ) -> _system_prompt.SystemPromptFunc[AgentDeps]:
-                runner = _system_prompt.SystemPromptRunner(func_, dynamic=dynamic)
+                runner = _system_prompt.SystemPromptRunner(
+                    func_, dynamic=dynamic, cache_ttl=cache_ttl, cache_by_deps=cache_by_deps
+                )
                 self._system_prompt_functions.append(runner)
                 if dynamic:
                     self._system_prompt_dynamic_functions[func_.__qualname__] = runner
@@ -728,14 +1087,25 @@ class Agent(Generic[AgentDeps, ResultData]):
         self, func: Callable[[ResultData], Awaitable[ResultData]], /
     ) -> Callable[[ResultData], Awaitable[ResultData]]: ...
 
+    @overload
+    def result_validator(
+        self, /, *, partial: bool = True
+    ) -> Callable[
+        [_result.ResultValidatorFunc[AgentDeps, ResultData]], _result.ResultValidatorFunc[AgentDeps, ResultData]
+    ]: ...
+
     def result_validator(
-        self, func: _result.ResultValidatorFunc[AgentDeps, ResultData], /
-    ) -> _result.ResultValidatorFunc[AgentDeps, ResultData]:
+        self, func: _result.ResultValidatorFunc[AgentDeps, ResultData] | None = None, /, *, partial: bool = True
+    ) -> Any:
         """Decorator to register a result validator function.
 
         Optionally takes [`RunContext`][pydantic_ai.tools.RunContext] as its first argument.
         Can decorate a sync or async functions.
 
+        When a result is streamed, validators are called on the partial result each time more of it is received.
+        Use `@agent.result_validator(partial=False)` to only call a validator on the final result, e.g. if it's
+        expensive or checks that the result is complete.
+
         Overloads for every possible signature of `result_validator` are included so the decorator doesn't obscure
         the type of the function, see `tests/typed_agent.py` for tests.
 
@@ -762,8 +1132,18 @@ class Agent(Generic[AgentDeps, ResultData]):
         #> success (no tool calls)
         ```
         """
-        self._result_validators.append(_result.ResultValidator[AgentDeps, Any](func))
-        return func
+        if func is None:
+
+            def result_validator_decorator(
+                func_: _result.ResultValidatorFunc[AgentDeps, ResultData],
+            ) -> _result.ResultValidatorFunc[AgentDeps, ResultData]:
+                self._result_validators.append(_result.ResultValidator[AgentDeps, Any](func_, partial=partial))
+                return func_
+
+            return result_validator_decorator
+        else:
+            self._result_validators.append(_result.ResultValidator[AgentDeps, Any](func, partial=partial))
+            return func
 
     @overload
     def tool(self, func: ToolFuncContext[AgentDeps, ToolParams], /) -> ToolFuncContext[AgentDeps, ToolParams]: ...
@@ -777,6 +1157,11 @@ class Agent(Generic[AgentDeps, ResultData]):
         prepare: ToolPrepareFunc[AgentDeps] | None = None,
         docstring_format: DocstringFormat = 'auto',
         require_parameter_descriptions: bool = False,
+        executor: Executor | None = None,
+        cache: ToolCache | None = None,
+        timeout: float | None = None,
+        on_timeout: Literal['retry', 'raise'] = 'retry',
+        max_concurrency: int | None = None,
     ) -> Callable[[ToolFuncContext[AgentDeps, ToolParams]], ToolFuncContext[AgentDeps, ToolParams]]: ...
 
     def tool(
@@ -788,6 +1173,11 @@ class Agent(Generic[AgentDeps, ResultData]):
         prepare: ToolPrepareFunc[AgentDeps] | None = None,
         docstring_format: DocstringFormat = 'auto',
         require_parameter_descriptions: bool = False,
+        executor: Executor | None = None,
+        cache: ToolCache | None = None,
+        timeout: float | None = None,
+        on_timeout: Literal['retry', 'raise'] = 'retry',
+        max_concurrency: int | None = None,
     ) -> Any:
         """Decorator to register a tool function which takes [`RunContext`][pydantic_ai.tools.RunContext] as its first argument.
 
@@ -828,6 +1218,14 @@ class Agent(Generic[AgentDeps, ResultData]):
             docstring_format: The format of the docstring, see [`DocstringFormat`][pydantic_ai.tools.DocstringFormat].
                 Defaults to `'auto'`, such that the format is inferred from the structure of the docstring.
             require_parameter_descriptions: If True, raise an error if a parameter description is missing. Defaults to False.
+            executor: Executor used to run the tool if it's a sync function, defaults to the agent's
+                [`executor`][pydantic_ai.Agent.executor].
+            cache: Cache of the tool's results, so calls with the same arguments don't run the function again,
+                see [`ToolCache`][pydantic_ai.tools.ToolCache].
+            timeout: Maximum time in seconds a call may run for, `None` for no limit.
+            on_timeout: Whether a call which times out asks the model to try again, `'retry'`, or raises
+                [`ToolTimeout`][pydantic_ai.exceptions.ToolTimeout], `'raise'`.
+            max_concurrency: Maximum number of calls of this tool running at once, across all runs of the agent.
         """
         if func is None:
 
@@ -835,13 +1233,37 @@ class Agent(Generic[AgentDeps, ResultData]):
                 func_: ToolFuncContext[AgentDeps, ToolParams],
             ) -> ToolFuncContext[AgentDeps, ToolParams]:
                 # noinspection PyTypeChecker
-                self._register_function(func_, True, retries, prepare, docstring_format, require_parameter_descriptions)
+                self._register_function(
+                    func_,
+                    True,
+                    retries,
+                    prepare,
+                    docstring_format,
+                    require_parameter_descriptions,
+                    executor,
+                    cache,
+                    timeout,
+                    on_timeout,
+                    max_concurrency,
+                )
                 return func_
 
             return tool_decorator
         else:
             # noinspection PyTypeChecker
-            self._register_function(func, True, retries, prepare, docstring_format, require_parameter_descriptions)
+            self._register_function(
+                func,
+                True,
+                retries,
+                prepare,
+                docstring_format,
+                require_parameter_descriptions,
+                executor,
+                cache,
+                timeout,
+                on_timeout,
+                max_concurrency,
+            )
             return func
 
     @overload
@@ -856,6 +1278,11 @@ class Agent(Generic[AgentDeps, ResultData]):
         prepare: ToolPrepareFunc[AgentDeps] | None = None,
         docstring_format: DocstringFormat = 'auto',
         require_parameter_descriptions: bool = False,
+        executor: Executor | None = None,
+        cache: ToolCache | None = None,
+        timeout: float | None = None,
+        on_timeout: Literal['retry', 'raise'] = 'retry',
+        max_concurrency: int | None = None,
     ) -> Callable[[ToolFuncPlain[ToolParams]], ToolFuncPlain[ToolParams]]: ...
 
     def tool_plain(
@@ -867,6 +1294,11 @@ class Agent(Generic[AgentDeps, ResultData]):
         prepare: ToolPrepareFunc[AgentDeps] | None = None,
         docstring_format: DocstringFormat = 'auto',
         require_parameter_descriptions: bool = False,
+        executor: Executor | None = None,
+        cache: ToolCache | None = None,
+        timeout: float | None = None,
+        on_timeout: Literal['retry', 'raise'] = 'retry',
+        max_concurrency: int | None = None,
     ) -> Any:
         """Decorator to register a tool function which DOES NOT take `RunContext` as an argument.
 
@@ -907,19 +1339,49 @@ class Agent(Generic[AgentDeps, ResultData]):
             docstring_format: The format of the docstring, see [`DocstringFormat`][pydantic_ai.tools.DocstringFormat].
                 Defaults to `'auto'`, such that the format is inferred from the structure of the docstring.
             require_parameter_descriptions: If True, raise an error if a parameter description is missing. Defaults to False.
+            executor: Executor used to run the tool if it's a sync function, defaults to the agent's
+                [`executor`][pydantic_ai.Agent.executor].
+            cache: Cache of the tool's results, so calls with the same arguments don't run the function again,
+                see [`ToolCache`][pydantic_ai.tools.ToolCache].
+            timeout: Maximum time in seconds a call may run for, `None` for no limit.
+            on_timeout: Whether a call which times out asks the model to try again, `'retry'`, or raises
+                [`ToolTimeout`][pydantic_ai.exceptions.ToolTimeout], `'raise'`.
+            max_concurrency: Maximum number of calls of this tool running at once, across all runs of the agent.
         """
         if func is None:
 
             def tool_decorator(func_: ToolFuncPlain[ToolParams]) -> ToolFuncPlain[ToolParams]:
                 # noinspection PyTypeChecker
                 self._register_function(
-                    func_, False, retries, prepare, docstring_format, require_parameter_descriptions
+                    func_,
+                    False,
+                    retries,
+                    prepare,
+                    docstring_format,
+                    require_parameter_descriptions,
+                    executor,
+                    cache,
+                    timeout,
+                    on_timeout,
+                    max_concurrency,
                 )
                 return func_
 
             return tool_decorator
         else:
-            self._register_function(func, False, retries, prepare, docstring_format, require_parameter_descriptions)
+            self._register_function(
+                func,
+                False,
+                retries,
+                prepare,
+                docstring_format,
+                require_parameter_descriptions,
+                executor,
+                cache,
+                timeout,
+                on_timeout,
+                max_concurrency,
+            )
             return func
 
     def _register_function(
@@ -930,6 +1392,11 @@ class Agent(Generic[AgentDeps, ResultData]):
         prepare: ToolPrepareFunc[AgentDeps] | None,
         docstring_format: DocstringFormat,
         require_parameter_descriptions: bool,
+        executor: Executor | None,
+        cache: ToolCache | None,
+        timeout: float | None,
+        on_timeout: Literal['retry', 'raise'],
+        max_concurrency: int | None,
     ) -> None:
         """Private utility to register a function as a tool."""
         retries_ = retries if retries is not None else self._default_retries
@@ -940,14 +1407,23 @@ class Agent(Generic[AgentDeps, ResultData]):
             prepare=prepare,
             docstring_format=docstring_format,
             require_parameter_descriptions=require_parameter_descriptions,
+            executor=executor,
+            cache=cache,
+            timeout=timeout,
+            on_timeout=on_timeout,
+            max_concurrency=max_concurrency,
         )
         self._register_tool(tool)
 
     def _register_tool(self, tool: Tool[AgentDeps]) -> None:
         """Private utility to register a tool instance."""
-        if tool.max_retries is None:
-            # noinspection PyTypeChecker
-            tool = dataclasses.replace(tool, max_retries=self._default_retries)
+        if tool.max_retries is None or tool._registered:  # pyright: ignore[reportPrivateUsage]
+            # a copy rather than `dataclasses.replace`, which would check the function's signature again, a tool
+            # registered with several agents is copied so they don't share its concurrency limit
+            tool = tool._copy()  # pyright: ignore[reportPrivateUsage]
+            if tool.max_retries is None:
+                tool.max_retries = self._default_retries
+        tool._registered = True  # pyright: ignore[reportPrivateUsage]
 
         if tool.name in self._function_tools:
             raise exceptions.UserError(f'Tool name conflicts with existing tool: {tool.name!r}')
@@ -957,6 +1433,94 @@ class Agent(Generic[AgentDeps, ResultData]):
 
         self._function_tools[tool.name] = tool
 
+    @asynccontextmanager
+    async def _run_many(
+        self,
+        user_prompts: Sequence[str],
+        *,
+        result_type: type[RunResultData] | None,
+        message_history: list[_messages.ModelMessage] | None,
+        model: models.Model | models.KnownModelName | None,
+        deps: AgentDeps,
+        model_settings: ModelSettings | None,
+        usage_limits: _usage.UsageLimits | None,
+        batch_usage_limits: _usage.UsageLimits | None,
+        usage: _usage.Usage | None,
+        max_concurrency: int,
+        return_exceptions: bool,
+    ) -> AsyncIterator[AsyncIterator[tuple[int, Any]]]:
+        """Implementation of [`run_many`][pydantic_ai.Agent.run_many] and [`run_many_as_completed`][pydantic_ai.Agent.run_many_as_completed]."""
+        if max_concurrency < 1:
+            raise exceptions.UserError('`max_concurrency` must be at least 1')
+        # resolve the model once so every run shares it, and with it the model's HTTP client
+        model_used = await self._get_model(model)
+
+        batch = _RunBatch(usage or _usage.Usage(), batch_usage_limits)
+        prompts = iter(enumerate(user_prompts))
+        completed: asyncio.Queue[tuple[int, Any]] = asyncio.Queue()
+        failed = False
+
+        async def worker() -> None:
+            nonlocal failed
+            # workers share the `prompts` iterator, so each prompt is run exactly once
+            for index, user_prompt in prompts:
+                if failed:
+                    return
+                run_usage = _usage.Usage()
+                batch.running[index] = run_usage
+                try:
+                    run_result = await self.run(
+                        user_prompt,
+                        result_type=result_type,
+                        message_history=message_history,
+                        model=model_used,
+                        deps=deps,
+                        model_settings=model_settings,
+                        usage_limits=batch.run_limits(usage_limits),
+                        usage=run_usage,
+                        infer_name=False,
+                    )
+                except Exception as e:
+                    failed = not return_exceptions
+                    completed.put_nowait((index, e))
+                except BaseException as e:
+                    # e.g. `CancelledError` raised by a tool, which ends the worker, so the batch fails rather than
+                    # waiting for the result forever
+                    failed = True
+                    completed.put_nowait((index, e))
+                    raise
+                else:
+                    completed.put_nowait((index, run_result))
+                finally:
+                    del batch.running[index]
+                    batch.usage.incr(run_usage)
+
+        async def iter_completed() -> AsyncIterator[tuple[int, Any]]:
+            for _ in range(len(user_prompts)):
+                index, run_result = await completed.get()
+                if isinstance(run_result, BaseException) and (
+                    not return_exceptions or not isinstance(run_result, Exception)
+                ):
+                    raise run_result
+                yield index, run_result
+
+        with _utils.get_logfire().span(
+            '{agent_name} run many {prompts=}',
+            prompts=len(user_prompts),
+            agent=self,
+            model_name=model_used.name(),
+            agent_name=self.name or 'agent',
+        ) as run_span:
+            workers = [asyncio.create_task(worker()) for _ in range(min(max_concurrency, len(user_prompts)))]
+            try:
+                yield iter_completed()
+            finally:
+                # runs are only still in progress if iteration stopped early, e.g. because a run failed
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                run_span.set_attribute('usage', batch.usage)
+
     async def _get_model(self, model: models.Model | models.KnownModelName | None) -> models.Model:
         """Create a model configured for this agent.
 
@@ -985,19 +1549,44 @@ class Agent(Generic[AgentDeps, ResultData]):
 
         return model_
 
+    async def _prepare_static_tools(
+        self, run_context: RunContext[AgentDeps]
+    ) -> list[ToolDefinition | Tool[AgentDeps] | None]:
+        """Build the definitions of tools without `prepare` once for a run, tools with `prepare` are kept as they are.
+
+        Without `prepare`, a tool's definition doesn't depend on the step, so `_prepare_model` only has to prepare the
+        other tools at each step.
+        """
+        return [
+            tool if tool.prepare is not None else await tool.prepare_tool_def(run_context)
+            for tool in self._function_tools.values()
+        ]
+
     async def _prepare_model(
-        self, run_context: RunContext[AgentDeps], result_schema: _result.ResultSchema[RunResultData] | None
+        self,
+        run_context: RunContext[AgentDeps],
+        result_schema: _result.ResultSchema[RunResultData] | None,
+        run_tools: list[ToolDefinition | Tool[AgentDeps] | None],
     ) -> models.AgentModel:
-        """Build tools and create an agent model."""
-        function_tools: list[ToolDefinition] = []
+        """Build tools and create an agent model.
 
-        async def add_tool(tool: Tool[AgentDeps]) -> None:
-            ctx = run_context.replace_with(retry=tool.current_retry, tool_name=tool.name)
-            if tool_def := await tool.prepare_tool_def(ctx):
-                function_tools.append(tool_def)
+        `run_tools` are the tools from `_prepare_static_tools`, models cache their form of the tool definitions
+        keyed on the definitions, so the same definitions are only mapped once.
+        """
+
+        async def prepare_tool(tool: Tool[AgentDeps]) -> ToolDefinition | None:
+            ctx = run_context.replace_with(retry=run_context.tool_retries.get(tool.name, 0), tool_name=tool.name)
+            return await tool.prepare_tool_def(ctx)
 
-        await asyncio.gather(*map(add_tool, self._function_tools.values()))
+        tool_defs = run_tools
+        prepared_tools = [(index, tool) for index, tool in enumerate(run_tools) if isinstance(tool, Tool)]
+        if prepared_tools:
+            tool_defs = list(run_tools)
+            results = await asyncio.gather(*(prepare_tool(tool) for _, tool in prepared_tools))
+            for (index, _), tool_def in zip(prepared_tools, results):
+                tool_defs[index] = tool_def
 
+        function_tools = [tool_def for tool_def in tool_defs if isinstance(tool_def, ToolDefinition)]
         return await run_context.model.agent_model(
             function_tools=function_tools,
             allow_text_result=self._allow_text_result(result_schema),
@@ -1010,16 +1599,17 @@ class Agent(Generic[AgentDeps, ResultData]):
         """Reevaluate any `SystemPromptPart` with dynamic_ref in the provided messages by running the associated runner function."""
         # Only proceed if there's at least one dynamic runner.
         if self._system_prompt_dynamic_functions:
-            for msg in messages:
-                if isinstance(msg, _messages.ModelRequest):
-                    for i, part in enumerate(msg.parts):
-                        if isinstance(part, _messages.SystemPromptPart) and part.dynamic_ref:
-                            # Look up the runner by its ref
-                            if runner := self._system_prompt_dynamic_functions.get(part.dynamic_ref):
-                                updated_part_content = await runner.run(run_context)
-                                msg.parts[i] = _messages.SystemPromptPart(
-                                    updated_part_content, dynamic_ref=part.dynamic_ref
-                                )
+            # the index avoids scanning the whole history for dynamic parts on every run
+            for msg_index, part_index in self._dynamic_prompt_index.positions(messages):
+                msg = cast(_messages.ModelRequest, messages[msg_index])
+                part = cast(_messages.SystemPromptPart, msg.parts[part_index])
+                # Look up the runner by its ref
+                if part.dynamic_ref and (runner := self._system_prompt_dynamic_functions.get(part.dynamic_ref)):
+                    updated_part_content = await runner.run(run_context)
+                    # replace rather than mutate the part, so models' message mapping caches see the change
+                    msg.parts[part_index] = _messages.SystemPromptPart(
+                        updated_part_content, dynamic_ref=part.dynamic_ref
+                    )
 
     def _prepare_result_schema(
         self, result_type: type[RunResultData] | None
@@ -1130,7 +1720,11 @@ class Agent(Generic[AgentDeps, ResultData]):
             if match := result_schema.find_tool(tool_calls):
                 call, result_tool = match
                 try:
-                    result_data = result_tool.validate(call)
+                    started_at = perf_counter()
+                    try:
+                        result_data = result_tool.validate(call)
+                    finally:
+                        run_context.timings.steps[-1].result_validation += perf_counter() - started_at
                     result_data = await self._validate_result(result_data, run_context, call)
                 except _result.ToolRetryError as e:
                     self._incr_result_retry(run_context)
@@ -1151,10 +1745,14 @@ class Agent(Generic[AgentDeps, ResultData]):
         result_tool_name: str | None,
         run_context: RunContext[AgentDeps],
         result_schema: _result.ResultSchema[RunResultData] | None,
+        eager_tools: _EagerToolCalls[AgentDeps] | None = None,
     ) -> list[_messages.ModelRequestPart]:
         """Process function (non-result) tool calls in parallel.
 
         Also add stub return parts for any other tools that need it.
+
+        Calls which were already started while the response was streaming are taken from `eager_tools`
+        rather than started again.
         """
         parts: list[_messages.ModelRequestPart] = []
         tasks: list[asyncio.Task[_messages.ModelRequestPart]] = []
@@ -1183,7 +1781,8 @@ class Agent(Generic[AgentDeps, ResultData]):
                         )
                     )
                 else:
-                    tasks.append(asyncio.create_task(tool.run(call, run_context), name=call.tool_name))
+                    task = eager_tools.take(call) if eager_tools is not None else None
+                    tasks.append(task or asyncio.create_task(tool.run(call, run_context), name=call.tool_name))
             elif result_schema is not None and call.tool_name in result_schema.tools:
                 # if tool_name is in _result_schema, it means we found a result tool but an error occurred in
                 # validation, we don't add another part here
@@ -1198,10 +1797,14 @@ class Agent(Generic[AgentDeps, ResultData]):
             else:
                 parts.append(self._unknown_tool(call.tool_name, run_context, result_schema))
 
+        if eager_tools is not None:
+            # calls started while streaming but not used, e.g. because a final result was found, aren't needed
+            eager_tools.cancel()
+
         # Run all tool tasks in parallel
         if tasks:
-            with _logfire.span('running {tools=}', tools=[t.get_name() for t in tasks]):
-                task_results: Sequence[_messages.ModelRequestPart] = await asyncio.gather(*tasks)
+            with _utils.get_logfire().span('running {tools=}', tools=[t.get_name() for t in tasks]):
+                task_results = await _run_tool_tasks(tasks)
                 parts.extend(task_results)
         return parts
 
@@ -1210,53 +1813,75 @@ class Agent(Generic[AgentDeps, ResultData]):
         streamed_response: models.StreamedResponse,
         run_context: RunContext[AgentDeps],
         result_schema: _result.ResultSchema[RunResultData] | None,
+        eager_tools: _EagerToolCalls[AgentDeps] | None = None,
     ) -> _MarkFinalResult[models.StreamedResponse] | tuple[_messages.ModelResponse, list[_messages.ModelRequestPart]]:
         """Process a streamed response from the model.
 
+        If `eager_tools` is provided, function tools are started as the stream is received, see
+        [`eager_tool_execution`][pydantic_ai.Agent.eager_tool_execution].
+
         Returns:
             Either a final result or a tuple of the model response and the tool responses for the next request.
             If a final result is returned, the conversation should end.
         """
         received_text = False
+        final_result = False
+        step_timings = run_context.timings.steps[-1]
 
-        async for maybe_part_event in streamed_response:
-            if isinstance(maybe_part_event, _messages.PartStartEvent):
-                new_part = maybe_part_event.part
-                if isinstance(new_part, _messages.TextPart):
-                    received_text = True
-                    if self._allow_text_result(result_schema):
-                        return _MarkFinalResult(streamed_response, None)
-                elif isinstance(new_part, _messages.ToolCallPart):
-                    if result_schema is not None and (match := result_schema.find_tool([new_part])):
-                        call, _ = match
-                        return _MarkFinalResult(streamed_response, call.tool_name)
-                else:
-                    assert_never(new_part)
+        try:
+            async for maybe_part_event in streamed_response:
+                step_timings.event_received()
+                if isinstance(maybe_part_event, _messages.PartStartEvent):
+                    new_part = maybe_part_event.part
+                    if isinstance(new_part, _messages.TextPart):
+                        received_text = True
+                        if self._allow_text_result(result_schema):
+                            final_result = True
+                            return _MarkFinalResult(streamed_response, None)
+                    elif isinstance(new_part, _messages.ToolCallPart):
+                        if result_schema is not None and (match := result_schema.find_tool([new_part])):
+                            call, _ = match
+                            final_result = True
+                            return _MarkFinalResult(streamed_response, call.tool_name)
+                    else:
+                        assert_never(new_part)
+                if eager_tools is not None:
+                    eager_tools.handle_event(maybe_part_event)
+            step_timings.stream_finished()
+
+            tasks: list[asyncio.Task[_messages.ModelRequestPart]] = []
+            parts: list[_messages.ModelRequestPart] = []
+            model_response = streamed_response.get()
+            if not model_response.parts:
+                raise exceptions.UnexpectedModelBehavior('Received empty model response')
+            for p in model_response.parts:
+                if isinstance(p, _messages.ToolCallPart):
+                    if tool := self._function_tools.get(p.tool_name):
+                        task = eager_tools.take(p) if eager_tools is not None else None
+                        tasks.append(task or asyncio.create_task(tool.run(p, run_context), name=p.tool_name))
+                    else:
+                        parts.append(self._unknown_tool(p.tool_name, run_context, result_schema))
 
-        tasks: list[asyncio.Task[_messages.ModelRequestPart]] = []
-        parts: list[_messages.ModelRequestPart] = []
-        model_response = streamed_response.get()
-        if not model_response.parts:
-            raise exceptions.UnexpectedModelBehavior('Received empty model response')
-        for p in model_response.parts:
-            if isinstance(p, _messages.ToolCallPart):
-                if tool := self._function_tools.get(p.tool_name):
-                    tasks.append(asyncio.create_task(tool.run(p, run_context), name=p.tool_name))
-                else:
-                    parts.append(self._unknown_tool(p.tool_name, run_context, result_schema))
+            if received_text and not tasks and not parts:
+                # Can only get here if self._allow_text_result returns `False` for the provided result_schema
+                self._incr_result_retry(run_context)
+                model_response = _messages.RetryPromptPart(
+                    content='Plain text responses are not permitted, please call one of the functions instead.',
+                )
+                return streamed_response.get(), [model_response]
 
-        if received_text and not tasks and not parts:
-            # Can only get here if self._allow_text_result returns `False` for the provided result_schema
-            self._incr_result_retry(run_context)
-            model_response = _messages.RetryPromptPart(
-                content='Plain text responses are not permitted, please call one of the functions instead.',
-            )
-            return streamed_response.get(), [model_response]
+            if eager_tools is not None:
+                # calls whose arguments changed after they were started are run again with their final arguments
+                eager_tools.cancel()
 
-        with _logfire.span('running {tools=}', tools=[t.get_name() for t in tasks]):
-            task_results: Sequence[_messages.ModelRequestPart] = await asyncio.gather(*tasks)
-            parts.extend(task_results)
-        return model_response, parts
+            with _utils.get_logfire().span('running {tools=}', tools=[t.get_name() for t in tasks]):
+                task_results = await _run_tool_tasks(tasks)
+                parts.extend(task_results)
+            return model_response, parts
+        finally:
+            # after a final result, tools may still be needed once the result has been streamed
+            if eager_tools is not None and not final_result:
+                eager_tools.cancel()
 
     async def _validate_result(
         self,
@@ -1266,8 +1891,12 @@ class Agent(Generic[AgentDeps, ResultData]):
     ) -> RunResultData:
         if self._result_validators:
             agent_result_data = cast(ResultData, result_data)
-            for validator in self._result_validators:
-                agent_result_data = await validator.validate(agent_result_data, tool_call, run_context)
+            started_at = perf_counter()
+            try:
+                for validator in self._result_validators:
+                    agent_result_data = await validator.validate(agent_result_data, tool_call, run_context)
+            finally:
+                run_context.timings.steps[-1].result_validators += perf_counter() - started_at
             return cast(RunResultData, agent_result_data)
         else:
             return result_data
@@ -1406,3 +2035,209 @@ class _MarkFinalResult(Generic[ResultData]):
     """The final result data."""
     tool_name: str | None
     """Name of the final result tool, None if the result is a string."""
+
+
+@dataclasses.dataclass
+class _RunBatch:
+    """Usage of the runs started by [`Agent.run_many`][pydantic_ai.Agent.run_many], so limits apply to the whole batch."""
+
+    usage: _usage.Usage
+    """Usage of the batch, the usage of each run is added to this when it finishes."""
+    limits: _usage.UsageLimits | None
+    """Limits on the usage of the whole batch."""
+    running: dict[int, _usage.Usage] = dataclasses.field(default_factory=dict)
+    """Usage of runs in progress, by the index of their prompt."""
+    requests: int = dataclasses.field(init=False)
+    """Number of requests started by the batch.
+
+    Requests are counted when they're started rather than when they complete, so concurrent runs can't make more
+    requests than the request limit allows.
+    """
+
+    def __post_init__(self):
+        self.requests = self.usage.requests
+
+    def run_limits(self, limits: _usage.UsageLimits | None) -> _usage.UsageLimits:
+        """Get the limits for a single run in the batch."""
+        limits = limits or _usage.UsageLimits()
+        if self.limits is None:
+            return limits
+        else:
+            return _BatchRunUsageLimits(limits, self)
+
+    def total_usage(self) -> _usage.Usage:
+        """Usage of the batch including runs in progress."""
+        total = _usage.Usage()
+        total.incr(self.usage)
+        for run_usage in self.running.values():
+            total.incr(run_usage)
+        return total
+
+
+class _BatchRunUsageLimits(_usage.UsageLimits):
+    """Limits on a single run in a batch, which also check the batch's limits against the usage of the whole batch."""
+
+    def __init__(self, limits: _usage.UsageLimits, batch: _RunBatch):
+        super().__init__(**{f.name: getattr(limits, f.name) for f in dataclasses.fields(limits)})
+        self.batch = batch
+
+    def has_token_limits(self) -> bool:
+        assert self.batch.limits is not None
+        return super().has_token_limits() or self.batch.limits.has_token_limits()
+
+    def check_before_request(self, usage: _usage.Usage) -> None:
+        assert self.batch.limits is not None
+        super().check_before_request(usage)
+        self.batch.limits.check_before_request(_usage.Usage(requests=self.batch.requests))
+        self.batch.requests += 1
+
+    def check_tokens(self, usage: _usage.Usage) -> None:
+        assert self.batch.limits is not None
+        super().check_tokens(usage)
+        self.batch.limits.check_tokens(self.batch.total_usage())
+
+
+@dataclasses.dataclass
+class _EagerToolCalls(Generic[AgentDeps]):
+    """Function tool calls started while a response is still streaming.
+
+    See [`eager_tool_execution`][pydantic_ai.Agent.eager_tool_execution].
+
+    Calls run with their own copy of the run's tool retries, a call's retry is only counted once the call is taken,
+    so calls whose arguments change after they're started don't use up retries.
+    """
+
+    function_tools: dict[str, Tool[AgentDeps]]
+    run_context: RunContext[AgentDeps]
+    _pending: dict[int, _PendingToolCall] = dataclasses.field(default_factory=dict)
+    """Tool calls which haven't been started yet, by their index in the response."""
+    _started: list[tuple[_messages.ToolCallPart, asyncio.Task[_messages.ModelRequestPart]]] = dataclasses.field(
+        default_factory=list
+    )
+
+    def handle_event(self, event: _messages.ModelResponseStreamEvent) -> None:
+        """Update the tool calls with an event from the stream, and start any calls which are now complete."""
+        if isinstance(event, _messages.PartStartEvent):
+            if not isinstance(event.part, _messages.ToolCallPart):
+                return
+            pending = self._pending[event.index] = _PendingToolCall(event.part)
+            if isinstance(event.part.args, _messages.ArgsJson):
+                pending.feed(event.part.args.args_json)
+        elif isinstance(event.delta, _messages.ToolCallPartDelta) and (pending := self._pending.get(event.index)):
+            delta = event.delta
+            if isinstance(delta.args_delta, str) and isinstance(pending.part.args, _messages.ArgsJson):
+                pending.feed(delta.args_delta)
+                delta = dataclasses.replace(delta, args_delta=None)
+            if delta.tool_name_delta or delta.args_delta is not None or delta.tool_call_id:
+                pending.part = delta.apply(pending.part)
+        else:
+            return
+
+        if pending.complete() and (tool := self.function_tools.get(pending.part.tool_name)):
+            del self._pending[event.index]
+            call = pending.call()
+            run_context = dataclasses.replace(self.run_context, tool_retries=self.run_context.tool_retries.copy())
+            task = asyncio.create_task(tool.run(call, run_context), name=call.tool_name)
+            self._started.append((call, task))
+
+    def take(self, call: _messages.ToolCallPart) -> asyncio.Task[_messages.ModelRequestPart] | None:
+        """Take the task running `call`, if it was started with the same arguments it has in the final response."""
+        for i, (started_call, task) in enumerate(self._started):
+            if started_call == call:
+                del self._started[i]
+                task.add_done_callback(self._count_retry)
+                return task
+
+    def cancel(self) -> None:
+        """Cancel any tasks which haven't been taken."""
+        for _, task in self._started:
+            if task.done():
+                if not task.cancelled():
+                    # retrieve the exception, if any, so it isn't logged as unhandled
+                    task.exception()
+            else:
+                task.cancel()
+        self._started.clear()
+
+    def _count_retry(self, task: asyncio.Task[_messages.ModelRequestPart]) -> None:
+        """Count the retry of a call which was taken, like `Tool.run` does for calls run with the run's context."""
+        if task.cancelled() or task.exception() is not None:
+            return
+        tool_retries = self.run_context.tool_retries
+        tool_name = task.get_name()
+        if isinstance(task.result(), _messages.RetryPromptPart):
+            tool_retries[tool_name] = tool_retries.get(tool_name, 0) + 1
+        else:
+            tool_retries.pop(tool_name, None)
+
+
+@dataclasses.dataclass
+class _PendingToolCall:
+    """A tool call being streamed, whose JSON arguments are parsed as they're received."""
+
+    part: _messages.ToolCallPart
+    """The call so far, the arguments of calls with JSON arguments are only joined in `call`."""
+    chunks: list[str] = dataclasses.field(default_factory=list)
+    parser: _partial_json.PartialJsonParser = dataclasses.field(default_factory=_partial_json.PartialJsonParser)
+    invalid: bool = False
+
+    def feed(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        if not self.invalid:
+            try:
+                self.parser.feed(chunk)
+            except ValueError:
+                # the call can't be started, it's run once the response is complete
+                self.invalid = True
+
+    def complete(self) -> bool:
+        """Whether the arguments have been received in full, i.e. JSON arguments form a complete object."""
+        if isinstance(self.part.args, _messages.ArgsDict):
+            return True
+        return not self.invalid and self.parser.complete and isinstance(self.parser.partial_value(), dict)
+
+    def call(self) -> _messages.ToolCallPart:
+        if isinstance(self.part.args, _messages.ArgsDict):
+            return self.part
+        return dataclasses.replace(self.part, args=_messages.ArgsJson(''.join(self.chunks)))
+
+
+@asynccontextmanager
+async def _request_stream(
+    agent_model: models.AgentModel,
+    messages: list[_messages.ModelMessage],
+    model_settings: ModelSettings | None,
+    step_timings: StepTimings,
+) -> AsyncIterator[models.StreamedResponse]:
+    """Make a streamed request, recording the time spent mapping messages only while the request is opened."""
+    step_timings.request_started()
+    async with AsyncExitStack() as stack:
+        with step_timings.record_message_mapping():
+            response = await stack.enter_async_context(agent_model.request_stream(messages, model_settings))
+        step_timings.response_received()
+        yield response
+
+
+async def _run_tool_tasks(
+    tasks: list[asyncio.Task[_messages.ModelRequestPart]],
+) -> list[_messages.ModelRequestPart]:
+    """Wait for tool calls running concurrently, and return their results in order.
+
+    If a call fails, e.g. because a tool exceeded its retries or a usage limit was hit, or if the run is cancelled,
+    the other calls are cancelled, and this waits for them to finish before raising.
+    """
+    if not tasks:
+        return []
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+    # raise the first error, rather than the cancellation of a call which was cancelled because of it
+    errors = [task.exception() for task in tasks if not task.cancelled()]
+    if error := next((e for e in errors if e is not None), None):
+        raise error
+    return [task.result() for task in tasks]
@@ -2,7 +2,15 @@ from __future__ import annotations as _annotations
 
 import json
 
-__all__ = 'ModelRetry', 'UserError', 'AgentRunError', 'UnexpectedModelBehavior', 'UsageLimitExceeded'
+__all__ = (
+    'ModelRetry',
+    'UserError',
+    'AgentRunError',
+    'UnexpectedModelBehavior',
+    'UsageLimitExceeded',
+    'AllModelsFailed',
+    'ToolTimeout',
+)
 
 
 class ModelRetry(Exception):
@@ -72,3 +80,31 @@ class UnexpectedModelBehavior(AgentRunError):
             return f'{self.message}, body:\n{self.body}'
         else:
             return self.message
+
+
+class AllModelsFailed(AgentRunError):
+    """Error raised when every model a request was sent to failed, e.g. by a [`HedgedModel`][pydantic_ai.models.hedged.HedgedModel]."""
+
+    errors: list[Exception]
+    """The errors raised by each model, in the order they were raised."""
+
+    def __init__(self, errors: list[Exception]):
+        self.errors = errors
+        super().__init__('All models failed: ' + ', '.join(repr(e) for e in errors))
+
+
+class ToolTimeout(AgentRunError):
+    """Error raised when a tool call takes longer than the tool's `timeout`, and its `on_timeout` is `'raise'`.
+
+    See [`Tool`][pydantic_ai.tools.Tool].
+    """
+
+    tool_name: str
+    """The name of the tool which timed out."""
+    timeout: float
+    """The timeout in seconds."""
+
+    def __init__(self, tool_name: str, timeout: float):
+        self.tool_name = tool_name
+        self.timeout = timeout
+        super().__init__(f'Tool {tool_name!r} timed out after {timeout} seconds')
@@ -0,0 +1,214 @@
+"""Executors which run the sync functions of agents: tools, system prompts and result validators."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from multiprocessing.context import BaseContext
+from typing import Any, Callable, TypeVar
+
+from typing_extensions import ParamSpec
+
+__all__ = (
+    'Executor',
+    'ExecutorMetrics',
+    'InlineExecutor',
+    'LoopExecutor',
+    'ThreadExecutor',
+    'ProcessExecutor',
+    'default_executor',
+)
+
+_P = ParamSpec('_P')
+_R = TypeVar('_R')
+
+
+@dataclass
+class ExecutorMetrics:
+    """Metrics of the functions run by an executor."""
+
+    submitted: int = 0
+    """Number of functions submitted to the executor."""
+    completed: int = 0
+    """Number of functions which have completed, successfully or not."""
+    in_flight: int = 0
+    """Number of functions currently waiting for a worker or running."""
+    total_queue_wait: float = 0
+    """Total time in seconds functions waited for a worker."""
+    max_queue_wait: float = 0
+    """Longest time in seconds a function waited for a worker."""
+    total_run_time: float = 0
+    """Total time in seconds spent running functions."""
+
+    @property
+    def mean_queue_wait(self) -> float:
+        """Mean time in seconds functions waited for a worker."""
+        return self.total_queue_wait / self.completed if self.completed else 0
+
+
+class Executor(ABC):
+    """Base class of executors, which run sync functions without blocking the event loop, or inline.
+
+    Async functions are always run in the event loop, executors only apply to sync functions.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = ExecutorMetrics()
+
+    async def run(self, func: Callable[_P, _R], *args: _P.args, **kwargs: _P.kwargs) -> _R:
+        """Run `func` with the given arguments, and return its result."""
+        submitted_at = time.monotonic()
+        with self._lock:
+            self._metrics.submitted += 1
+            self._metrics.in_flight += 1
+        try:
+            started_at, finished_at, ok, value = await self._submit(_timed_call, func, args, kwargs)
+        finally:
+            with self._lock:
+                self._metrics.in_flight -= 1
+
+        queue_wait = max(started_at - submitted_at, 0)
+        with self._lock:
+            metrics = self._metrics
+            metrics.completed += 1
+            metrics.total_queue_wait += queue_wait
+            metrics.max_queue_wait = max(metrics.max_queue_wait, queue_wait)
+            metrics.total_run_time += finished_at - started_at
+        if ok:
+            return value
+        else:
+            raise value
+
+    def metrics(self) -> ExecutorMetrics:
+        """Get a snapshot of the executor's metrics."""
+        with self._lock:
+            return ExecutorMetrics(**self._metrics.__dict__)
+
+    @abstractmethod
+    async def _submit(self, func: Callable[..., _R], *args: Any) -> _R:
+        """Run `func(*args)`, `func` and `args` can be pickled."""
+        raise NotImplementedError()
+
+
+def _timed_call(
+    func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[float, float, bool, Any]:
+    """Call a function in a worker, returning when it started and finished, and its result or exception.
+
+    `time.monotonic()` is system-wide, so the times can be compared between processes.
+    """
+    started_at = time.monotonic()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        return started_at, time.monotonic(), False, e
+    else:
+        return started_at, time.monotonic(), True, result
+
+
+class InlineExecutor(Executor):
+    """Run functions directly in the event loop.
+
+    This avoids the latency of handing functions to a thread, which is worth it for cheap functions, but blocks the
+    event loop while they run, so should only be used for functions which return quickly and don't do I/O.
+    """
+
+    async def _submit(self, func: Callable[..., _R], *args: Any) -> _R:
+        return func(*args)
+
+
+class LoopExecutor(Executor):
+    """Run functions in the event loop's default executor, this is the default.
+
+    Functions are run with
+    [`loop.run_in_executor(None, ...)`](https://docs.python.org/3/library/asyncio-eventloop.html#asyncio.loop.run_in_executor),
+    so share the default executor with everything else in the process which uses it.
+    """
+
+    async def _submit(self, func: Callable[..., _R], *args: Any) -> _R:
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+class _PoolExecutor(Executor):
+    """Run functions in a `concurrent.futures` executor, created when it's first used."""
+
+    def __init__(self):
+        super().__init__()
+        self._pool: concurrent.futures.Executor | None = None
+
+    @abstractmethod
+    def _create_pool(self) -> concurrent.futures.Executor:
+        raise NotImplementedError()
+
+    async def _submit(self, func: Callable[..., _R], *args: Any) -> _R:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._create_pool()
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the pool, it's recreated if the executor is used again.
+
+        Args:
+            wait: Whether to wait for functions which are running or queued to complete.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+class ThreadExecutor(_PoolExecutor):
+    """Run functions in a pool of threads with a bounded number of workers.
+
+    Functions wait for a worker once all `max_workers` are busy, see
+    [`ExecutorMetrics.max_queue_wait`][pydantic_ai.executors.ExecutorMetrics.max_queue_wait].
+    """
+
+    def __init__(self, max_workers: int = 4, *, thread_name_prefix: str = 'pydantic-ai'):
+        """Create a thread executor.
+
+        Args:
+            max_workers: Maximum number of threads running functions at once.
+            thread_name_prefix: Prefix of the names of the threads.
+        """
+        super().__init__()
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+
+    def _create_pool(self) -> concurrent.futures.Executor:
+        return concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix=self.thread_name_prefix)
+
+
+class ProcessExecutor(_PoolExecutor):
+    """Run functions in a pool of processes, for CPU-bound tools.
+
+    Functions, their arguments and their results must be picklable, so functions must be defined at the top level
+    of a module, and tools can't take [`RunContext`][pydantic_ai.tools.RunContext]. For this reason, process
+    executors can only be used for individual tools, not as the executor of an agent.
+    """
+
+    def __init__(self, max_workers: int | None = None, *, mp_context: BaseContext | None = None):
+        """Create a process executor.
+
+        Args:
+            max_workers: Maximum number of processes, defaults to the number of CPUs.
+            mp_context: The multiprocessing context used to start processes, e.g.
+                `multiprocessing.get_context('spawn')`, defaults to the platform's default.
+        """
+        super().__init__()
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+
+    def _create_pool(self) -> concurrent.futures.Executor:
+        return concurrent.futures.ProcessPoolExecutor(self.max_workers, mp_context=self.mp_context)
+
+
+default_executor: Executor = LoopExecutor()
+"""The executor used by agents which aren't given one, and so by their tools which aren't given one."""
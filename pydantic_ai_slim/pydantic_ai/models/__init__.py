@@ -14,8 +14,6 @@ from datetime import datetime
 from functools import cache
 from typing import TYPE_CHECKING, Literal
 
-import httpx
-
 from .._parts_manager import ModelResponsePartsManager
 from ..exceptions import UserError
 from ..messages import ModelMessage, ModelResponse, ModelResponseStreamEvent
@@ -23,6 +21,8 @@ from ..settings import ModelSettings
 from ..usage import Usage
 
 if TYPE_CHECKING:
+    import httpx
+
     from ..tools import ToolDefinition
 
 
@@ -290,10 +290,19 @@ def cached_async_http_client(timeout: int = 600, connect: int = 5) -> httpx.Asyn
 
     The default timeouts match those of OpenAI,
     see <https://github.com/openai/openai-python/blob/v1.54.4/src/openai/_constants.py#L9>.
+
+    Requests are sent through the connection pools of
+    [`http_pool.default_registry`][pydantic_ai.models.http_pool.default_registry], which has a pool for each host
+    and event loop, so the client can be used from several event loops, e.g. with `run_sync` in several threads.
     """
+    import httpx
+
+    from .http_pool import default_registry
+
     return httpx.AsyncClient(
         timeout=httpx.Timeout(timeout=timeout, connect=connect),
         headers={'User-Agent': get_user_agent()},
+        transport=default_registry,
     )
 
 
@@ -3,12 +3,13 @@ from __future__ import annotations as _annotations
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
+from itertools import chain
 from typing import Any, Literal, Union, cast, overload
 
 from httpx import AsyncClient as AsyncHTTPClient
 from typing_extensions import assert_never
 
-from .. import usage
+from .. import _utils, usage
 from .._utils import guard_tool_call_id as _guard_tool_call_id
 from ..messages import (
     ArgsDict,
@@ -24,6 +25,7 @@ from ..messages import (
     UserPromptPart,
 )
 from ..settings import ModelSettings
+from ..timings import measure_message_mapping
 from ..tools import ToolDefinition
 from . import (
     AgentModel,
@@ -86,6 +88,8 @@ class AnthropicModel(Model):
 
     model_name: AnthropicModelName
     client: AsyncAnthropic = field(repr=False)
+    _message_cache: _utils.IdentityCache[ModelMessage, tuple[str, list[MessageParam]]] = field(repr=False)
+    _tool_cache: _utils.IdentitySequenceCache[ToolDefinition, ToolParam] = field(repr=False)
 
     def __init__(
         self,
@@ -116,6 +120,8 @@ class AnthropicModel(Model):
             self.client = AsyncAnthropic(api_key=api_key, http_client=http_client)
         else:
             self.client = AsyncAnthropic(api_key=api_key, http_client=cached_async_http_client())
+        self._message_cache = _utils.IdentityCache()
+        self._tool_cache = _utils.IdentitySequenceCache()
 
     async def agent_model(
         self,
@@ -125,14 +131,17 @@ class AnthropicModel(Model):
         result_tools: list[ToolDefinition],
     ) -> AgentModel:
         check_allow_model_requests()
-        tools = [self._map_tool_definition(r) for r in function_tools]
-        if result_tools:
-            tools += [self._map_tool_definition(r) for r in result_tools]
+        # tool definitions are usually the same instances at every step, so their mapping is cached,
+        # keyed on the definitions and invalidated if any of their fields are replaced
+        tools = self._tool_cache.get(
+            chain(function_tools, result_tools), self._map_tool_definition, lambda t: vars(t).values()
+        )
         return AnthropicAgentModel(
             self.client,
             self.model_name,
             allow_text_result,
             tools,
+            self._message_cache,
         )
 
     def name(self) -> str:
@@ -155,6 +164,10 @@ class AnthropicAgentModel(AgentModel):
     model_name: str
     allow_text_result: bool
     tools: list[ToolParam]
+    message_cache: _utils.IdentityCache[ModelMessage, tuple[str, list[MessageParam]]] = field(
+        default_factory=_utils.IdentityCache, repr=False
+    )
+    """Cache of mapped messages, shared by the agent models of one model so each step only maps new messages."""
 
     async def request(
         self, messages: list[ModelMessage], model_settings: ModelSettings | None
@@ -193,7 +206,7 @@ class AnthropicAgentModel(AgentModel):
         else:
             tool_choice = {'type': 'auto'}
 
-        system_prompt, anthropic_messages = self._map_message(messages)
+        system_prompt, anthropic_messages = self._map_messages(messages)
 
         model_settings = model_settings or {}
 
@@ -248,19 +261,46 @@ class AnthropicAgentModel(AgentModel):
         #
         # We might refactor streaming internally before we implement this...
 
+    def _map_messages(self, messages: list[ModelMessage]) -> tuple[str, list[MessageParam]]:
+        """Map messages, reusing the result for messages which have already been mapped and haven't changed since."""
+        system_prompt: str = ''
+        anthropic_messages: list[MessageParam] = []
+        with measure_message_mapping():
+            for m in messages:
+                message_system_prompt, message_params = self.message_cache.get(m, self._map_message, m.parts)
+                system_prompt += message_system_prompt
+                anthropic_messages.extend(message_params)
+        return system_prompt, anthropic_messages
+
     @staticmethod
-    def _map_message(messages: list[ModelMessage]) -> tuple[str, list[MessageParam]]:
-        """Just maps a `pydantic_ai.Message` to a `anthropic.types.MessageParam`."""
+    def _map_message(m: ModelMessage) -> tuple[str, list[MessageParam]]:
+        """Just maps a `pydantic_ai.Message` to its system prompt and `anthropic.types.MessageParam`s."""
         system_prompt: str = ''
         anthropic_messages: list[MessageParam] = []
-        for m in messages:
-            if isinstance(m, ModelRequest):
-                for part in m.parts:
-                    if isinstance(part, SystemPromptPart):
-                        system_prompt += part.content
-                    elif isinstance(part, UserPromptPart):
-                        anthropic_messages.append(MessageParam(role='user', content=part.content))
-                    elif isinstance(part, ToolReturnPart):
+        if isinstance(m, ModelRequest):
+            for part in m.parts:
+                if isinstance(part, SystemPromptPart):
+                    system_prompt += part.content
+                elif isinstance(part, UserPromptPart):
+                    anthropic_messages.append(MessageParam(role='user', content=part.content))
+                elif isinstance(part, ToolReturnPart):
+                    anthropic_messages.append(
+                        MessageParam(
+                            role='user',
+                            content=[
+                                ToolResultBlockParam(
+                                    tool_use_id=_guard_tool_call_id(t=part, model_source='Anthropic'),
+                                    type='tool_result',
+                                    content=part.model_response_str(),
+                                    is_error=False,
+                                )
+                            ],
+                        )
+                    )
+                elif isinstance(part, RetryPromptPart):
+                    if part.tool_name is None:
+                        anthropic_messages.append(MessageParam(role='user', content=part.model_response()))
+                    else:
                         anthropic_messages.append(
                             MessageParam(
                                 role='user',
@@ -268,40 +308,23 @@ class AnthropicAgentModel(AgentModel):
                                     ToolResultBlockParam(
                                         tool_use_id=_guard_tool_call_id(t=part, model_source='Anthropic'),
                                         type='tool_result',
-                                        content=part.model_response_str(),
-                                        is_error=False,
-                                    )
+                                        content=part.model_response(),
+                                        is_error=True,
+                                    ),
                                 ],
                             )
                         )
-                    elif isinstance(part, RetryPromptPart):
-                        if part.tool_name is None:
-                            anthropic_messages.append(MessageParam(role='user', content=part.model_response()))
-                        else:
-                            anthropic_messages.append(
-                                MessageParam(
-                                    role='user',
-                                    content=[
-                                        ToolResultBlockParam(
-                                            tool_use_id=_guard_tool_call_id(t=part, model_source='Anthropic'),
-                                            type='tool_result',
-                                            content=part.model_response(),
-                                            is_error=True,
-                                        ),
-                                    ],
-                                )
-                            )
-            elif isinstance(m, ModelResponse):
-                content: list[TextBlockParam | ToolUseBlockParam] = []
-                for item in m.parts:
-                    if isinstance(item, TextPart):
-                        content.append(TextBlockParam(text=item.content, type='text'))
-                    else:
-                        assert isinstance(item, ToolCallPart)
-                        content.append(_map_tool_call(item))
-                anthropic_messages.append(MessageParam(role='assistant', content=content))
-            else:
-                assert_never(m)
+        elif isinstance(m, ModelResponse):
+            content: list[TextBlockParam | ToolUseBlockParam] = []
+            for item in m.parts:
+                if isinstance(item, TextPart):
+                    content.append(TextBlockParam(text=item.content, type='text'))
+                else:
+                    assert isinstance(item, ToolCallPart)
+                    content.append(_map_tool_call(item))
+            anthropic_messages.append(MessageParam(role='assistant', content=content))
+        else:
+            assert_never(m)
         return system_prompt, anthropic_messages
 
 
@@ -0,0 +1,344 @@
+"""Caching of model responses, so identical requests are only sent to the underlying model once."""
+
+from __future__ import annotations as _annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pydantic
+import pydantic_core
+from typing_extensions import NotRequired, TypedDict
+
+from .. import _utils
+from ..messages import ModelMessage, ModelMessagesTypeAdapter, ModelResponse, ModelResponseStreamEvent, PartStartEvent
+from ..settings import ModelSettings
+from ..tools import ToolDefinition
+from ..usage import Usage
+from . import AgentModel, KnownModelName, Model, StreamedResponse, infer_model
+
+
+class CacheStore(ABC):
+    """Storage for cached model responses, keyed by a hash of the request."""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Get the value stored for `key`, or `None` if there isn't one."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        """Store `value` for `key`, replacing any existing value."""
+        raise NotImplementedError()
+
+
+class MemoryCacheStore(CacheStore):
+    """Store responses in memory, bounded by the number and age of entries.
+
+    When the store is full, the least recently used response is evicted.
+    """
+
+    def __init__(self, maxsize: int | None = 1024, ttl: float | None = None):
+        """Create an in-memory store.
+
+        Args:
+            maxsize: Maximum number of responses to store, `None` for no limit.
+            ttl: Time in seconds after which a response expires, `None` if responses never expire.
+        """
+        self._cache = _utils.LRUCache[str, bytes](maxsize, ttl)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._cache.set(key, value)
+
+
+class SQLiteCacheStore(CacheStore):
+    """Store responses in a SQLite database, so they're kept between processes.
+
+    Database access happens in a thread so it doesn't block the event loop.
+    """
+
+    def __init__(self, path: str | Path, *, ttl: float | None = None):
+        """Create a SQLite store.
+
+        Args:
+            path: Path of the database file, it's created if it doesn't exist.
+            ttl: Time in seconds after which a response expires, `None` if responses never expire.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        return await _utils.run_in_executor(self._get, key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        await _utils.run_in_executor(self._set, key, value)
+
+    def close(self) -> None:
+        """Close the connection to the database, it's reopened if the store is used again."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _get(self, key: str) -> bytes | None:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute('SELECT value, created_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl is not None and created_at + self.ttl <= time.time():
+                with connection:
+                    connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return None
+            return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)',
+                    (key, value, time.time()),
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            with connection:
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS responses '
+                    '(key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at REAL NOT NULL)'
+                )
+            self._connection = connection
+        return self._connection
+
+
+@dataclass(init=False)
+class CachedModel(Model):
+    """A model which caches the responses of another model.
+
+    Requests are identified by a hash of the messages, tool definitions, whether a text result is allowed,
+    model settings and the name of the underlying model, so identical requests are only sent to the underlying
+    model once. Message timestamps and the `timeout` setting don't affect the result, so they're not included.
+
+    Streamed responses are cached too, cached responses are streamed by replaying the events recorded when the
+    response was first received.
+    """
+
+    model: Model
+    store: CacheStore
+
+    def __init__(self, model: Model | KnownModelName, store: CacheStore | None = None):
+        """Initialize a `CachedModel`.
+
+        Args:
+            model: The model to cache responses from.
+            store: Where to store responses, defaults to a [`MemoryCacheStore`][pydantic_ai.models.cached.MemoryCacheStore].
+        """
+        self.model = infer_model(model)
+        self.store = store or MemoryCacheStore()
+
+    async def agent_model(
+        self,
+        *,
+        function_tools: list[ToolDefinition],
+        allow_text_result: bool,
+        result_tools: list[ToolDefinition],
+    ) -> AgentModel:
+        return CachedAgentModel(self.model, self.store, function_tools, allow_text_result, result_tools)
+
+    def name(self) -> str:
+        return self.model.name()
+
+
+@dataclass
+class CachedAgentModel(AgentModel):
+    """Implementation of `AgentModel` for [CachedModel][pydantic_ai.models.cached.CachedModel]."""
+
+    model: Model
+    store: CacheStore
+    function_tools: list[ToolDefinition]
+    allow_text_result: bool
+    result_tools: list[ToolDefinition]
+    _agent_model: AgentModel | None = field(default=None, init=False, repr=False)
+
+    async def request(
+        self, messages: list[ModelMessage], model_settings: ModelSettings | None
+    ) -> tuple[ModelResponse, Usage]:
+        key = self.cache_key(messages, model_settings)
+        if (entry := await self._load(key)) is not None:
+            return entry['response'], entry['usage']
+
+        agent_model = await self._get_agent_model()
+        response, usage = await agent_model.request(messages, model_settings)
+        await self.store.set(key, _cache_entry_ta.dump_json(_CacheEntry(response=response, usage=usage)))
+        return response, usage
+
+    @asynccontextmanager
+    async def request_stream(
+        self, messages: list[ModelMessage], model_settings: ModelSettings | None
+    ) -> AsyncIterator[StreamedResponse]:
+        key = self.cache_key(messages, model_settings)
+        if (entry := await self._load(key)) is not None:
+            yield CachedStreamedResponse(entry)
+            return
+
+        agent_model = await self._get_agent_model()
+        async with agent_model.request_stream(messages, model_settings) as response:
+            recorder = RecordingStreamedResponse(response)
+            yield recorder
+
+        # only cache responses which were streamed in full
+        if recorder.complete:
+            entry = _CacheEntry(response=recorder.get(), usage=recorder.usage(), events=recorder.events)
+            await self.store.set(key, _cache_entry_ta.dump_json(entry))
+
+    def cache_key(self, messages: list[ModelMessage], model_settings: ModelSettings | None) -> str:
+        """Calculate the key identifying a request in the cache."""
+        return request_key(
+            self.model.name(),
+            messages,
+            self.function_tools,
+            self.allow_text_result,
+            self.result_tools,
+            model_settings,
+        )
+
+    async def _load(self, key: str) -> _CacheEntry | None:
+        value = await self.store.get(key)
+        if value is None:
+            return None
+        try:
+            return _cache_entry_ta.validate_json(value)
+        except pydantic.ValidationError:
+            # e.g. stored by an incompatible version, treat it as a miss so it's replaced
+            return None
+
+    async def _get_agent_model(self) -> AgentModel:
+        # the agent model of the underlying model is only created if a request isn't cached
+        if self._agent_model is None:
+            self._agent_model = await self.model.agent_model(
+                function_tools=self.function_tools,
+                allow_text_result=self.allow_text_result,
+                result_tools=self.result_tools,
+            )
+        return self._agent_model
+
+
+@dataclass
+class CachedStreamedResponse(StreamedResponse):
+    """Implementation of `StreamedResponse` which replays a cached response."""
+
+    _entry: _CacheEntry
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        response = self._entry['response']
+        events = self._entry.get('events')
+        if events is None:
+            # the response was cached from a request which wasn't streamed, so stream its parts
+            events = [PartStartEvent(index=index, part=part) for index, part in enumerate(response.parts)]
+
+        for event in events:
+            # parts are recreated from the events, so `get()` returns the response so far at each point in the stream
+            if (replayed_event := self._parts_manager.handle_event(event)) is not None:  # pragma: no branch
+                yield replayed_event
+
+        self._usage += self._entry['usage']
+
+    def timestamp(self) -> datetime:
+        return self._entry['response'].timestamp
+
+
+@dataclass
+class RecordingStreamedResponse(StreamedResponse):
+    """Implementation of `StreamedResponse` which records the events of another streamed response to cache them."""
+
+    _response: StreamedResponse
+    events: list[ModelResponseStreamEvent] = field(default_factory=list, init=False)
+    """Events received so far."""
+    complete: bool = field(default=False, init=False)
+    """Whether the response has been received in full."""
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        async for event in self._response:
+            self.events.append(event)
+            yield event
+        self.complete = True
+
+    def get(self) -> ModelResponse:
+        return self._response.get()
+
+    def usage(self) -> Usage:
+        return self._response.usage()
+
+    def timestamp(self) -> datetime:
+        return self._response.timestamp()
+
+
+class _CacheEntry(TypedDict):
+    response: ModelResponse
+    usage: Usage
+    events: NotRequired[list[ModelResponseStreamEvent]]
+    """Events of the response, if it was streamed."""
+
+
+_cache_entry_ta = pydantic.TypeAdapter(_CacheEntry)
+
+
+def request_key(
+    model_name: str,
+    messages: list[ModelMessage],
+    function_tools: list[ToolDefinition],
+    allow_text_result: bool,
+    result_tools: list[ToolDefinition],
+    model_settings: ModelSettings | None,
+) -> str:
+    """Calculate a hash identifying a request, so identical requests can share a response.
+
+    Message timestamps and the `timeout` setting don't affect the response, so they're not included.
+
+    Args:
+        model_name: The name of the model the request is sent to.
+        messages: The messages sent to the model.
+        function_tools: Definitions of the function tools available to the model.
+        allow_text_result: Whether a plain text result is allowed.
+        result_tools: Definitions of the result tools available to the model.
+        model_settings: The model settings used for the request.
+
+    Returns:
+        The hex digest of a SHA-256 hash of the canonical JSON representation of the request.
+    """
+    request = {
+        'model': model_name,
+        'messages': [_without_timestamps(m) for m in ModelMessagesTypeAdapter.dump_python(messages, mode='json')],
+        'function_tools': [asdict(t) for t in function_tools],
+        'allow_text_result': allow_text_result,
+        'result_tools': [asdict(t) for t in result_tools],
+        # the timeout doesn't change the response
+        'model_settings': {k: v for k, v in (model_settings or {}).items() if k != 'timeout'},
+    }
+    request_json = json.dumps(pydantic_core.to_jsonable_python(request), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(request_json.encode()).hexdigest()
+
+
+def _without_timestamps(message: dict[str, Any]) -> dict[str, Any]:
+    """Remove the timestamps of a serialized message and its parts, which don't affect the model's response."""
+    message.pop('timestamp', None)
+    for part in message['parts']:
+        part.pop('timestamp', None)
+    return message
@@ -0,0 +1,249 @@
+"""Coalescing of identical concurrent requests, so only one of them is sent to the underlying model."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from copy import copy, deepcopy
+from dataclasses import dataclass, field
+from datetime import datetime
+from weakref import WeakKeyDictionary
+
+from ..messages import ModelMessage, ModelResponse, ModelResponseStreamEvent
+from ..settings import ModelSettings
+from ..tools import ToolDefinition
+from ..usage import Usage
+from . import AgentModel, KnownModelName, Model, StreamedResponse, infer_model
+from .cached import request_key
+
+
+@dataclass(init=False)
+class CoalescingModel(Model):
+    """A model which coalesces identical concurrent requests to another model.
+
+    While a request is in progress, identical requests wait for its response instead of being sent to the underlying
+    model, this is sometimes called "single-flight". Requests are identified in the same way as by
+    [`CachedModel`][pydantic_ai.models.cached.CachedModel], but responses aren't kept once the request has
+    completed, so a request made afterwards is sent to the underlying model again.
+
+    Streamed requests join the stream already in progress: every event received so far is replayed, then events are
+    received as they arrive. Each request gets its own copy of the response and reports the usage of the request made
+    to the underlying model.
+
+    The underlying request is only cancelled once every request waiting for it has been cancelled.
+    """
+
+    model: Model
+    _requests: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _InFlightRequest]] = field(repr=False)
+    _streams: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, StreamBroadcast]] = field(repr=False)
+
+    def __init__(self, model: Model | KnownModelName):
+        """Initialize a `CoalescingModel`.
+
+        Args:
+            model: The model to send requests to.
+        """
+        self.model = infer_model(model)
+        # requests are tied to the event loop they're made in, so requests in other loops aren't coalesced with them
+        self._requests = WeakKeyDictionary()
+        self._streams = WeakKeyDictionary()
+
+    async def agent_model(
+        self,
+        *,
+        function_tools: list[ToolDefinition],
+        allow_text_result: bool,
+        result_tools: list[ToolDefinition],
+    ) -> AgentModel:
+        return CoalescingAgentModel(
+            self.model, self._requests, self._streams, function_tools, allow_text_result, result_tools
+        )
+
+    def name(self) -> str:
+        return self.model.name()
+
+    def in_flight_requests(self) -> int:
+        """Number of requests to the underlying model in progress in the current event loop."""
+        loop = asyncio.get_running_loop()
+        return len(self._requests.get(loop, {})) + len(self._streams.get(loop, {}))
+
+
+@dataclass
+class CoalescingAgentModel(AgentModel):
+    """Implementation of `AgentModel` for [CoalescingModel][pydantic_ai.models.coalescing.CoalescingModel]."""
+
+    model: Model
+    requests: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _InFlightRequest]] = field(repr=False)
+    streams: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, StreamBroadcast]] = field(repr=False)
+    function_tools: list[ToolDefinition]
+    allow_text_result: bool
+    result_tools: list[ToolDefinition]
+    _agent_model: AgentModel | None = field(default=None, init=False, repr=False)
+
+    async def request(
+        self, messages: list[ModelMessage], model_settings: ModelSettings | None
+    ) -> tuple[ModelResponse, Usage]:
+        agent_model = await self._get_agent_model()
+        key = self._request_key(messages, model_settings)
+        requests = self.requests.setdefault(asyncio.get_running_loop(), {})
+
+        in_flight = requests.get(key)
+        if in_flight is None:
+            in_flight = _InFlightRequest(asyncio.create_task(agent_model.request(messages, model_settings)))
+            requests[key] = in_flight
+            in_flight.task.add_done_callback(lambda _: _remove(requests, key, in_flight))
+
+        in_flight.waiters += 1
+        try:
+            response, usage = await asyncio.shield(in_flight.task)
+        finally:
+            in_flight.waiters -= 1
+            if in_flight.waiters == 0 and not in_flight.task.done():
+                # every request waiting for the response has been cancelled
+                _remove(requests, key, in_flight)
+                in_flight.task.cancel()
+                await asyncio.wait([in_flight.task])
+        # requests sharing a response mustn't be affected by changes made to each other's response
+        return deepcopy(response), copy(usage)
+
+    @asynccontextmanager
+    async def request_stream(
+        self, messages: list[ModelMessage], model_settings: ModelSettings | None
+    ) -> AsyncIterator[StreamedResponse]:
+        agent_model = await self._get_agent_model()
+        key = self._request_key(messages, model_settings)
+        streams = self.streams.setdefault(asyncio.get_running_loop(), {})
+
+        broadcast = streams.get(key)
+        if broadcast is None:
+            broadcast = StreamBroadcast(agent_model.request_stream(messages, model_settings))
+            streams[key] = broadcast
+            broadcast.task.add_done_callback(lambda _: _remove(streams, key, broadcast))
+
+        broadcast.subscribers += 1
+        try:
+            timestamp = await asyncio.shield(broadcast.opened)
+            yield BroadcastStreamedResponse(broadcast, timestamp)
+        finally:
+            broadcast.subscribers -= 1
+            if broadcast.subscribers == 0 and not broadcast.done:
+                # every request receiving the stream has finished with it before it completed
+                _remove(streams, key, broadcast)
+                broadcast.task.cancel()
+                await asyncio.wait([broadcast.task])
+
+    def _request_key(self, messages: list[ModelMessage], model_settings: ModelSettings | None) -> str:
+        return request_key(
+            self.model.name(),
+            messages,
+            self.function_tools,
+            self.allow_text_result,
+            self.result_tools,
+            model_settings,
+        )
+
+    async def _get_agent_model(self) -> AgentModel:
+        if self._agent_model is None:
+            self._agent_model = await self.model.agent_model(
+                function_tools=self.function_tools,
+                allow_text_result=self.allow_text_result,
+                result_tools=self.result_tools,
+            )
+        return self._agent_model
+
+
+@dataclass
+class BroadcastStreamedResponse(StreamedResponse):
+    """Implementation of `StreamedResponse` which receives the events of a stream shared between requests."""
+
+    _broadcast: StreamBroadcast
+    _timestamp: datetime
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        broadcast = self._broadcast
+        index = 0
+        while True:
+            # events received before this response joined the stream are replayed first
+            while index < len(broadcast.events):
+                if (
+                    event := self._parts_manager.handle_event(broadcast.events[index])
+                ) is not None:  # pragma: no branch
+                    yield event
+                index += 1
+            if broadcast.done:
+                break
+            await broadcast.wait()
+
+        if broadcast.error is not None:
+            raise broadcast.error
+        self._usage += broadcast.usage
+
+    def timestamp(self) -> datetime:
+        return self._timestamp
+
+
+@dataclass
+class _InFlightRequest:
+    task: asyncio.Task[tuple[ModelResponse, Usage]]
+    waiters: int = 0
+
+
+class StreamBroadcast:
+    """A streamed request received in a task of its own, whose events are buffered for every request receiving them.
+
+    Each request receives the events through a [`BroadcastStreamedResponse`][pydantic_ai.models.coalescing.BroadcastStreamedResponse].
+    """
+
+    def __init__(self, stream: AbstractAsyncContextManager[StreamedResponse]):
+        self.events: list[ModelResponseStreamEvent] = []
+        self.usage = Usage()
+        self.error: Exception | None = None
+        self.subscribers = 0
+        self.done = False
+        self.opened: asyncio.Future[datetime] = asyncio.get_running_loop().create_future()
+        self._changed = asyncio.Event()
+        self.task = asyncio.create_task(self._receive(stream))
+
+    async def wait(self) -> None:
+        """Wait until more events are received or the stream completes."""
+        await self._changed.wait()
+
+    async def wait_started(self) -> None:
+        """Wait until the first event is received or the stream completes.
+
+        Raises:
+            Exception: The error raised by the stream, if it failed before any events were received.
+        """
+        await asyncio.shield(self.opened)
+        while not self.events and not self.done:
+            await self.wait()
+        if not self.events and self.error is not None:
+            raise self.error
+
+    async def _receive(self, stream: AbstractAsyncContextManager[StreamedResponse]) -> None:
+        try:
+            async with stream as response:
+                self.opened.set_result(response.timestamp())
+                async for event in response:
+                    self.events.append(event)
+                    self._notify()
+                self.usage = response.usage()
+        except Exception as e:
+            self.error = e
+            if not self.opened.done():
+                self.opened.set_exception(e)
+        finally:
+            self.done = True
+            self._notify()
+
+    def _notify(self) -> None:
+        # each wait uses the event current at the time, so it only has to be set and never cleared
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+
+def _remove(in_flight: dict[str, _InFlightRequest] | dict[str, StreamBroadcast], key: str, value: object) -> None:
+    # a new request with the same key may have been started after this one was abandoned
+    if in_flight.get(key) is value:
+        del in_flight[key]
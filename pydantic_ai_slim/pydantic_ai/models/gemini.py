@@ -7,6 +7,7 @@ from contextlib import asynccontextmanager
 from copy import deepcopy
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import chain
 from typing import Annotated, Any, Literal, Protocol, Union
 from uuid import uuid4
 
@@ -29,6 +30,7 @@ from ..messages import (
     UserPromptPart,
 )
 from ..settings import ModelSettings
+from ..timings import measure_message_mapping
 from ..tools import ToolDefinition
 from . import (
     AgentModel,
@@ -62,6 +64,10 @@ class GeminiModel(Model):
     auth: AuthProtocol
     http_client: AsyncHTTPClient
     url: str
+    _message_cache: _utils.IdentityCache[ModelMessage, tuple[list[_GeminiTextPart], list[_GeminiContent]]] = field(
+        repr=False
+    )
+    _tool_cache: _utils.IdentitySequenceCache[ToolDefinition, _GeminiFunction] = field(repr=False)
 
     def __init__(
         self,
@@ -91,6 +97,8 @@ class GeminiModel(Model):
         self.auth = ApiKeyAuth(api_key)
         self.http_client = http_client or cached_async_http_client()
         self.url = url_template.format(model=model_name)
+        self._message_cache = _utils.IdentityCache()
+        self._tool_cache = _utils.IdentitySequenceCache()
 
     async def agent_model(
         self,
@@ -108,6 +116,8 @@ class GeminiModel(Model):
             function_tools=function_tools,
             allow_text_result=allow_text_result,
             result_tools=result_tools,
+            message_cache=self._message_cache,
+            tool_cache=self._tool_cache,
         )
 
     def name(self) -> str:
@@ -141,6 +151,10 @@ class GeminiAgentModel(AgentModel):
     tools: _GeminiTools | None
     tool_config: _GeminiToolConfig | None
     url: str
+    message_cache: _utils.IdentityCache[ModelMessage, tuple[list[_GeminiTextPart], list[_GeminiContent]]] = field(
+        repr=False
+    )
+    """Cache of mapped messages, shared by the agent models of one model so each step only maps new messages."""
 
     def __init__(
         self,
@@ -151,10 +165,17 @@ class GeminiAgentModel(AgentModel):
         function_tools: list[ToolDefinition],
         allow_text_result: bool,
         result_tools: list[ToolDefinition],
+        message_cache: _utils.IdentityCache[ModelMessage, tuple[list[_GeminiTextPart], list[_GeminiContent]]]
+        | None = None,
+        tool_cache: _utils.IdentitySequenceCache[ToolDefinition, _GeminiFunction] | None = None,
     ):
-        tools = [_function_from_abstract_tool(t) for t in function_tools]
-        if result_tools:
-            tools += [_function_from_abstract_tool(t) for t in result_tools]
+        # simplifying a tool's JSON schema is relatively expensive, and tool definitions are usually the same
+        # instances at every step, so it's cached, keyed on the definitions and invalidated if any field is replaced
+        if tool_cache is None:
+            tool_cache = _utils.IdentitySequenceCache()
+        tools = tool_cache.get(
+            chain(function_tools, result_tools), _function_from_abstract_tool, lambda t: vars(t).values()
+        )
 
         if allow_text_result:
             tool_config = None
@@ -167,6 +188,7 @@ class GeminiAgentModel(AgentModel):
         self.tools = _GeminiTools(function_declarations=tools) if tools else None
         self.tool_config = tool_config
         self.url = url
+        self.message_cache = _utils.IdentityCache() if message_cache is None else message_cache
 
     async def request(
         self, messages: list[ModelMessage], model_settings: ModelSettings | None
@@ -240,58 +262,60 @@ class GeminiAgentModel(AgentModel):
     async def _process_streamed_response(http_response: HTTPResponse) -> StreamedResponse:
         """Process a streamed response, and prepare a streaming response to return."""
         aiter_bytes = http_response.aiter_bytes()
-        start_response: _GeminiResponse | None = None
-        content = bytearray()
+        framer = _JsonArrayFramer()
+        responses: list[_GeminiResponse] = []
 
         async for chunk in aiter_bytes:
-            content.extend(chunk)
-            responses = _gemini_streamed_response_ta.validate_json(
-                content,
-                experimental_allow_partial='trailing-strings',
-            )
-            if responses:
-                last = responses[-1]
-                if last['candidates'] and last['candidates'][0]['content']['parts']:
-                    start_response = last
-                    break
-
-        if start_response is None:
+            responses.extend(_gemini_response_ta.validate_json(element) for element in framer.feed(chunk))
+            if any(r['candidates'] and r['candidates'][0]['content']['parts'] for r in responses):
+                break
+        else:
             raise UnexpectedModelBehavior('Streamed response ended without content or tool calls')
 
-        return GeminiStreamedResponse(_content=content, _stream=aiter_bytes)
+        return GeminiStreamedResponse(_responses=responses, _framer=framer, _stream=aiter_bytes)
 
-    @classmethod
     def _message_to_gemini_content(
-        cls, messages: list[ModelMessage]
+        self, messages: list[ModelMessage]
     ) -> tuple[list[_GeminiTextPart], list[_GeminiContent]]:
+        """Map messages, reusing the result for messages which have already been mapped and haven't changed since."""
         sys_prompt_parts: list[_GeminiTextPart] = []
         contents: list[_GeminiContent] = []
-        for m in messages:
-            if isinstance(m, ModelRequest):
-                message_parts: list[_GeminiPartUnion] = []
-
-                for part in m.parts:
-                    if isinstance(part, SystemPromptPart):
-                        sys_prompt_parts.append(_GeminiTextPart(text=part.content))
-                    elif isinstance(part, UserPromptPart):
-                        message_parts.append(_GeminiTextPart(text=part.content))
-                    elif isinstance(part, ToolReturnPart):
-                        message_parts.append(_response_part_from_response(part.tool_name, part.model_response_object()))
-                    elif isinstance(part, RetryPromptPart):
-                        if part.tool_name is None:
-                            message_parts.append(_GeminiTextPart(text=part.model_response()))
-                        else:
-                            response = {'call_error': part.model_response()}
-                            message_parts.append(_response_part_from_response(part.tool_name, response))
+        with measure_message_mapping():
+            for m in messages:
+                message_sys_prompt_parts, message_contents = self.message_cache.get(m, self._map_message, m.parts)
+                sys_prompt_parts.extend(message_sys_prompt_parts)
+                contents.extend(message_contents)
+        return sys_prompt_parts, contents
+
+    @staticmethod
+    def _map_message(m: ModelMessage) -> tuple[list[_GeminiTextPart], list[_GeminiContent]]:
+        sys_prompt_parts: list[_GeminiTextPart] = []
+        contents: list[_GeminiContent] = []
+        if isinstance(m, ModelRequest):
+            message_parts: list[_GeminiPartUnion] = []
+
+            for part in m.parts:
+                if isinstance(part, SystemPromptPart):
+                    sys_prompt_parts.append(_GeminiTextPart(text=part.content))
+                elif isinstance(part, UserPromptPart):
+                    message_parts.append(_GeminiTextPart(text=part.content))
+                elif isinstance(part, ToolReturnPart):
+                    message_parts.append(_response_part_from_response(part.tool_name, part.model_response_object()))
+                elif isinstance(part, RetryPromptPart):
+                    if part.tool_name is None:
+                        message_parts.append(_GeminiTextPart(text=part.model_response()))
                     else:
-                        assert_never(part)
+                        response = {'call_error': part.model_response()}
+                        message_parts.append(_response_part_from_response(part.tool_name, response))
+                else:
+                    assert_never(part)
 
-                if message_parts:
-                    contents.append(_GeminiContent(role='user', parts=message_parts))
-            elif isinstance(m, ModelResponse):
-                contents.append(_content_model_response(m))
-            else:
-                assert_never(m)
+            if message_parts:
+                contents.append(_GeminiContent(role='user', parts=message_parts))
+        elif isinstance(m, ModelResponse):
+            contents.append(_content_model_response(m))
+        else:
+            assert_never(m)
 
         return sys_prompt_parts, contents
 
@@ -300,7 +324,9 @@ class GeminiAgentModel(AgentModel):
 class GeminiStreamedResponse(StreamedResponse):
     """Implementation of `StreamedResponse` for the Gemini model."""
 
-    _content: bytearray
+    _responses: list[_GeminiResponse]
+    """Responses received before the streamed response was returned."""
+    _framer: _JsonArrayFramer
     _stream: AsyncIterator[bytes]
     _timestamp: datetime = field(default_factory=_utils.now_utc, init=False)
 
@@ -331,40 +357,91 @@ class GeminiStreamedResponse(StreamedResponse):
                     assert 'function_response' in gemini_part, f'Unexpected part: {gemini_part}'
 
     async def _get_gemini_responses(self) -> AsyncIterator[_GeminiResponse]:
-        # This method exists to ensure we only yield completed items, so we don't need to worry about
-        # partial gemini responses, which would make everything more complicated
+        # Only complete responses are yielded, so we don't need to worry about partial gemini responses, which would
+        # make everything more complicated
+        for r in self._responses:
+            self._usage += _metadata_as_usage(r)
+            yield r
 
-        gemini_responses: list[_GeminiResponse] = []
-        current_gemini_response_index = 0
-        # Right now, there are some circumstances where we will have information that could be yielded sooner than it is
-        # But changing that would make things a lot more complicated.
         async for chunk in self._stream:
-            self._content.extend(chunk)
-
-            gemini_responses = _gemini_streamed_response_ta.validate_json(
-                self._content,
-                experimental_allow_partial='trailing-strings',
-            )
-
-            # The idea: yield only up to the latest response, which might still be partial.
-            # Note that if the latest response is complete, we could yield it immediately, but there's not a good
-            # allow_partial API to determine if the last item in the list is complete.
-            responses_to_yield = gemini_responses[:-1]
-            for r in responses_to_yield[current_gemini_response_index:]:
-                current_gemini_response_index += 1
+            for element in self._framer.feed(chunk):
+                r = _gemini_response_ta.validate_json(element)
                 self._usage += _metadata_as_usage(r)
                 yield r
 
-        # Now yield the final response, which should be complete
-        if gemini_responses:
-            r = gemini_responses[-1]
-            self._usage += _metadata_as_usage(r)
-            yield r
-
     def timestamp(self) -> datetime:
         return self._timestamp
 
 
+_JSON_STRUCTURE_RE = re.compile(rb'["\[\]{}]')
+_JSON_STRING_SPECIAL_RE = re.compile(rb'["\\]')
+
+
+class _JsonArrayFramer:
+    """Splits the bytes of a streamed JSON array into the JSON of each of its elements, as each one is completed.
+
+    Each byte is scanned once, and only the bytes of the element being received are kept, rather than validating the
+    whole of the array received so far each time a chunk arrives. Elements must be objects or arrays.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._element_start: int | None = None
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Add the next chunk of the array, returning the JSON of each element it completes."""
+        buffer = self._buffer
+        buffer.extend(chunk)
+        elements: list[bytes] = []
+        pos = self._pos
+        while True:
+            if self._in_string:
+                match = _JSON_STRING_SPECIAL_RE.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                pos = match.start()
+                if buffer[pos] == ord('"'):
+                    self._in_string = False
+                    pos += 1
+                elif pos + 1 < len(buffer):
+                    # skip the escaped character
+                    pos += 2
+                else:
+                    # the escaped character hasn't been received yet
+                    break
+            else:
+                match = _JSON_STRUCTURE_RE.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                pos = match.start()
+                char = buffer[pos]
+                pos += 1
+                if char == ord('"'):
+                    self._in_string = True
+                elif char == ord('[') or char == ord('{'):
+                    self._depth += 1
+                    if self._depth == 2:
+                        self._element_start = pos - 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 1 and self._element_start is not None:
+                        elements.append(bytes(buffer[self._element_start : pos]))
+                        self._element_start = None
+
+        # release the bytes which have been scanned, except those of an incomplete element
+        consumed = pos if self._element_start is None else self._element_start
+        del buffer[:consumed]
+        self._pos = pos - consumed
+        if self._element_start is not None:
+            self._element_start = 0
+        return elements
+
+
 # We use typed dicts to define the Gemini API response schema
 # once Pydantic partial validation supports, dataclasses, we could revert to using them
 # TypeAdapters take care of validation and serialization
@@ -622,9 +699,6 @@ class _GeminiPromptFeedback(TypedDict):
 _gemini_request_ta = pydantic.TypeAdapter(_GeminiRequest)
 _gemini_response_ta = pydantic.TypeAdapter(_GeminiResponse)
 
-# steam requests return a list of https://ai.google.dev/api/generate-content#method:-models.streamgeneratecontent
-_gemini_streamed_response_ta = pydantic.TypeAdapter(list[_GeminiResponse], config=pydantic.ConfigDict(defer_build=True))
-
 
 class _GeminiJsonSchema:
     """Transforms the JSON Schema from Pydantic to be suitable for Gemini.
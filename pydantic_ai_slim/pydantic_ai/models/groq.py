@@ -26,6 +26,7 @@ from ..messages import (
     UserPromptPart,
 )
 from ..settings import ModelSettings
+from ..timings import measure_message_mapping
 from ..tools import ToolDefinition
 from . import (
     AgentModel,
@@ -79,6 +80,8 @@ class GroqModel(Model):
 
     model_name: GroqModelName
     client: AsyncGroq = field(repr=False)
+    _message_cache: _utils.IdentityCache[ModelMessage, list[chat.ChatCompletionMessageParam]] = field(repr=False)
+    _tool_cache: _utils.IdentitySequenceCache[ToolDefinition, chat.ChatCompletionToolParam] = field(repr=False)
 
     def __init__(
         self,
@@ -109,6 +112,8 @@ class GroqModel(Model):
             self.client = AsyncGroq(api_key=api_key, http_client=http_client)
         else:
             self.client = AsyncGroq(api_key=api_key, http_client=cached_async_http_client())
+        self._message_cache = _utils.IdentityCache()
+        self._tool_cache = _utils.IdentitySequenceCache()
 
     async def agent_model(
         self,
@@ -118,14 +123,17 @@ class GroqModel(Model):
         result_tools: list[ToolDefinition],
     ) -> AgentModel:
         check_allow_model_requests()
-        tools = [self._map_tool_definition(r) for r in function_tools]
-        if result_tools:
-            tools += [self._map_tool_definition(r) for r in result_tools]
+        # tool definitions are usually the same instances at every step, so their mapping is cached,
+        # keyed on the definitions and invalidated if any of their fields are replaced
+        tools = self._tool_cache.get(
+            chain(function_tools, result_tools), self._map_tool_definition, lambda t: vars(t).values()
+        )
         return GroqAgentModel(
             self.client,
             self.model_name,
             allow_text_result,
             tools,
+            self._message_cache,
         )
 
     def name(self) -> str:
@@ -151,6 +159,10 @@ class GroqAgentModel(AgentModel):
     model_name: str
     allow_text_result: bool
     tools: list[chat.ChatCompletionToolParam]
+    message_cache: _utils.IdentityCache[ModelMessage, list[chat.ChatCompletionMessageParam]] = field(
+        default_factory=_utils.IdentityCache, repr=False
+    )
+    """Cache of mapped messages, shared by the agent models of one model so each step only maps new messages."""
 
     async def request(
         self, messages: list[ModelMessage], model_settings: ModelSettings | None
@@ -189,7 +201,7 @@ class GroqAgentModel(AgentModel):
         else:
             tool_choice = 'auto'
 
-        groq_messages = list(chain(*(self._map_message(m) for m in messages)))
+        groq_messages = self._map_messages(messages)
 
         model_settings = model_settings or {}
 
@@ -232,6 +244,15 @@ class GroqAgentModel(AgentModel):
 
         return GroqStreamedResponse(peekable_response, datetime.fromtimestamp(first_chunk.created, tz=timezone.utc))
 
+    def _map_messages(self, messages: list[ModelMessage]) -> list[chat.ChatCompletionMessageParam]:
+        """Map messages, reusing the result for messages which have already been mapped and haven't changed since."""
+        with measure_message_mapping():
+            return [
+                param
+                for m in messages
+                for param in self.message_cache.get(m, lambda m: list(self._map_message(m)), m.parts)
+            ]
+
     @classmethod
     def _map_message(cls, message: ModelMessage) -> Iterable[chat.ChatCompletionMessageParam]:
         """Just maps a `pydantic_ai.Message` to a `groq.types.ChatCompletionMessageParam`."""
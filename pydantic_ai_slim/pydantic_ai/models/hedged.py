@@ -0,0 +1,254 @@
+"""Hedged requests across several models, to reduce tail latency and fall back when a model fails."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Callable, TypeVar
+
+from ..exceptions import AllModelsFailed, UserError
+from ..messages import ModelMessage, ModelResponse
+from ..settings import ModelSettings
+from ..tools import ToolDefinition
+from ..usage import Usage
+from . import AgentModel, KnownModelName, Model, StreamedResponse, infer_model
+from .coalescing import BroadcastStreamedResponse, StreamBroadcast
+
+T = TypeVar('T')
+
+
+@dataclass
+class ModelStats:
+    """Rolling latency and error statistics of a model, over its most recent requests."""
+
+    window: int = 100
+    """Number of recent requests the statistics are calculated from."""
+    latencies: deque[float] = field(init=False)
+    """Latencies in seconds of recent successful requests, until the response was received, or the first event for
+    streams."""
+    lower_bounds: deque[float] = field(init=False)
+    """Time in seconds recent requests had taken when they were cancelled because another model had responded faster.
+
+    Their latency was at least that, so they're included when calculating latency quantiles, but don't count as
+    samples towards the hedge delay.
+    """
+    outcomes: deque[bool] = field(init=False)
+    """Whether each recent request which completed was successful."""
+
+    def __post_init__(self):
+        self.latencies = deque(maxlen=self.window)
+        self.lower_bounds = deque(maxlen=self.window)
+        self.outcomes = deque(maxlen=self.window)
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of recent requests which failed."""
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0
+
+    def latency_quantile(self, quantile: float) -> float | None:
+        """Latency at `quantile` of recent requests, including lower bounds, `None` if there haven't been any."""
+        if not self.latencies and not self.lower_bounds:
+            return None
+        latencies = sorted([*self.latencies, *self.lower_bounds])
+        return latencies[min(math.ceil(quantile * len(latencies)), len(latencies)) - 1]
+
+
+@dataclass(init=False)
+class HedgedModel(Model):
+    """A model which sends requests to several models, using whichever responds first.
+
+    Each request is sent to the model expected to respond fastest, the primary. If it hasn't responded, or for
+    streamed requests sent the first event, within its hedge delay, the request is also sent to the next model,
+    and so on. If a model fails, the request is sent to the next model straight away. The first successful response
+    is used and the other requests are cancelled.
+
+    The hedge delay of a model is its latency at `hedge_quantile` of its recent requests, so only the slowest of its
+    responses lead to a second request. Models are ranked by that latency, divided by their rate of successful
+    requests, so the primary adapts to the current latency and errors of each model. Models which haven't responded
+    yet are ranked first, in the order given, so statistics are gathered for each model.
+    """
+
+    models: list[Model]
+    stats: list[ModelStats]
+    """Statistics of each model, in the same order as `models`."""
+    hedge_quantile: float
+    default_hedge_delay: float
+    min_samples: int
+
+    def __init__(
+        self,
+        *models: Model | KnownModelName,
+        hedge_quantile: float = 0.95,
+        default_hedge_delay: float = 2.0,
+        min_samples: int = 10,
+        window: int = 100,
+    ):
+        """Initialize a `HedgedModel`.
+
+        Args:
+            models: The models to send requests to, in order of preference when their statistics are the same.
+            hedge_quantile: Quantile of a model's latency after which the request is also sent to the next model.
+            default_hedge_delay: Hedge delay in seconds of models with fewer than `min_samples` recent requests.
+            min_samples: Number of recent requests needed to derive the hedge delay of a model from its latency.
+            window: Number of recent requests the statistics of each model are calculated from.
+        """
+        if not models:
+            raise UserError('At least one model is required')
+        self.models = [infer_model(model) for model in models]
+        self.stats = [ModelStats(window) for _ in self.models]
+        self.hedge_quantile = hedge_quantile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_samples = min_samples
+
+    async def agent_model(
+        self,
+        *,
+        function_tools: list[ToolDefinition],
+        allow_text_result: bool,
+        result_tools: list[ToolDefinition],
+    ) -> AgentModel:
+        agent_models = await asyncio.gather(
+            *(
+                model.agent_model(
+                    function_tools=function_tools,
+                    allow_text_result=allow_text_result,
+                    result_tools=result_tools,
+                )
+                for model in self.models
+            )
+        )
+        return HedgedAgentModel(self, list(agent_models))
+
+    def name(self) -> str:
+        return f'hedged:{",".join(model.name() for model in self.models)}'
+
+    def ranked(self) -> list[int]:
+        """Indexes of the models in the order requests are sent to them, the primary first."""
+
+        def expected_latency(stats: ModelStats) -> float:
+            latency = stats.latency_quantile(self.hedge_quantile) or 0
+            success_rate = 1 - stats.error_rate
+            return latency / success_rate if success_rate else math.inf
+
+        return sorted(range(len(self.models)), key=lambda index: expected_latency(self.stats[index]))
+
+    def hedge_delay(self, index: int) -> float:
+        """Time in seconds to wait for the model at `index` to respond before also sending the request to another."""
+        stats = self.stats[index]
+        if len(stats.latencies) < self.min_samples:
+            return self.default_hedge_delay
+        return stats.latency_quantile(self.hedge_quantile) or 0
+
+
+@dataclass
+class HedgedAgentModel(AgentModel):
+    """Implementation of `AgentModel` for [HedgedModel][pydantic_ai.models.hedged.HedgedModel]."""
+
+    hedged_model: HedgedModel
+    agent_models: list[AgentModel]
+
+    async def request(
+        self, messages: list[ModelMessage], model_settings: ModelSettings | None
+    ) -> tuple[ModelResponse, Usage]:
+        return await self._race(lambda index: self.agent_models[index].request(messages, model_settings))
+
+    @asynccontextmanager
+    async def request_stream(
+        self, messages: list[ModelMessage], model_settings: ModelSettings | None
+    ) -> AsyncIterator[StreamedResponse]:
+        async def start_stream(index: int) -> StreamBroadcast:
+            broadcast = StreamBroadcast(self.agent_models[index].request_stream(messages, model_settings))
+            try:
+                await broadcast.wait_started()
+            except BaseException:
+                await _cancel(broadcast.task)
+                raise
+            return broadcast
+
+        broadcast = await self._race(start_stream, lambda broadcast: _cancel(broadcast.task))
+        try:
+            yield BroadcastStreamedResponse(broadcast, broadcast.opened.result())
+        finally:
+            await _cancel(broadcast.task)
+
+    async def _race(
+        self, start: Callable[[int], Awaitable[T]], discard: Callable[[T], Awaitable[None]] | None = None
+    ) -> T:
+        """Start requests to models in ranked order, until one succeeds, and return its result.
+
+        The next request is started when the hedge delay of the last one started has passed, or when a request fails.
+        If several requests succeed at the same time, the result of the best ranked model is returned, and the others
+        are passed to `discard`.
+        """
+        hedged_model = self.hedged_model
+        ranked = hedged_model.ranked()
+        pending: dict[asyncio.Task[T], tuple[int, float]] = {}
+        errors: list[Exception] = []
+        winner_latency: float | None = None
+        losers: list[T] = []
+
+        def start_next() -> float | None:
+            """Start a request to the next model, returns the time to wait before starting another."""
+            index = ranked[len(pending) + len(errors)]
+            pending[asyncio.ensure_future(start(index))] = index, time.monotonic()
+            return hedged_model.hedge_delay(index) if len(pending) + len(errors) < len(ranked) else None
+
+        delay = start_next()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # hedge the request
+                    delay = start_next()
+                    continue
+
+                # record every request which finished, so a failure alongside the winner isn't lost
+                succeeded: list[tuple[int, float, T]] = []
+                for task in done:
+                    index, started_at = pending.pop(task)
+                    stats = hedged_model.stats[index]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        stats.outcomes.append(False)
+                        errors.append(e)
+                    else:
+                        latency = time.monotonic() - started_at
+                        stats.latencies.append(latency)
+                        stats.outcomes.append(True)
+                        succeeded.append((ranked.index(index), latency, result))
+
+                if succeeded:
+                    succeeded.sort(key=lambda s: s[0])
+                    _, winner_latency, result = succeeded[0]
+                    losers.extend(r for _, _, r in succeeded[1:])
+                    return result
+
+                # the request failed, fall back to the next model now rather than after the hedge delay
+                delay = start_next() if len(pending) + len(errors) < len(ranked) else None
+            raise AllModelsFailed(errors)
+        finally:
+            now = time.monotonic()
+            for task, (index, started_at) in pending.items():
+                # a request cancelled after taking longer than the winner was slower than it, but one started later,
+                # or cancelled by the caller, tells us nothing about its latency
+                if winner_latency is not None and now - started_at > winner_latency:
+                    hedged_model.stats[index].lower_bounds.append(now - started_at)
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            if discard is not None:
+                losers.extend(task.result() for task in pending if not task.cancelled() and task.exception() is None)
+                for loser in losers:
+                    await discard(loser)
+
+
+async def _cancel(task: asyncio.Task[None]) -> None:
+    if not task.done():
+        task.cancel()
+        await asyncio.wait([task])
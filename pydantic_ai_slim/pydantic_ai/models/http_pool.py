@@ -0,0 +1,189 @@
+"""HTTP connection pools shared by models, with one pool per host and event loop."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from weakref import WeakKeyDictionary
+
+import httpx
+
+# trace events marking the point a request has been assigned a connection, see
+# https://www.encode.io/httpcore/extensions/#trace
+_CONNECTION_ACQUIRED_EVENTS = (
+    'connect_tcp.started',
+    'connect_unix_socket.started',
+    'send_request_headers.started',
+)
+
+
+@dataclass
+class PoolLimits:
+    """Configuration of the connection pool for a host.
+
+    The defaults are the same as those of HTTPX; to run hundreds of concurrent streams to a provider, increase
+    `max_connections`, or enable `http2` so streams share connections.
+    """
+
+    max_connections: int | None = 100
+    """Maximum number of connections to the host, `None` for no limit. Requests wait for a connection when it's reached."""
+    max_keepalive_connections: int | None = 20
+    """Maximum number of idle connections kept open, `None` for no limit."""
+    keepalive_expiry: float | None = 5.0
+    """Time in seconds after which idle connections are closed, `None` to keep them open."""
+    http2: bool = False
+    """Whether to use HTTP/2 if the host supports it, which requires the `h2` package, e.g. `pip install httpx[http2]`."""
+
+
+@dataclass
+class PoolMetrics:
+    """Metrics of the connection pools for a host, across event loops."""
+
+    pools: int = 0
+    """Number of event loops with a pool for the host."""
+    connections_in_use: int = 0
+    """Number of connections currently handling requests."""
+    connections_idle: int = 0
+    """Number of idle connections kept open."""
+    requests_waiting: int = 0
+    """Number of requests currently waiting for a connection."""
+    requests: int = 0
+    """Number of requests which have been assigned a connection."""
+    total_wait_time: float = 0
+    """Total time in seconds requests waited for a connection."""
+    max_wait_time: float = 0
+    """Longest time in seconds a request waited for a connection."""
+
+    @property
+    def mean_wait_time(self) -> float:
+        """Mean time in seconds requests waited for a connection."""
+        return self.total_wait_time / self.requests if self.requests else 0
+
+
+class HTTPPoolRegistry(httpx.AsyncBaseTransport):
+    """An HTTPX transport which sends requests through a connection pool for each host and event loop.
+
+    Connections can't be shared between event loops, so each loop gets its own pools, which means clients using the
+    registry work with [`Agent.run_sync`][pydantic_ai.Agent.run_sync] from several threads, or repeatedly with
+    `asyncio.run()`.
+
+    Changes to `limits` and `hosts` apply to pools created afterwards.
+    """
+
+    def __init__(self, limits: PoolLimits | None = None, *, hosts: dict[str, PoolLimits] | None = None):
+        """Create a registry.
+
+        Args:
+            limits: Configuration of pools for hosts which aren't in `hosts`.
+            hosts: Configuration of pools for specific hosts, e.g. `{'api.openai.com': PoolLimits(http2=True)}`.
+        """
+        self.limits = limits or PoolLimits()
+        self.hosts = hosts or {}
+        self._lock = threading.Lock()
+        self._pools: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncHTTPTransport]] = (
+            WeakKeyDictionary()
+        )
+        self._metrics: dict[str, PoolMetrics] = {}
+
+    def pool(self, host: str) -> httpx.AsyncHTTPTransport:
+        """Get the pool for `host` in the running event loop, creating it if it doesn't exist yet."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pools = self._pools.setdefault(loop, {})
+            pool = pools.get(host)
+            if pool is None:
+                limits = self.hosts.get(host, self.limits)
+                pool = pools[host] = httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=limits.max_connections,
+                        max_keepalive_connections=limits.max_keepalive_connections,
+                        keepalive_expiry=limits.keepalive_expiry,
+                    ),
+                    http2=limits.http2,
+                )
+            return pool
+
+    def metrics(self, host: str) -> PoolMetrics:
+        """Get a snapshot of the metrics of the pools for `host`."""
+        with self._lock:
+            metrics = PoolMetrics(**self._metrics.get(host, PoolMetrics()).__dict__)
+            for pools in self._pools.values():
+                if (pool := pools.get(host)) is not None:
+                    metrics.pools += 1
+                    for connection in pool._pool.connections:  # pyright: ignore[reportPrivateUsage]
+                        if connection.is_idle():
+                            metrics.connections_idle += 1
+                        elif not connection.is_closed():
+                            metrics.connections_in_use += 1
+            return metrics
+
+    async def prewarm(self, url: str, connections: int = 1, *, timeout: float = 5) -> None:
+        """Open connections to a host ahead of the first requests, in the running event loop.
+
+        Connections are opened by sending concurrent `HEAD` requests to `url`, the responses are ignored.
+
+        Args:
+            url: The URL to send requests to, e.g. the base URL of a provider's API.
+            connections: The number of connections to open, up to the pool's `max_connections`.
+            timeout: Timeout in seconds of each request.
+        """
+        extensions = {'timeout': httpx.Timeout(timeout).as_dict()}
+        # responses are only closed once every request has been sent, so each request gets a connection of its own
+        responses = await asyncio.gather(
+            *(self.handle_async_request(httpx.Request('HEAD', url, extensions=extensions)) for _ in range(connections))
+        )
+        for response in responses:
+            # the response has to be read for its connection to be kept open
+            await response.aread()
+            await response.aclose()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        pool = self.pool(host)
+        with self._lock:
+            metrics = self._metrics.setdefault(host, PoolMetrics())
+            metrics.requests_waiting += 1
+
+        queued_at = time.monotonic()
+        waiting = True
+        user_trace = request.extensions.get('trace')
+
+        def acquired() -> None:
+            nonlocal waiting
+            wait_time = time.monotonic() - queued_at
+            with self._lock:
+                metrics.requests_waiting -= 1
+                metrics.requests += 1
+                metrics.total_wait_time += wait_time
+                metrics.max_wait_time = max(metrics.max_wait_time, wait_time)
+            waiting = False
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            if waiting and event_name.endswith(_CONNECTION_ACQUIRED_EVENTS):
+                acquired()
+            if user_trace is not None:
+                await user_trace(event_name, info)
+
+        request.extensions = {**request.extensions, 'trace': trace}
+        try:
+            return await pool.handle_async_request(request)
+        finally:
+            if waiting:
+                # the request failed or was cancelled before it got a connection
+                with self._lock:
+                    metrics.requests_waiting -= 1
+
+    async def aclose(self) -> None:
+        """Close the pools of the running event loop."""
+        with self._lock:
+            pools = self._pools.pop(asyncio.get_running_loop(), {})
+        for pool in pools.values():
+            await pool.aclose()
+
+
+default_registry = HTTPPoolRegistry()
+"""The registry used by [`cached_async_http_client`][pydantic_ai.models.cached_async_http_client], and so by
+models which aren't given an HTTP client. Configure it before models make their first requests."""
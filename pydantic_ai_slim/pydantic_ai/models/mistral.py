@@ -5,14 +5,12 @@ from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from itertools import chain
-from typing import Any, Callable, Literal, Union
+from typing import Any, Callable, Literal, Union, cast
 
-import pydantic_core
 from httpx import AsyncClient as AsyncHTTPClient, Timeout
 from typing_extensions import assert_never
 
-from .. import UnexpectedModelBehavior, _utils
+from .. import UnexpectedModelBehavior, _partial_json, _utils
 from .._utils import now_utc as _now_utc
 from ..messages import (
     ArgsJson,
@@ -30,6 +28,7 @@ from ..messages import (
 )
 from ..result import Usage
 from ..settings import ModelSettings
+from ..timings import measure_message_mapping
 from ..tools import ToolDefinition
 from . import (
     AgentModel,
@@ -96,6 +95,8 @@ class MistralModel(Model):
 
     model_name: MistralModelName
     client: Mistral = field(repr=False)
+    _message_cache: _utils.IdentityCache[ModelMessage, list[MistralMessages]] = field(repr=False)
+    _tool_cache: _utils.IdentitySequenceCache[ToolDefinition, MistralTool] = field(repr=False)
 
     def __init__(
         self,
@@ -122,6 +123,8 @@ class MistralModel(Model):
         else:
             api_key = os.getenv('MISTRAL_API_KEY') if api_key is None else api_key
             self.client = Mistral(api_key=api_key, async_client=http_client or cached_async_http_client())
+        self._message_cache = _utils.IdentityCache()
+        self._tool_cache = _utils.IdentitySequenceCache()
 
     async def agent_model(
         self,
@@ -138,6 +141,8 @@ class MistralModel(Model):
             allow_text_result,
             function_tools,
             result_tools,
+            message_cache=self._message_cache,
+            tool_cache=self._tool_cache,
         )
 
     def name(self) -> str:
@@ -154,6 +159,20 @@ class MistralAgentModel(AgentModel):
     function_tools: list[ToolDefinition]
     result_tools: list[ToolDefinition]
     json_mode_schema_prompt: str = """Answer in JSON Object, respect the format:\n```\n{schema}\n```\n"""
+    message_cache: _utils.IdentityCache[ModelMessage, list[MistralMessages]] = field(
+        default_factory=_utils.IdentityCache, repr=False
+    )
+    """Cache of mapped messages, shared by the agent models of one model so each step only maps new messages."""
+    tool_cache: _utils.IdentitySequenceCache[ToolDefinition, MistralTool] = field(
+        default_factory=_utils.IdentitySequenceCache, repr=False
+    )
+    """Cache of mapped tool definitions, keyed on the definitions and invalidated if any of their fields are replaced."""
+    _result_tool_checkers: dict[str, Callable[[dict[str, Any]], bool]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._result_tool_checkers = {
+            t.name: _required_fields_checker(t.parameters_json_schema) for t in self.result_tools
+        }
 
     async def request(
         self, messages: list[ModelMessage], model_settings: ModelSettings | None
@@ -169,7 +188,7 @@ class MistralAgentModel(AgentModel):
         """Make a streaming request to the model from Pydantic AI call."""
         response = await self._stream_completions_create(messages, model_settings)
         async with response:
-            yield await self._process_streamed_response(self.result_tools, response)
+            yield await self._process_streamed_response(self._result_tool_checkers, response)
 
     async def _completions_create(
         self, messages: list[ModelMessage], model_settings: ModelSettings | None
@@ -178,7 +197,7 @@ class MistralAgentModel(AgentModel):
         model_settings = model_settings or {}
         response = await self.client.chat.complete_async(
             model=str(self.model_name),
-            messages=list(chain(*(self._map_message(m) for m in messages))),
+            messages=self._map_messages(messages),
             n=1,
             tools=self._map_function_and_result_tools_definition() or UNSET,
             tool_choice=self._get_tool_choice(),
@@ -198,7 +217,7 @@ class MistralAgentModel(AgentModel):
     ) -> MistralEventStreamAsync[MistralCompletionEvent]:
         """Create a streaming completion request to the Mistral model."""
         response: MistralEventStreamAsync[MistralCompletionEvent] | None
-        mistral_messages = list(chain(*(self._map_message(m) for m in messages)))
+        mistral_messages = self._map_messages(messages)
         model_settings = model_settings or {}
 
         if self.result_tools and self.function_tools or self.function_tools:
@@ -259,14 +278,15 @@ class MistralAgentModel(AgentModel):
         Returns None if both function_tools and result_tools are empty.
         """
         all_tools: list[ToolDefinition] = self.function_tools + self.result_tools
-        tools = [
-            MistralTool(
-                function=MistralFunction(name=r.name, parameters=r.parameters_json_schema, description=r.description)
-            )
-            for r in all_tools
-        ]
+        tools = self.tool_cache.get(all_tools, self._map_tool_definition, lambda r: vars(r).values())
         return tools if tools else None
 
+    @staticmethod
+    def _map_tool_definition(r: ToolDefinition) -> MistralTool:
+        return MistralTool(
+            function=MistralFunction(name=r.name, parameters=r.parameters_json_schema, description=r.description)
+        )
+
     @staticmethod
     def _process_response(response: MistralChatCompletionResponse) -> ModelResponse:
         """Process a non-streamed response, and prepare a message to return."""
@@ -294,7 +314,7 @@ class MistralAgentModel(AgentModel):
 
     @staticmethod
     async def _process_streamed_response(
-        result_tools: list[ToolDefinition],
+        result_tool_checkers: dict[str, Callable[[dict[str, Any]], bool]],
         response: MistralEventStreamAsync[MistralCompletionEvent],
     ) -> StreamedResponse:
         """Process a streamed response, and prepare a streaming response to return."""
@@ -308,7 +328,7 @@ class MistralAgentModel(AgentModel):
         else:
             timestamp = datetime.now(tz=timezone.utc)
 
-        return MistralStreamedResponse(peekable_response, timestamp, {c.name: c for c in result_tools})
+        return MistralStreamedResponse(peekable_response, timestamp, result_tool_checkers)
 
     @staticmethod
     def _map_to_mistral_tool_call(t: ToolCallPart) -> MistralToolCall:
@@ -421,6 +441,15 @@ class MistralAgentModel(AgentModel):
             else:
                 assert_never(part)
 
+    def _map_messages(self, messages: list[ModelMessage]) -> list[MistralMessages]:
+        """Map messages, reusing the result for messages which have already been mapped and haven't changed since."""
+        with measure_message_mapping():
+            return [
+                mistral_message
+                for m in messages
+                for mistral_message in self.message_cache.get(m, lambda m: list(self._map_message(m)), m.parts)
+            ]
+
     @classmethod
     def _map_message(cls, message: ModelMessage) -> Iterable[MistralMessages]:
         """Just maps a `pydantic_ai.Message` to a `MistralMessage`."""
@@ -451,9 +480,13 @@ class MistralStreamedResponse(StreamedResponse):
 
     _response: AsyncIterable[MistralCompletionEvent]
     _timestamp: datetime
-    _result_tools: dict[str, ToolDefinition]
+    _result_tool_checkers: dict[str, Callable[[dict[str, Any]], bool]]
+    """Functions checking the required fields of each result tool are present, keyed by the name of the tool."""
 
-    _delta_content: str = field(default='', init=False)
+    _json_parser: _partial_json.PartialJsonParser = field(default_factory=_partial_json.PartialJsonParser, init=False)
+    _delta_content: list[str] = field(default_factory=list, init=False)
+    _result_tool_name: str | None = field(default=None, init=False)
+    _empty_result_tool_name: str | None = field(default=None, init=False)
 
     async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
         chunk: MistralCompletionEvent
@@ -470,15 +503,18 @@ class MistralStreamedResponse(StreamedResponse):
             text = _map_content(content)
             if text:
                 # Attempt to produce a result tool call from the received text
-                if self._result_tools:
-                    self._delta_content += text
-                    maybe_tool_call_part = self._try_get_result_tool_from_text(self._delta_content, self._result_tools)
-                    if maybe_tool_call_part:
+                if self._result_tool_checkers:
+                    if self._result_tool_name is not None:
+                        # the result tool is known, so the text is just more of its arguments
+                        maybe_event = self._parts_manager.handle_tool_call_delta(
+                            vendor_part_id='result', tool_name=None, args=text, tool_call_id=None
+                        )
+                        if maybe_event is not None:
+                            yield maybe_event
+                    elif tool_name := self._try_get_result_tool_name(text):
+                        self._result_tool_name = tool_name
                         yield self._parts_manager.handle_tool_call_part(
-                            vendor_part_id='result',
-                            tool_name=maybe_tool_call_part.tool_name,
-                            args=maybe_tool_call_part.args_as_dict(),
-                            tool_call_id=maybe_tool_call_part.tool_call_id,
+                            vendor_part_id='result', tool_name=tool_name, args=''.join(self._delta_content)
                         )
                 else:
                     yield self._parts_manager.handle_text_delta(vendor_part_id='content', content=text)
@@ -490,54 +526,85 @@ class MistralStreamedResponse(StreamedResponse):
                     vendor_part_id=index, tool_name=dtc.function.name, args=dtc.function.arguments, tool_call_id=dtc.id
                 )
 
+        if self._result_tool_name is None and self._empty_result_tool_name is not None:
+            # the result's arguments never had any content, e.g. they're all defaults
+            yield self._parts_manager.handle_tool_call_part(
+                vendor_part_id='result', tool_name=self._empty_result_tool_name, args=''.join(self._delta_content)
+            )
+
     def timestamp(self) -> datetime:
         return self._timestamp
 
-    @staticmethod
-    def _try_get_result_tool_from_text(text: str, result_tools: dict[str, ToolDefinition]) -> ToolCallPart | None:
-        output_json: dict[str, Any] | None = pydantic_core.from_json(text, allow_partial='trailing-strings')
-        if output_json:
-            for result_tool in result_tools.values():
+    def _try_get_result_tool_name(self, text: str) -> str | None:
+        """Parse the next chunk of text, returning the first result tool whose required fields have all been received.
+
+        The tool is only returned once its arguments have some content, like the arguments of tool calls streamed
+        with a dict, which aren't yielded by `StreamedRunResult.stream` while all their values are empty.
+
+        The returned tool is used for the rest of the response, even if a tool listed before it matches once more of
+        the arguments are received: the agent uses the result tool of the first matching part, and validates the
+        result streamed with that tool's name, so a call renamed later couldn't be found.
+        """
+        self._delta_content.append(text)
+        self._json_parser.feed(text)
+        output_json = self._json_parser.partial_value()
+        self._empty_result_tool_name = None
+        if output_json and isinstance(output_json, dict):
+            output_json = cast(dict[str, Any], output_json)
+            for tool_name, check_required_fields in self._result_tool_checkers.items():
                 # NOTE: Additional verification to prevent JSON validation to crash in `_result.py`
                 # Ensures required parameters in the JSON schema are respected, especially for stream-based return types.
                 # Example with BaseModel and required fields.
-                if not MistralStreamedResponse._validate_required_json_schema(
-                    output_json, result_tool.parameters_json_schema
-                ):
-                    continue
+                if check_required_fields(output_json):
+                    if any(output_json.values()):
+                        return tool_name
+                    self._empty_result_tool_name = tool_name
+                    return None
 
-                # The following part_id will be thrown away
-                return ToolCallPart.from_raw_args(tool_name=result_tool.name, args=output_json)
 
-    @staticmethod
-    def _validate_required_json_schema(json_dict: dict[str, Any], json_schema: dict[str, Any]) -> bool:
-        """Validate that all required parameters in the JSON schema are present in the JSON dictionary."""
-        required_params = json_schema.get('required', [])
-        properties = json_schema.get('properties', {})
-
-        for param in required_params:
-            if param not in json_dict:
-                return False
-
-            param_schema = properties.get(param, {})
-            param_type = param_schema.get('type')
-            param_items_type = param_schema.get('items', {}).get('type')
-
-            if param_type == 'array' and param_items_type:
-                if not isinstance(json_dict[param], list):
-                    return False
-                for item in json_dict[param]:
-                    if not isinstance(item, VALID_JSON_TYPE_MAPPING[param_items_type]):
-                        return False
-            elif param_type and not isinstance(json_dict[param], VALID_JSON_TYPE_MAPPING[param_type]):
-                return False
-
-            if isinstance(json_dict[param], dict) and 'properties' in param_schema:
-                nested_schema = param_schema
-                if not MistralStreamedResponse._validate_required_json_schema(json_dict[param], nested_schema):
-                    return False
-
-        return True
+def _required_fields_checker(json_schema: dict[str, Any]) -> Callable[[dict[str, Any]], bool]:
+    """Build a function checking all required parameters in the JSON schema are present in a JSON dictionary.
+
+    Parameters whose schema has a `type` must have a value of that type, and the required parameters of nested objects
+    are checked too.
+    """
+    properties = json_schema.get('properties', {})
+    param_checkers = [(param, _param_checker(properties.get(param, {}))) for param in json_schema.get('required', [])]
+
+    def check_required_fields(json_dict: dict[str, Any]) -> bool:
+        return all(param in json_dict and check_param(json_dict[param]) for param, check_param in param_checkers)
+
+    return check_required_fields
+
+
+def _param_checker(param_schema: dict[str, Any]) -> Callable[[Any], bool]:
+    param_type = param_schema.get('type')
+    param_items_type = param_schema.get('items', {}).get('type')
+    check_nested = _required_fields_checker(param_schema) if 'properties' in param_schema else None
+
+    if param_type == 'array' and param_items_type:
+        items_type = VALID_JSON_TYPE_MAPPING[param_items_type]
+
+        def check_type(value: Any) -> bool:
+            return isinstance(value, list) and all(isinstance(item, items_type) for item in cast(list[Any], value))
+
+    elif param_type:
+        expected_type = VALID_JSON_TYPE_MAPPING[param_type]
+
+        def check_type(value: Any) -> bool:
+            return isinstance(value, expected_type)
+
+    else:
+
+        def check_type(value: Any) -> bool:
+            return True
+
+    def check_param(value: Any) -> bool:
+        if not check_type(value):
+            return False
+        return check_nested is None or not isinstance(value, dict) or check_nested(cast(dict[str, Any], value))
+
+    return check_param
 
 
 VALID_JSON_TYPE_MAPPING: dict[str, Any] = {
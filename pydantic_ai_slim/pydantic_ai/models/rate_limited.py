@@ -0,0 +1,375 @@
+"""Client-side rate limiting and scheduling of model requests, so bursts of requests don't exceed provider limits."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Literal
+from weakref import WeakKeyDictionary
+
+from ..messages import ModelMessage, ModelMessagesTypeAdapter, ModelResponse
+from ..settings import ModelSettings
+from ..tools import ToolDefinition
+from ..usage import Usage
+from . import AgentModel, KnownModelName, Model, StreamedResponse, infer_model
+
+SchedulingPriority = Literal['interactive', 'batch']
+"""Priority class of a request, queued `'interactive'` requests are always sent before queued `'batch'` requests."""
+
+_PRIORITIES: tuple[SchedulingPriority, ...] = ('interactive', 'batch')
+
+
+@dataclass
+class RateLimit:
+    """Limits on the rate of requests to a model."""
+
+    requests_per_minute: float | None = None
+    """Maximum number of requests per minute, `None` for no limit."""
+    tokens_per_minute: float | None = None
+    """Maximum number of tokens per minute, `None` for no limit.
+
+    Tokens are estimated before a request is sent, then the estimate is corrected with the usage of the response.
+    """
+    burst_seconds: float = 60
+    """Number of seconds of requests and tokens which can be sent at once, after no requests were sent for a while."""
+
+
+@dataclass
+class SchedulerMetrics:
+    """Metrics of the requests scheduled for a model."""
+
+    queue_depth: int = 0
+    """Number of requests currently waiting to be sent."""
+    requests: int = 0
+    """Number of requests sent."""
+    total_wait_time: float = 0
+    """Total time in seconds requests waited before being sent."""
+    max_wait_time: float = 0
+    """Longest time in seconds a request waited before being sent."""
+    estimated_tokens: int = 0
+    """Total tokens estimated for requests before they were sent."""
+    tokens: int = 0
+    """Total tokens used by requests, according to the usage of their responses."""
+
+    @property
+    def mean_wait_time(self) -> float:
+        """Mean time in seconds requests waited before being sent."""
+        return self.total_wait_time / self.requests if self.requests else 0
+
+
+class RequestScheduler:
+    """Schedules requests so they don't exceed the rate limits of each model.
+
+    Limits apply separately to each model, identified by its [`name`][pydantic_ai.models.Model.name], and are shared
+    by all requests using the scheduler, across threads and event loops.
+
+    When requests have to wait, `'interactive'` requests are sent before `'batch'` requests, and requests with the
+    same priority are sent in turn for each tenant, so one tenant making many requests doesn't hold up the others.
+    """
+
+    def __init__(self, default_limit: RateLimit | None = None, *, limits: dict[str, RateLimit] | None = None):
+        """Create a scheduler.
+
+        Args:
+            default_limit: Limits for models which aren't in `limits`, `None` for no limit.
+            limits: Limits for specific models, keyed by model name.
+        """
+        self.default_limit = default_limit
+        self.limits = limits or {}
+        self._lock = threading.Lock()
+        self._limiters: dict[str, _Limiter] = {}
+        # queued requests are waiting in an event loop, so each loop has its own queues
+        self._queues: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _Queue]] = WeakKeyDictionary()
+
+    def metrics(self, model_name: str) -> SchedulerMetrics:
+        """Get a snapshot of the metrics of requests to a model."""
+        with self._lock:
+            return SchedulerMetrics(**self._get_limiter(model_name).metrics.__dict__)
+
+    async def acquire(
+        self,
+        model_name: str,
+        estimated_tokens: int = 0,
+        *,
+        priority: SchedulingPriority = 'interactive',
+        tenant: Hashable = None,
+    ) -> None:
+        """Wait until a request to a model can be sent without exceeding its limits.
+
+        Args:
+            model_name: The name of the model the request is sent to.
+            estimated_tokens: The number of tokens the request is expected to use.
+            priority: The priority class of the request.
+            tenant: Identifies who the request is made for, to share requests fairly between tenants.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            limiter = self._get_limiter(model_name)
+            limiter.metrics.queue_depth += 1
+        queue = self._queues.setdefault(loop, {}).setdefault(model_name, _Queue())
+        waiter = _Waiter(estimated_tokens, time.monotonic(), loop.create_future())
+        queue.push(waiter, priority, tenant)
+        self._dispatch(queue, limiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if queue.remove(waiter, priority, tenant):
+                with self._lock:
+                    limiter.metrics.queue_depth -= 1
+                # the next request may be able to go now
+                self._dispatch(queue, limiter)
+            raise
+
+    def reconcile(self, model_name: str, estimated_tokens: int, usage: Usage) -> None:
+        """Correct the tokens estimated for a request with the usage of its response.
+
+        Args:
+            model_name: The name of the model the request was sent to.
+            estimated_tokens: The number of tokens the request was expected to use when it was acquired.
+            usage: The usage of the response.
+        """
+        tokens = usage.total_tokens
+        if tokens is None:
+            tokens = (usage.request_tokens or 0) + (usage.response_tokens or 0)
+        with self._lock:
+            limiter = self._get_limiter(model_name)
+            limiter.metrics.tokens += tokens
+            if limiter.tokens is not None:
+                limiter.tokens.available -= tokens - estimated_tokens
+
+    def _get_limiter(self, model_name: str) -> _Limiter:
+        limiter = self._limiters.get(model_name)
+        if limiter is None:
+            limit = self.limits.get(model_name, self.default_limit) or RateLimit()
+            limiter = self._limiters[model_name] = _Limiter(
+                requests=_TokenBucket.create(limit.requests_per_minute, limit.burst_seconds),
+                tokens=_TokenBucket.create(limit.tokens_per_minute, limit.burst_seconds),
+            )
+        return limiter
+
+    def _dispatch(self, queue: _Queue, limiter: _Limiter) -> None:
+        """Let queued requests go, in order, until the limits are reached."""
+        if queue.timer is not None:
+            queue.timer.cancel()
+            queue.timer = None
+        while (waiter := queue.peek()) is not None:
+            if waiter.future.cancelled():
+                # the request was cancelled, but hasn't removed itself from the queue yet
+                queue.pop()
+                with self._lock:
+                    limiter.metrics.queue_depth -= 1
+                continue
+            now = time.monotonic()
+            with self._lock:
+                delay = limiter.wait_time(waiter.tokens, now)
+                if delay == 0:
+                    limiter.consume(waiter.tokens)
+                    wait_time = now - waiter.queued_at
+                    metrics = limiter.metrics
+                    metrics.queue_depth -= 1
+                    metrics.requests += 1
+                    metrics.estimated_tokens += waiter.tokens
+                    metrics.total_wait_time += wait_time
+                    metrics.max_wait_time = max(metrics.max_wait_time, wait_time)
+            if delay:
+                queue.timer = waiter.future.get_loop().call_later(delay, self._dispatch, queue, limiter)
+                break
+            queue.pop()
+            waiter.future.set_result(None)
+
+
+@dataclass(init=False)
+class RateLimitedModel(Model):
+    """A model whose requests are scheduled by a [`RequestScheduler`][pydantic_ai.models.rate_limited.RequestScheduler].
+
+    Models sharing a scheduler share its limits, so to send requests with different priorities or for different
+    tenants, create a `RateLimitedModel` for each of them with the same scheduler.
+    """
+
+    model: Model
+    scheduler: RequestScheduler
+    priority: SchedulingPriority
+    tenant: Hashable
+
+    def __init__(
+        self,
+        model: Model | KnownModelName,
+        scheduler: RequestScheduler,
+        *,
+        priority: SchedulingPriority = 'interactive',
+        tenant: Hashable = None,
+    ):
+        """Initialize a `RateLimitedModel`.
+
+        Args:
+            model: The model to send requests to.
+            scheduler: The scheduler deciding when requests are sent.
+            priority: The priority class of requests.
+            tenant: Identifies who requests are made for, to share requests fairly between tenants.
+        """
+        self.model = infer_model(model)
+        self.scheduler = scheduler
+        self.priority = priority
+        self.tenant = tenant
+
+    async def agent_model(
+        self,
+        *,
+        function_tools: list[ToolDefinition],
+        allow_text_result: bool,
+        result_tools: list[ToolDefinition],
+    ) -> AgentModel:
+        agent_model = await self.model.agent_model(
+            function_tools=function_tools,
+            allow_text_result=allow_text_result,
+            result_tools=result_tools,
+        )
+        return RateLimitedAgentModel(agent_model, self, [*function_tools, *result_tools])
+
+    def name(self) -> str:
+        return self.model.name()
+
+
+@dataclass
+class RateLimitedAgentModel(AgentModel):
+    """Implementation of `AgentModel` for [RateLimitedModel][pydantic_ai.models.rate_limited.RateLimitedModel]."""
+
+    agent_model: AgentModel
+    model: RateLimitedModel
+    tools: list[ToolDefinition]
+
+    async def request(
+        self, messages: list[ModelMessage], model_settings: ModelSettings | None
+    ) -> tuple[ModelResponse, Usage]:
+        estimated_tokens = await self._acquire(messages, model_settings)
+        response, usage = await self.agent_model.request(messages, model_settings)
+        self.model.scheduler.reconcile(self.model.name(), estimated_tokens, usage)
+        return response, usage
+
+    @asynccontextmanager
+    async def request_stream(
+        self, messages: list[ModelMessage], model_settings: ModelSettings | None
+    ) -> AsyncIterator[StreamedResponse]:
+        estimated_tokens = await self._acquire(messages, model_settings)
+        async with self.agent_model.request_stream(messages, model_settings) as response:
+            try:
+                yield response
+            finally:
+                # the usage so far if the stream wasn't received in full
+                self.model.scheduler.reconcile(self.model.name(), estimated_tokens, response.usage())
+
+    async def _acquire(self, messages: list[ModelMessage], model_settings: ModelSettings | None) -> int:
+        estimated_tokens = estimate_tokens(messages, self.tools, model_settings)
+        model = self.model
+        await model.scheduler.acquire(model.name(), estimated_tokens, priority=model.priority, tenant=model.tenant)
+        return estimated_tokens
+
+
+def estimate_tokens(
+    messages: list[ModelMessage], tools: list[ToolDefinition], model_settings: ModelSettings | None
+) -> int:
+    """Roughly estimate the number of tokens a request will use, before it's sent.
+
+    The estimate is based on the length of the messages and tool definitions, at about four characters per token,
+    plus `max_tokens` from the model settings if it's set, since the response is limited to that many tokens.
+    """
+    length = len(ModelMessagesTypeAdapter.dump_json(messages))
+    length += sum(len(tool.name) + len(tool.description) + len(str(tool.parameters_json_schema)) for tool in tools)
+    return length // 4 + (model_settings or {}).get('max_tokens', 0)
+
+
+@dataclass
+class _TokenBucket:
+    per_second: float
+    capacity: float
+    available: float
+    updated_at: float
+
+    @classmethod
+    def create(cls, per_minute: float | None, burst_seconds: float) -> _TokenBucket | None:
+        if per_minute is None:
+            return None
+        capacity = per_minute * burst_seconds / 60
+        return cls(per_minute / 60, capacity, capacity, time.monotonic())
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Time in seconds until `amount` is available."""
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.per_second)
+        self.updated_at = now
+        # a request larger than the bucket can only wait for it to be full
+        amount = min(amount, self.capacity)
+        return max(amount - self.available, 0) / self.per_second
+
+
+@dataclass
+class _Limiter:
+    requests: _TokenBucket | None
+    tokens: _TokenBucket | None
+    metrics: SchedulerMetrics = field(default_factory=SchedulerMetrics)
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        requests_wait = self.requests.wait_time(1, now) if self.requests is not None else 0
+        tokens_wait = self.tokens.wait_time(tokens, now) if self.tokens is not None else 0
+        return max(requests_wait, tokens_wait)
+
+    def consume(self, tokens: int) -> None:
+        if self.requests is not None:
+            self.requests.available -= 1
+        if self.tokens is not None:
+            self.tokens.available -= tokens
+
+
+@dataclass
+class _Waiter:
+    tokens: int
+    queued_at: float
+    future: asyncio.Future[None]
+
+
+@dataclass
+class _Queue:
+    """Queued requests, by priority then tenant, tenants are served in turn."""
+
+    waiters: dict[SchedulingPriority, OrderedDict[Hashable, deque[_Waiter]]] = field(
+        default_factory=lambda: {priority: OrderedDict() for priority in _PRIORITIES}
+    )
+    timer: asyncio.TimerHandle | None = None
+
+    def push(self, waiter: _Waiter, priority: SchedulingPriority, tenant: Hashable) -> None:
+        tenants = self.waiters[priority]
+        if tenant not in tenants:
+            tenants[tenant] = deque()
+        tenants[tenant].append(waiter)
+
+    def peek(self) -> _Waiter | None:
+        for tenants in self.waiters.values():
+            if tenants:
+                return next(iter(tenants.values()))[0]
+        return None
+
+    def pop(self) -> None:
+        """Remove the next waiter, the tenant it was for goes to the back of the line."""
+        for tenants in self.waiters.values():
+            if tenants:
+                tenant, waiters = next(iter(tenants.items()))
+                waiters.popleft()
+                if waiters:
+                    tenants.move_to_end(tenant)
+                else:
+                    del tenants[tenant]
+                return
+
+    def remove(self, waiter: _Waiter, priority: SchedulingPriority, tenant: Hashable) -> bool:
+        """Remove a waiter which is no longer waiting, returns whether it was queued."""
+        waiters = self.waiters[priority].get(tenant)
+        if waiters is None or waiter not in waiters:
+            return False
+        waiters.remove(waiter)
+        if not waiters:
+            del self.waiters[priority][tenant]
+        return True
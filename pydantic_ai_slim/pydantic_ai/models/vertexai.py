@@ -3,12 +3,13 @@ from __future__ import annotations as _annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from httpx import AsyncClient as AsyncHTTPClient
 
-from .._utils import run_in_executor
+from .._utils import IdentityCache, IdentitySequenceCache, run_in_executor
 from ..exceptions import UserError
+from ..messages import ModelMessage
 from ..tools import ToolDefinition
 from . import Model, cached_async_http_client, check_allow_model_requests
 from .gemini import GeminiAgentModel, GeminiModelName
@@ -65,6 +66,8 @@ class VertexAIModel(Model):
 
     auth: BearerTokenAuth | None
     url: str | None
+    _message_cache: IdentityCache[ModelMessage, Any] = field(repr=False)
+    _tool_cache: IdentitySequenceCache[ToolDefinition, Any] = field(repr=False)
 
     # TODO __init__ can be removed once we drop 3.9 and we can set kw_only correctly on the dataclass
     def __init__(
@@ -106,6 +109,8 @@ class VertexAIModel(Model):
 
         self.auth = None
         self.url = None
+        self._message_cache = IdentityCache()
+        self._tool_cache = IdentitySequenceCache()
 
     async def agent_model(
         self,
@@ -124,6 +129,8 @@ class VertexAIModel(Model):
             function_tools=function_tools,
             allow_text_result=allow_text_result,
             result_tools=result_tools,
+            message_cache=self._message_cache,
+            tool_cache=self._tool_cache,
         )
 
     async def ainit(self) -> tuple[str, BearerTokenAuth]:
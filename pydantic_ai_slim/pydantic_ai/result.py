@@ -5,15 +5,19 @@ from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
 from copy import deepcopy
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Generic, Union, cast
+from time import perf_counter
+from typing import TYPE_CHECKING, Generic, Union, cast
 
-import logfire_api
 from typing_extensions import TypeVar
 
-from . import _result, _utils, exceptions, messages as _messages, models
+from . import _utils, exceptions, messages as _messages, models
+from .timings import RunTimings
 from .tools import AgentDeps, RunContext
 from .usage import Usage, UsageLimits
 
+if TYPE_CHECKING:
+    from . import _result
+
 __all__ = 'ResultData', 'ResultValidatorFunc', 'RunResult', 'StreamedRunResult'
 
 
@@ -35,8 +39,6 @@ A function that always takes `ResultData` and returns `ResultData` and:
 Usage `ResultValidatorFunc[AgentDeps, ResultData]`.
 """
 
-_logfire = logfire_api.Logfire(otel_scope='pydantic-ai')
-
 
 @dataclass
 class _BaseRunResult(ABC, Generic[ResultData]):
@@ -126,11 +128,16 @@ class RunResult(_BaseRunResult[ResultData]):
     """Data from the final response in the run."""
     _result_tool_name: str | None
     _usage: Usage
+    _timings: RunTimings = field(default_factory=RunTimings, compare=False, repr=False)
 
     def usage(self) -> Usage:
         """Return the usage of the whole run."""
         return self._usage
 
+    def timings(self) -> RunTimings:
+        """Return the breakdown of where the time of the run was spent."""
+        return self._timings
+
     def all_messages(self, *, result_tool_return_content: str | None = None) -> list[_messages.ModelMessage]:
         """Return the history of _messages.
 
@@ -175,6 +182,9 @@ class StreamedRunResult(_BaseRunResult[ResultData], Generic[AgentDeps, ResultDat
     _result_validators: list[_result.ResultValidator[AgentDeps, ResultData]]
     _result_tool_name: str | None
     _on_complete: Callable[[], Awaitable[None]]
+    _partial_validators: dict[str, _result.PartialResultValidator[ResultData]] = field(
+        default_factory=dict, init=False, repr=False
+    )
     is_complete: bool = field(default=False, init=False)
     """Whether the stream has all been received.
 
@@ -190,7 +200,10 @@ class StreamedRunResult(_BaseRunResult[ResultData], Generic[AgentDeps, ResultDat
 
         The pydantic validator for structured data will be called in
         [partial mode](https://docs.pydantic.dev/dev/concepts/experimental/#partial-validation)
-        on each iteration.
+        on each iteration. If the result is a list, only the items received since the previous iteration are
+        validated.
+
+        Result validators registered with `partial=False` are only called on the final result.
 
         Args:
             debounce_by: by how much (if at all) to debounce/group the response chunks by. `None` means no debouncing.
@@ -210,6 +223,9 @@ class StreamedRunResult(_BaseRunResult[ResultData], Generic[AgentDeps, ResultDat
         !!! note
             Result validators will NOT be called on the text result if `delta=True`.
 
+        Result validators registered with `partial=False` are only called on the final text once the stream has
+        finished, so if they change it, the validated final text is yielded once more.
+
         Args:
             delta: if `True`, yield each chunk of text as it is received, if `False` (default), yield the full text
                 up to the current point.
@@ -253,7 +269,7 @@ class StreamedRunResult(_BaseRunResult[ResultData], Generic[AgentDeps, ResultDat
                 async for items in group_iter:
                     yield ''.join([content for content, _ in items])
 
-        with _logfire.span('response stream text') as lf_span:
+        with _utils.get_logfire().span('response stream text') as lf_span:
             if delta:
                 async for text in _stream_text_deltas():
                     yield text
@@ -265,9 +281,16 @@ class StreamedRunResult(_BaseRunResult[ResultData], Generic[AgentDeps, ResultDat
                 async for text in _stream_text_deltas():
                     deltas.append(text)
                     combined_text = ''.join(deltas)
-                    combined_validated_text = await self._validate_text_result(combined_text)
+                    combined_validated_text = await self._validate_text_result(combined_text, partial=True)
                     yield combined_validated_text
 
+                if any(not validator.partial for validator in self._result_validators):
+                    # validators which are only called on the final result may change it
+                    final_text = await self._validate_text_result(''.join(deltas), partial=False)
+                    if final_text != combined_validated_text:
+                        combined_validated_text = final_text
+                        yield combined_validated_text
+
                 lf_span.set_attribute('combined_text', combined_validated_text)
                 await self._marked_completed(_messages.ModelResponse.from_text(combined_validated_text))
 
@@ -288,7 +311,7 @@ class StreamedRunResult(_BaseRunResult[ResultData], Generic[AgentDeps, ResultDat
             self._stream_response, self._usage_limits, self.usage
         )
 
-        with _logfire.span('response stream structured') as lf_span:
+        with _utils.get_logfire().span('response stream structured') as lf_span:
             # if the message currently has any parts with content, yield before streaming
             msg = self._stream_response.get()
             for part in msg.parts:
@@ -326,6 +349,14 @@ class StreamedRunResult(_BaseRunResult[ResultData], Generic[AgentDeps, ResultDat
         """
         return self._run_ctx.usage + self._stream_response.usage()
 
+    def timings(self) -> RunTimings:
+        """Return the breakdown of where the time of the run has been spent.
+
+        !!! note
+            The timings of the last step, and the total, aren't complete until the stream is finished.
+        """
+        return self._run_ctx.timings
+
     def timestamp(self) -> datetime:
         """Get the timestamp of the response."""
         return self._stream_response.timestamp()
@@ -333,7 +364,12 @@ class StreamedRunResult(_BaseRunResult[ResultData], Generic[AgentDeps, ResultDat
     async def validate_structured_result(
         self, message: _messages.ModelResponse, *, allow_partial: bool = False
     ) -> ResultData:
-        """Validate a structured result message."""
+        """Validate a structured result message.
+
+        If `allow_partial` is `True`, the message is assumed to be part of the stream of this result, so results
+        which are lists are validated incrementally, and result validators registered with `partial=False` aren't
+        called.
+        """
         if self._result_schema is not None and self._result_tool_name is not None:
             match = self._result_schema.find_named_tool(message.parts, self._result_tool_name)
             if match is None:
@@ -342,33 +378,46 @@ class StreamedRunResult(_BaseRunResult[ResultData], Generic[AgentDeps, ResultDat
                 )
 
             call, result_tool = match
-            result_data = result_tool.validate(call, allow_partial=allow_partial, wrap_validation_errors=False)
-
-            for validator in self._result_validators:
-                result_data = await validator.validate(result_data, call, self._run_ctx)
-            return result_data
+            step_timings = self._run_ctx.timings.steps[-1]
+            started_at = perf_counter()
+            try:
+                if allow_partial:
+                    partial_validator = self._partial_validators.get(call.tool_name)
+                    if partial_validator is None:
+                        partial_validator = self._partial_validators[call.tool_name] = result_tool.partial_validator()
+                    result_data = partial_validator.validate(call)
+                else:
+                    result_data = result_tool.validate(call, wrap_validation_errors=False)
+            finally:
+                step_timings.result_validation += perf_counter() - started_at
+
+            return await self._run_validators(result_data, call, partial=allow_partial)
         else:
             text = '\n\n'.join(x.content for x in message.parts if isinstance(x, _messages.TextPart))
-            for validator in self._result_validators:
-                text = await validator.validate(
-                    text,  # pyright: ignore[reportArgumentType]
-                    None,
-                    self._run_ctx,
-                )
             # Since there is no result tool, we can assume that str is compatible with ResultData
-            return cast(ResultData, text)
+            return await self._run_validators(cast(ResultData, text), None, partial=allow_partial)
+
+    async def _validate_text_result(self, text: str, *, partial: bool) -> str:
+        return await self._run_validators(text, None, partial=partial)  # pyright: ignore[reportArgumentType,reportReturnType]
 
-    async def _validate_text_result(self, text: str) -> str:
-        for validator in self._result_validators:
-            text = await validator.validate(  # pyright: ignore[reportAssignmentType]
-                text,  # pyright: ignore[reportArgumentType]
-                None,
-                self._run_ctx,
-            )
-        return text
+    async def _run_validators(
+        self, result_data: ResultData, tool_call: _messages.ToolCallPart | None, *, partial: bool
+    ) -> ResultData:
+        if not self._result_validators:
+            return result_data
+        started_at = perf_counter()
+        try:
+            for validator in self._result_validators:
+                if partial and not validator.partial:
+                    continue
+                result_data = await validator.validate(result_data, tool_call, self._run_ctx)
+        finally:
+            self._run_ctx.timings.steps[-1].result_validators += perf_counter() - started_at
+        return result_data
 
     async def _marked_completed(self, message: _messages.ModelResponse) -> None:
         self.is_complete = True
+        self._run_ctx.timings.steps[-1].stream_finished()
         self._all_messages.append(message)
         await self._on_complete()
 
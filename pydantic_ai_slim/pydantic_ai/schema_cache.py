@@ -0,0 +1,181 @@
+"""On-disk cache of the JSON schemas of tools and result types, to reduce the start up time of new processes.
+
+Building the JSON schema of a tool means generating a pydantic core schema for its function and parsing its
+docstring, which adds up for agents with many tools, and is repeated by every new process. With a schema cache
+configured, the [`ToolDefinition`][pydantic_ai.tools.ToolDefinition]s of tools and result types are loaded from disk
+instead, while their validators are only built when they're first needed.
+
+Enable the cache with [`set_schema_cache`][pydantic_ai.schema_cache.set_schema_cache], or by setting the
+`PYDANTIC_AI_SCHEMA_CACHE_DIR` environment variable to the directory to use.
+
+Schemas are keyed on the qualified name of the function or type, the source of the module defining it, and the
+versions of pydantic and PydanticAI. Types defined in other modules which a function or type uses aren't part of the
+key, so if they change, the cache must be cleared, e.g. by using a new directory for each build of an application.
+Classes defined in functions or created dynamically aren't cached, since they can't be identified by their name.
+"""
+
+from __future__ import annotations as _annotations
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, cast, get_args
+
+__all__ = 'SchemaCache', 'set_schema_cache', 'get_schema_cache'
+
+ENV_VAR = 'PYDANTIC_AI_SCHEMA_CACHE_DIR'
+
+
+class SchemaCache:
+    """Cache of JSON schemas in a directory, each entry is stored in its own JSON file.
+
+    Entries which can't be read are treated as missing, and errors writing entries are ignored, so a cache in a
+    read-only or full directory only makes start up slower.
+    """
+
+    def __init__(self, directory: str | Path):
+        """Create a schema cache.
+
+        Args:
+            directory: The directory to store schemas in, created if it doesn't exist.
+        """
+        self.directory = Path(directory)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get the entry for `key`, or `None` if there isn't one."""
+        try:
+            value = json.loads(self._path(key).read_bytes())
+        except (OSError, ValueError):
+            return None
+        return cast(dict[str, Any], value) if isinstance(value, dict) else None
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        """Store the entry for `key`, replacing any existing entry."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file and rename it, so other processes never read a partially written entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(value, f)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for path in self.directory.glob('*.json'):
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+
+_UNSET: Any = object()
+_schema_cache: SchemaCache | None = _UNSET
+_lock = threading.Lock()
+
+
+def set_schema_cache(cache: SchemaCache | None) -> None:
+    """Set the schema cache used by all agents and tools in this process, `None` to disable caching."""
+    global _schema_cache
+    with _lock:
+        _schema_cache = cache
+
+
+def get_schema_cache() -> SchemaCache | None:
+    """Get the schema cache in use, by default configured by the `PYDANTIC_AI_SCHEMA_CACHE_DIR` environment variable."""
+    global _schema_cache
+    if _schema_cache is _UNSET:
+        with _lock:
+            if _schema_cache is _UNSET:
+                directory = os.environ.get(ENV_VAR)
+                _schema_cache = SchemaCache(directory) if directory else None
+    return _schema_cache
+
+
+def function_key(function: Callable[..., Any], *params: Any) -> str | None:
+    """Get the key of a function's schema, built with `params`, or `None` if it can't be cached.
+
+    Functions whose module has no source file, e.g. those defined interactively, can't be cached.
+    """
+    code = getattr(function, '__code__', None)
+    module_hash = _module_source_hash(getattr(function, '__module__', None))
+    if code is None or module_hash is None:
+        return None
+    # the line distinguishes functions with the same qualified name, e.g. lambdas, and the annotations functions
+    # created by the same code, e.g. by a factory
+    annotations = getattr(function, '__annotations__', {})
+    return _key(
+        'function', function.__module__, function.__qualname__, code.co_firstlineno, module_hash, annotations, params
+    )
+
+
+def type_key(type_: Any, *params: Any) -> str | None:
+    """Get the key of a type's schema, built with `params`, or `None` if it can't be cached.
+
+    Types are identified by their `repr`, along with the source of the modules of the type and of its arguments.
+    Classes must be defined at their qualified name in their module, so classes defined in functions or created
+    dynamically, e.g. with `create_model`, can't be cached, since their `repr` doesn't identify their definition.
+    """
+    module_hashes: dict[str, str] = {}
+    types = [type_]
+    while types:
+        t = types.pop()
+        module = getattr(t, '__module__', None)
+        if module is not None and module != 'builtins':
+            if inspect.isclass(t) and not _defined_at_qualname(t):
+                return None
+            if module not in module_hashes:
+                module_hash = _module_source_hash(module)
+                if module_hash is None and inspect.isclass(t):
+                    # a class we can't identify by its source
+                    return None
+                module_hashes[module] = module_hash or ''
+        types.extend(get_args(t))
+    return _key('type', repr(type_), sorted(module_hashes.items()), params)
+
+
+def _defined_at_qualname(cls: type[Any]) -> bool:
+    """Whether `cls` is the object found at its qualified name in its module, so is identified by that name."""
+    obj: Any = sys.modules.get(cls.__module__)
+    for name in cls.__qualname__.split('.'):
+        obj = getattr(obj, name, None)
+    return obj is cls
+
+
+def _key(*parts: Any) -> str:
+    import pydantic
+
+    from . import __version__
+
+    data = json.dumps([pydantic.VERSION, __version__, *parts], default=repr, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+_module_hashes: dict[str, str | None] = {}
+
+
+def _module_source_hash(module_name: str | None) -> str | None:
+    if module_name is None:
+        return None
+    try:
+        return _module_hashes[module_name]
+    except KeyError:
+        pass
+    module = sys.modules.get(module_name)
+    file = getattr(module, '__file__', None)
+    try:
+        module_hash = hashlib.sha256(Path(file).read_bytes()).hexdigest() if file else None
+    except OSError:
+        module_hash = None
+    _module_hashes[module_name] = module_hash
+    return module_hash
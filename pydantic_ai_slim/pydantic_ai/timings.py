@@ -0,0 +1,132 @@
+from __future__ import annotations as _annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+
+__all__ = 'RunTimings', 'StepTimings', 'ToolTiming', 'measure_message_mapping'
+
+
+@dataclass
+class ToolTiming:
+    """Time spent running a tool call."""
+
+    tool_name: str
+    """Name of the tool called."""
+    tool_call_id: str | None
+    """ID of the tool call, if the model provided one."""
+    duration: float
+    """Time in seconds spent validating the arguments and running the tool."""
+
+
+@dataclass
+class StepTimings:
+    """Time spent in each phase of a step of a run, i.e. a request to the model and handling its response.
+
+    All times are in seconds.
+    """
+
+    run_step: int
+    """The step of the run, as in [`RunContext.run_step`][pydantic_ai.tools.RunContext.run_step]."""
+    prepare_model: float = 0
+    """Time spent preparing tools and the model for the request."""
+    model_request: float = 0
+    """Time until the model's response was received, or for streamed responses, until the stream started."""
+    message_mapping: float = 0
+    """Time spent mapping messages to the model's format, this is part of `model_request`.
+
+    This is only measured by models which support it, it's `0` for other models.
+    """
+    time_to_first_token: float | None = None
+    """For streamed responses, time from sending the request until the first event was received."""
+    stream_duration: float | None = None
+    """For streamed responses, time from the first event until the stream was received in full."""
+    tools: list[ToolTiming] = field(default_factory=list)
+    """Time spent running each tool call, tool calls run concurrently so these may overlap."""
+    result_validation: float = 0
+    """Time spent validating the result against the result type, including partial results while streaming."""
+    result_validators: float = 0
+    """Time spent running result validators."""
+    _request_started_at: float = field(default=0, init=False, repr=False, compare=False)
+    _first_event_at: float | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def network_wait(self) -> float:
+        """Time spent waiting for the model, i.e. `model_request` excluding `message_mapping`."""
+        return self.model_request - self.message_mapping
+
+    def request_started(self) -> None:
+        """Record that the request to the model is being sent."""
+        self._request_started_at = perf_counter()
+
+    def response_received(self) -> None:
+        """Record that the model's response was received, or for streamed responses, that the stream started."""
+        self.model_request = perf_counter() - self._request_started_at
+
+    def event_received(self) -> None:
+        """Record that an event of a streamed response was received, only the first is recorded."""
+        if self._first_event_at is None:
+            self._first_event_at = perf_counter()
+            self.time_to_first_token = self._first_event_at - self._request_started_at
+
+    def stream_finished(self) -> None:
+        """Record that a streamed response was received in full."""
+        if self._first_event_at is not None and self.stream_duration is None:
+            self.stream_duration = perf_counter() - self._first_event_at
+
+    @contextmanager
+    def record_message_mapping(self) -> Iterator[None]:
+        """Record the time models spend mapping messages within this context to this step.
+
+        See [`measure_message_mapping`][pydantic_ai.timings.measure_message_mapping].
+        """
+        token = _current_step.set(self)
+        try:
+            yield
+        finally:
+            _current_step.reset(token)
+
+
+@dataclass
+class RunTimings:
+    """Breakdown of where the time of a run was spent, step by step."""
+
+    steps: list[StepTimings] = field(default_factory=list)
+    """Timings of each step of the run."""
+    total: float | None = None
+    """Time in seconds the whole run took, `None` until the run has completed."""
+    _started_at: float = field(default_factory=perf_counter, init=False, repr=False, compare=False)
+
+    def start_step(self, run_step: int) -> StepTimings:
+        """Add the timings of a new step of the run, and return them."""
+        step = StepTimings(run_step)
+        self.steps.append(step)
+        return step
+
+    def finish(self) -> None:
+        """Record that the run has completed."""
+        self.total = perf_counter() - self._started_at
+
+
+_current_step: ContextVar[StepTimings | None] = ContextVar('_current_step', default=None)
+
+
+@contextmanager
+def measure_message_mapping() -> Iterator[None]:
+    """Measure the time spent mapping messages to a model's format, within this context.
+
+    Models call this around their message mapping, the time is added to
+    [`StepTimings.message_mapping`][pydantic_ai.timings.StepTimings.message_mapping] of the current step of the run.
+    Outside a run, this does nothing.
+    """
+    step = _current_step.get()
+    if step is None:
+        yield
+        return
+    started_at = perf_counter()
+    try:
+        yield
+    finally:
+        step.message_mapping += perf_counter() - started_at
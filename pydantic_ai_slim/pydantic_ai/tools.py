@@ -1,19 +1,28 @@
 from __future__ import annotations as _annotations
 
+import asyncio
+import copy
 import dataclasses
+import hashlib
 import inspect
+import threading
 from collections.abc import Awaitable
 from dataclasses import dataclass, field
+from time import perf_counter
 from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, Union, cast
+from weakref import WeakKeyDictionary
 
+import pydantic_core
 from pydantic import ValidationError
-from pydantic_core import SchemaValidator
 from typing_extensions import Concatenate, ParamSpec, TypeAlias, TypeVar
 
 from . import _pydantic, _utils, messages as _messages, models
-from .exceptions import ModelRetry, UnexpectedModelBehavior
+from .exceptions import ModelRetry, ToolTimeout, UnexpectedModelBehavior, UserError
+from .executors import Executor, ProcessExecutor, default_executor
+from .timings import RunTimings, ToolTiming
 
 if TYPE_CHECKING:
+    from .models.cached import CacheStore
     from .result import Usage
 
 __all__ = (
@@ -27,6 +36,7 @@ __all__ = (
     'ToolParams',
     'ToolPrepareFunc',
     'Tool',
+    'ToolCache',
     'ObjectJsonSchema',
     'ToolDefinition',
 )
@@ -55,6 +65,15 @@ class RunContext(Generic[AgentDeps]):
     """Number of retries so far."""
     run_step: int = 0
     """The current step in the run."""
+    tool_retries: dict[str, int] = field(default_factory=dict)
+    """Number of retries of each tool so far in this run, by tool name.
+
+    This is shared by every `RunContext` of a run, so concurrent runs of the same agent don't affect each other.
+    """
+    timings: RunTimings = field(default_factory=RunTimings)
+    """Breakdown of where the time of the run has been spent so far."""
+    executor: Executor = default_executor
+    """Executor used to run sync functions during the run, see [`Agent.executor`][pydantic_ai.Agent.executor]."""
 
     def replace_with(
         self, retry: int | None = None, tool_name: str | None | _utils.Unset = _utils.UNSET
@@ -137,6 +156,127 @@ DocstringFormat = Literal['google', 'numpy', 'sphinx', 'auto']
 * `'auto'` — Automatically infer the format based on the structure of the docstring.
 """
 
+
+class ToolCache:
+    """Cache of the results of tools, so calls with the same arguments don't run the tool function again.
+
+    Calls are identified by the name of the tool and its arguments after validation, optionally with the run's
+    deps. Identical calls made while the first is still running wait for its result rather than running the function
+    again. Calls which raise an error, including [`ModelRetry`][pydantic_ai.exceptions.ModelRetry], aren't cached.
+
+    Results are kept in memory, or in a [`CacheStore`][pydantic_ai.models.cached.CacheStore], e.g. to share them
+    between processes, in which case they're serialized as JSON.
+
+    A cache can be shared by several tools, since the name of the tool is part of the key.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float | None = None,
+        maxsize: int | None = 1024,
+        key: Callable[[Any], Any] | None = None,
+        scope_by_deps: bool = False,
+        store: CacheStore | None = None,
+    ):
+        """Create a tool cache.
+
+        Args:
+            ttl: Time in seconds after which a result expires, `None` if results never expire.
+            maxsize: Maximum number of results kept in memory, the least recently used are evicted first.
+            key: Function deriving the key of a call from its validated arguments, e.g. to ignore some of them.
+                It receives a dict of argument names to values, or the argument itself for tools taking a single
+                model-like argument, and must return something pydantic can serialize. Defaults to all the arguments.
+            scope_by_deps: Whether results are only reused by runs with the same deps, which must be serializable by
+                pydantic. Otherwise, for tools taking `RunContext`, the result of a call is reused regardless of deps.
+            store: Store to keep results in rather than memory, `ttl` and `maxsize` don't apply, the store's own
+                configuration does.
+        """
+        self.key = key
+        self.scope_by_deps = scope_by_deps
+        self.store = store
+        self.hits = 0
+        """Number of calls whose result was found in the cache."""
+        self.misses = 0
+        """Number of calls which ran the tool function."""
+        self.coalesced = 0
+        """Number of calls which waited for an identical call which was already running."""
+        self._memory = _utils.LRUCache[str, tuple[Any]](maxsize, ttl)
+        self._lock = threading.Lock()
+        self._in_flight: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _InFlightCall]] = WeakKeyDictionary()
+
+    def cache_key(self, tool_name: str, args: Any, run_context: RunContext[Any]) -> str:
+        """Get the key identifying a call to a tool with the given validated arguments."""
+        key_parts = [tool_name, args if self.key is None else self.key(args)]
+        if self.scope_by_deps:
+            key_parts.append(run_context.deps)
+        return hashlib.sha256(pydantic_core.to_json(key_parts)).hexdigest()
+
+    async def get_or_call(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Get the result of a call from the cache, or run `call` and cache its result.
+
+        Args:
+            key: The key of the call, from [`cache_key`][pydantic_ai.tools.ToolCache.cache_key].
+            call: Runs the tool function and returns its result.
+        """
+        cached = await self._get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached[0]
+
+        calls = self._in_flight.setdefault(asyncio.get_running_loop(), {})
+        in_flight = calls.get(key)
+        if in_flight is None:
+            self.misses += 1
+            in_flight = calls[key] = _InFlightCall(asyncio.ensure_future(self._call(key, call)))
+            in_flight.task.add_done_callback(lambda _: _remove(calls, key, in_flight))
+        else:
+            self.coalesced += 1
+
+        in_flight.waiters += 1
+        try:
+            return await asyncio.shield(in_flight.task)
+        finally:
+            in_flight.waiters -= 1
+            if in_flight.waiters == 0 and not in_flight.task.done():
+                # every call waiting for the result has been cancelled
+                _remove(calls, key, in_flight)
+                in_flight.task.cancel()
+                await asyncio.wait([in_flight.task])
+
+    def clear(self) -> None:
+        """Remove all results kept in memory."""
+        with self._lock:
+            self._memory.clear()
+
+    async def _call(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        content = await call()
+        if self.store is None:
+            with self._lock:
+                self._memory.set(key, (content,))
+        else:
+            await self.store.set(key, pydantic_core.to_json(content))
+        return content
+
+    async def _get(self, key: str) -> tuple[Any] | None:
+        if self.store is None:
+            with self._lock:
+                return self._memory.get(key)
+        value = await self.store.get(key)
+        return None if value is None else (pydantic_core.from_json(value),)
+
+
+@dataclass
+class _InFlightCall:
+    task: asyncio.Future[Any]
+    waiters: int = 0
+
+
+def _remove(calls: dict[str, _InFlightCall], key: str, in_flight: _InFlightCall) -> None:
+    if calls.get(key) is in_flight:
+        del calls[key]
+
+
 A = TypeVar('A')
 
 
@@ -152,13 +292,19 @@ class Tool(Generic[AgentDeps]):
     prepare: ToolPrepareFunc[AgentDeps] | None
     docstring_format: DocstringFormat
     require_parameter_descriptions: bool
+    executor: Executor | None
+    cache: ToolCache | None
+    timeout: float | None
+    on_timeout: Literal['retry', 'raise']
+    max_concurrency: int | None
     _is_async: bool = field(init=False)
-    _single_arg_name: str | None = field(init=False)
-    _positional_fields: list[str] = field(init=False)
-    _var_positional_field: str | None = field(init=False)
-    _validator: SchemaValidator = field(init=False, repr=False)
-    _parameters_json_schema: ObjectJsonSchema = field(init=False)
-    current_retry: int = field(default=0, init=False)
+    _function_schema: _pydantic.FunctionSchema | None = field(init=False, repr=False)
+    _function_json_schema: _pydantic.FunctionJsonSchema | None = field(init=False, repr=False)
+    _tool_def: ToolDefinition | None = field(init=False, repr=False)
+    _semaphores: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = field(
+        init=False, repr=False, compare=False
+    )
+    _registered: bool = field(init=False, repr=False, compare=False)
 
     def __init__(
         self,
@@ -171,6 +317,11 @@ class Tool(Generic[AgentDeps]):
         prepare: ToolPrepareFunc[AgentDeps] | None = None,
         docstring_format: DocstringFormat = 'auto',
         require_parameter_descriptions: bool = False,
+        executor: Executor | None = None,
+        cache: ToolCache | None = None,
+        timeout: float | None = None,
+        on_timeout: Literal['retry', 'raise'] = 'retry',
+        max_concurrency: int | None = None,
     ):
         """Create a new tool instance.
 
@@ -220,25 +371,89 @@ class Tool(Generic[AgentDeps]):
             docstring_format: The format of the docstring, see [`DocstringFormat`][pydantic_ai.tools.DocstringFormat].
                 Defaults to `'auto'`, such that the format is inferred from the structure of the docstring.
             require_parameter_descriptions: If True, raise an error if a parameter description is missing. Defaults to False.
+            executor: Executor used to run the function if it's sync, defaults to the agent's
+                [`executor`][pydantic_ai.Agent.executor]. A [`ProcessExecutor`][pydantic_ai.executors.ProcessExecutor]
+                can only be used if the function doesn't take `RunContext`.
+            cache: Cache of the tool's results, so calls with the same arguments return the cached result rather
+                than running the function again, see [`ToolCache`][pydantic_ai.tools.ToolCache].
+            timeout: Maximum time in seconds a call may run for before it's cancelled, `None` for no limit.
+                Sync functions can't be interrupted, so they run to completion in their executor but their result is
+                ignored.
+            on_timeout: What to do when a call times out: `'retry'` asks the model to try again, counting as a
+                retry of the tool, `'raise'` raises [`ToolTimeout`][pydantic_ai.exceptions.ToolTimeout], ending the
+                run.
+            max_concurrency: Maximum number of calls of this tool running at once, across all the runs of an agent
+                using it, each agent the tool is registered with has its own limit. Calls wait until one of the running calls completes, time spent waiting doesn't count towards
+                `timeout`.
         """
-        if takes_ctx is None:
-            takes_ctx = _pydantic.takes_ctx(function)
-
-        f = _pydantic.function_schema(function, takes_ctx, docstring_format, require_parameter_descriptions)
+        # building the schema is deferred until it's first needed, only the signature is checked now
+        takes_ctx = _pydantic.check_function(function, takes_ctx, docstring_format, require_parameter_descriptions)
+        if takes_ctx and isinstance(executor, ProcessExecutor):
+            raise UserError(
+                "A `ProcessExecutor` can't run functions which take `RunContext`, it can only be used by plain tools"
+            )
         self.function = function
         self.takes_ctx = takes_ctx
         self.max_retries = max_retries
         self.name = name or function.__name__
-        self.description = description or f['description']
+        if description:
+            # otherwise it's taken from the function's docstring when it's first used, see `__getattr__`
+            self.description = description
         self.prepare = prepare
         self.docstring_format = docstring_format
         self.require_parameter_descriptions = require_parameter_descriptions
+        self.executor = executor
+        self.cache = cache
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+        self.max_concurrency = max_concurrency
         self._is_async = inspect.iscoroutinefunction(self.function)
-        self._single_arg_name = f['single_arg_name']
-        self._positional_fields = f['positional_fields']
-        self._var_positional_field = f['var_positional_field']
-        self._validator = f['validator']
-        self._parameters_json_schema = f['json_schema']
+        self._reset_state()
+
+    if not TYPE_CHECKING:
+
+        def __getattr__(self, name: str) -> Any:
+            if name == 'description':
+                self.description = description = self._json_schema['description']
+                return description
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+    def _copy(self) -> Tool[AgentDeps]:
+        """Copy the tool without checking its function again, the copy has its own concurrency limit and schemas."""
+        tool = copy.copy(self)
+        tool._reset_state()
+        return tool
+
+    def _reset_state(self) -> None:
+        self._registered = False
+        self._semaphores = WeakKeyDictionary()
+        self._function_schema = None
+        self._function_json_schema = None
+        self._tool_def = None
+
+    @property
+    def _schema(self) -> _pydantic.FunctionSchema:
+        """The validator and JSON schema of the function's arguments, built when they're first used.
+
+        Schemas are shared by all the tools using the same function, see `_pydantic.function_schema`.
+        """
+        if self._function_schema is None:
+            self._function_schema = _pydantic.function_schema(
+                self.function, self.takes_ctx, self.docstring_format, self.require_parameter_descriptions
+            )
+        return self._function_schema
+
+    @property
+    def _json_schema(self) -> _pydantic.FunctionJsonSchema:
+        """The description and JSON schema of the function, which may come from the schema cache.
+
+        Unlike `_schema`, this doesn't build the validator if the [schema cache][pydantic_ai.schema_cache] has them.
+        """
+        if self._function_json_schema is None:
+            self._function_json_schema = self._function_schema or _pydantic.function_json_schema(
+                self.function, self.takes_ctx, self.docstring_format, self.require_parameter_descriptions
+            )
+        return self._function_json_schema
 
     async def prepare_tool_def(self, ctx: RunContext[AgentDeps]) -> ToolDefinition | None:
         """Get the tool definition.
@@ -246,72 +461,142 @@ class Tool(Generic[AgentDeps]):
         By default, this method creates a tool definition, then either returns it, or calls `self.prepare`
         if it's set.
 
+        If `self.prepare` isn't set, the same `ToolDefinition` instance is returned for every step, so models can
+        cache anything they derive from it.
+
         Returns:
             return a `ToolDefinition` or `None` if the tools should not be registered for this run.
         """
-        tool_def = ToolDefinition(
+        if self.prepare is not None:
+            # `prepare` may modify the definition it receives, so it gets a new one each time
+            return await self.prepare(ctx, self._build_tool_def())
+
+        tool_def = self._tool_def
+        if tool_def is None or tool_def.name != self.name or tool_def.description != self.description:
+            tool_def = self._tool_def = self._build_tool_def()
+        return tool_def
+
+    def _build_tool_def(self) -> ToolDefinition:
+        return ToolDefinition(
             name=self.name,
             description=self.description,
-            parameters_json_schema=self._parameters_json_schema,
+            parameters_json_schema=self._json_schema['json_schema'],
         )
-        if self.prepare is not None:
-            return await self.prepare(ctx, tool_def)
-        else:
-            return tool_def
 
     async def run(
         self, message: _messages.ToolCallPart, run_context: RunContext[AgentDeps]
     ) -> _messages.ModelRequestPart:
         """Run the tool function asynchronously."""
+        started_at = perf_counter()
+        try:
+            return await self._run(message, run_context)
+        finally:
+            if run_context.timings.steps:
+                run_context.timings.steps[-1].tools.append(
+                    ToolTiming(message.tool_name, message.tool_call_id, perf_counter() - started_at)
+                )
+
+    async def _run(
+        self, message: _messages.ToolCallPart, run_context: RunContext[AgentDeps]
+    ) -> _messages.ModelRequestPart:
         try:
             if isinstance(message.args, _messages.ArgsJson):
-                args_dict = self._validator.validate_json(message.args.args_json)
+                args_dict = self._schema['validator'].validate_json(message.args.args_json)
             else:
-                args_dict = self._validator.validate_python(message.args.args_dict)
+                args_dict = self._schema['validator'].validate_python(message.args.args_dict)
         except ValidationError as e:
-            return self._on_error(e, message)
+            return self._on_error(e, message, run_context)
 
-        args, kwargs = self._call_args(args_dict, message, run_context)
         try:
-            if self._is_async:
-                function = cast(Callable[[Any], Awaitable[str]], self.function)
-                response_content = await function(*args, **kwargs)
+            if self.cache is None:
+                args, kwargs = self._call_args(args_dict, message, run_context)
+                response_content = await self._call_limited(args, kwargs, run_context)
             else:
-                function = cast(Callable[[Any], str], self.function)
-                response_content = await _utils.run_in_executor(function, *args, **kwargs)
+                # the key is computed first since getting the arguments of the function consumes `args_dict`
+                cache_key = self.cache.cache_key(self.name, args_dict, run_context)
+                args, kwargs = self._call_args(args_dict, message, run_context)
+                response_content = await self.cache.get_or_call(
+                    cache_key, lambda: self._call_limited(args, kwargs, run_context)
+                )
         except ModelRetry as e:
-            return self._on_error(e, message)
-
-        self.current_retry = 0
+            return self._on_error(e, message, run_context)
+        except ToolTimeout as e:
+            if self.on_timeout == 'raise':
+                raise
+            retry = ModelRetry(f'Timed out after {e.timeout} seconds, try again with different arguments if possible')
+            return self._on_error(retry, message, run_context)
+
+        run_context.tool_retries.pop(self.name, None)
         return _messages.ToolReturnPart(
             tool_name=message.tool_name,
             content=response_content,
             tool_call_id=message.tool_call_id,
         )
 
+    async def _call_limited(self, args: list[Any], kwargs: dict[str, Any], run_context: RunContext[AgentDeps]) -> Any:
+        """Call the function once fewer than `max_concurrency` calls are running, and within `timeout`."""
+        if self.max_concurrency is None:
+            return await self._call_timeout(args, kwargs, run_context)
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            return await self._call_timeout(args, kwargs, run_context)
+
+    async def _call_timeout(self, args: list[Any], kwargs: dict[str, Any], run_context: RunContext[AgentDeps]) -> Any:
+        if self.timeout is None:
+            return await self._call(args, kwargs, run_context)
+        # waiting for the task, rather than using `asyncio.wait_for`, distinguishes the call timing out from the
+        # function raising `TimeoutError` itself
+        task = asyncio.ensure_future(self._call(args, kwargs, run_context))
+        try:
+            await asyncio.wait([task], timeout=self.timeout)
+        finally:
+            # cancel the call if it timed out, or if the run was cancelled while waiting for it
+            if timed_out := not task.done():
+                task.cancel()
+                await asyncio.wait([task])
+        if timed_out:
+            raise ToolTimeout(self.name, self.timeout)
+        return task.result()
+
+    async def _call(self, args: list[Any], kwargs: dict[str, Any], run_context: RunContext[AgentDeps]) -> Any:
+        if self._is_async:
+            function = cast(Callable[..., Awaitable[Any]], self.function)
+            return await function(*args, **kwargs)
+        else:
+            function = cast(Callable[..., Any], self.function)
+            executor = self.executor or run_context.executor
+            return await executor.run(function, *args, **kwargs)
+
     def _call_args(
         self,
         args_dict: dict[str, Any],
         message: _messages.ToolCallPart,
         run_context: RunContext[AgentDeps],
     ) -> tuple[list[Any], dict[str, Any]]:
-        if self._single_arg_name:
-            args_dict = {self._single_arg_name: args_dict}
+        schema = self._schema
+        if single_arg_name := schema['single_arg_name']:
+            args_dict = {single_arg_name: args_dict}
 
-        ctx = dataclasses.replace(run_context, retry=self.current_retry, tool_name=message.tool_name)
+        ctx = run_context.replace_with(retry=run_context.tool_retries.get(self.name, 0), tool_name=message.tool_name)
         args = [ctx] if self.takes_ctx else []
-        for positional_field in self._positional_fields:
+        for positional_field in schema['positional_fields']:
             args.append(args_dict.pop(positional_field))
-        if self._var_positional_field:
-            args.extend(args_dict.pop(self._var_positional_field))
+        if var_positional_field := schema['var_positional_field']:
+            args.extend(args_dict.pop(var_positional_field))
 
         return args, args_dict
 
     def _on_error(
-        self, exc: ValidationError | ModelRetry, call_message: _messages.ToolCallPart
+        self,
+        exc: ValidationError | ModelRetry,
+        call_message: _messages.ToolCallPart,
+        run_context: RunContext[AgentDeps],
     ) -> _messages.RetryPromptPart:
-        self.current_retry += 1
-        if self.max_retries is None or self.current_retry > self.max_retries:
+        current_retry = run_context.tool_retries[self.name] = run_context.tool_retries.get(self.name, 0) + 1
+        if self.max_retries is None or current_retry > self.max_retries:
             raise UnexpectedModelBehavior(f'Tool exceeded max retries count of {self.max_retries}') from exc
         else:
             if isinstance(exc, ValidationError):
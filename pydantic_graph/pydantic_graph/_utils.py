@@ -3,10 +3,14 @@ from __future__ import annotations as _annotations
 import sys
 import types
 from datetime import datetime, timezone
-from typing import Annotated, Any, TypeVar, Union, get_args, get_origin
+from functools import cache
+from typing import TYPE_CHECKING, Annotated, Any, TypeVar, Union, get_args, get_origin
 
 import typing_extensions
 
+if TYPE_CHECKING:
+    import logfire_api
+
 
 def get_union_args(tp: Any) -> tuple[Any, ...]:
     """Extract the arguments of a Union type if `response_type` is a union, otherwise return the original type."""
@@ -84,6 +88,17 @@ def now_utc() -> datetime:
     return datetime.now(tz=timezone.utc)
 
 
+@cache
+def get_logfire() -> logfire_api.Logfire:
+    """Get the `Logfire` instance used to create spans, `logfire_api` is imported on first use since it's slow.
+
+    Copied from pydantic_ai/_utils.py.
+    """
+    import logfire_api
+
+    return logfire_api.Logfire(otel_scope='pydantic-graph')
+
+
 class Unset:
     """A singleton to represent an unset value.
 
@@ -10,7 +10,6 @@ from pathlib import Path
 from time import perf_counter
 from typing import TYPE_CHECKING, Annotated, Any, Callable, Generic
 
-import logfire_api
 import pydantic
 import typing_extensions
 
@@ -20,8 +19,6 @@ from .state import EndStep, HistoryStep, NodeStep, StateT, deep_copy_state, node
 
 __all__ = ('Graph',)
 
-_logfire = logfire_api.Logfire(otel_scope='pydantic-graph')
-
 
 @dataclass(init=False)
 class Graph(Generic[StateT, DepsT, RunEndT]):
@@ -152,7 +149,7 @@ class Graph(Generic[StateT, DepsT, RunEndT]):
             self._infer_name(inspect.currentframe())
 
         history: list[HistoryStep[StateT, RunEndT]] = []
-        with _logfire.span(
+        with _utils.get_logfire().span(
             '{graph_name} run {start=}',
             graph_name=self.name or 'graph',
             start=start_node,
@@ -230,7 +227,7 @@ class Graph(Generic[StateT, DepsT, RunEndT]):
             raise exceptions.GraphRuntimeError(f'Node `{node}` is not in the graph.')
 
         ctx = GraphRunContext(state, deps)
-        with _logfire.span('run node {node_id}', node_id=node_id, node=node):
+        with _utils.get_logfire().span('run node {node_id}', node_id=node_id, node=node):
             start_ts = _utils.now_utc()
             start = perf_counter()
             next_node = await node.run(ctx)
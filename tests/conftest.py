@@ -30,7 +30,14 @@ if TYPE_CHECKING:
     def IsNow(*args: Any, **kwargs: Any) -> datetime: ...
     def IsFloat(*args: Any, **kwargs: Any) -> float: ...
 else:
-    from dirty_equals import IsFloat, IsNow
+    from dirty_equals import IsFloat, IsNow as _IsNow
+
+    def IsNow(*args: Any, **kwargs: Any) -> datetime:
+        # the first agent run in a session can take a couple of seconds while logfire imports its own dependencies,
+        # which mustn't make the timestamps it records fail the check
+        kwargs.setdefault('delta', 10)
+        return _IsNow(*args, **kwargs)
+
 
 try:
     from logfire.testing import CaptureLogfire
@@ -0,0 +1,161 @@
+from __future__ import annotations as _annotations
+
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.cached import CachedAgentModel, CachedModel, MemoryCacheStore, SQLiteCacheStore
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+pytestmark = pytest.mark.anyio
+
+
+class CountingModel:
+    """Function model implementations which count the requests they receive."""
+
+    def __init__(self):
+        self.requests = 0
+        self.stream_requests = 0
+
+    async def function(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        self.requests += 1
+        if info.result_tools:
+            return ModelResponse(parts=[ToolCallPart.from_raw_args(info.result_tools[0].name, '{"response": 42}')])
+        return ModelResponse.from_text(f'response {self.requests}')
+
+    async def stream_function(self, messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        self.stream_requests += 1
+        yield 'streamed '
+        yield f'response {self.stream_requests}'
+
+    def model(self) -> FunctionModel:
+        return FunctionModel(self.function, stream_function=self.stream_function)
+
+
+async def test_request_cached():
+    counting = CountingModel()
+    agent = Agent(CachedModel(counting.model()))
+
+    result1 = await agent.run('Hello')
+    assert result1.data == snapshot('response 1')
+    result2 = await agent.run('Hello')
+    assert result2.data == snapshot('response 1')
+    assert result2.usage() == result1.usage()
+    assert counting.requests == 1
+
+    result3 = await agent.run('Goodbye')
+    assert result3.data == snapshot('response 2')
+    assert counting.requests == 2
+
+    # tools and settings are part of the request, but the timeout isn't
+    assert (await agent.run('Hello', result_type=int)).data == 42
+    assert counting.requests == 3
+    await agent.run('Hello', model_settings={'temperature': 0.5})
+    assert counting.requests == 4
+    await agent.run('Hello', model_settings={'temperature': 0.5, 'timeout': 10})
+    assert counting.requests == 4
+
+
+async def test_stream_cached():
+    counting = CountingModel()
+    agent = Agent(CachedModel(counting.model()))
+
+    async with agent.run_stream('Hello') as result:
+        assert [c async for c in result.stream_text(debounce_by=None)] == snapshot(['streamed ', 'streamed response 1'])
+    usage = result.usage()
+
+    async with agent.run_stream('Hello') as result:
+        assert [c async for c in result.stream_text(debounce_by=None)] == snapshot(['streamed ', 'streamed response 1'])
+    assert result.usage() == usage
+    assert counting.stream_requests == 1
+
+    # streams which aren't received in full aren't cached
+    async with agent.run_stream('Goodbye') as result:
+        pass
+    async with agent.run_stream('Goodbye') as result:
+        assert await result.get_data() == snapshot('streamed response 3')
+    assert counting.stream_requests == 3
+
+
+async def test_stream_tool_calls_cached():
+    requests = 0
+
+    async def stream_function(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        nonlocal requests
+        requests += 1
+        assert info.result_tools is not None
+        yield {0: DeltaToolCall(name=info.result_tools[0].name)}
+        yield {0: DeltaToolCall(json_args='{"response": [1')}
+        yield {0: DeltaToolCall(json_args=', 2]}')}
+
+    agent = Agent(CachedModel(FunctionModel(stream_function=stream_function)), result_type=list[int])
+
+    for _ in range(2):
+        async with agent.run_stream('Hello') as result:
+            assert [c async for c in result.stream(debounce_by=None)] == snapshot([[1], [1, 2], [1, 2]])
+    assert requests == 1
+
+
+async def test_stream_from_request():
+    """Responses to requests which weren't streamed are replayed as a stream."""
+    counting = CountingModel()
+    agent = Agent(CachedModel(counting.model()))
+
+    assert (await agent.run('Hello')).data == snapshot('response 1')
+    async with agent.run_stream('Hello') as result:
+        assert await result.get_data() == snapshot('response 1')
+    assert (counting.requests, counting.stream_requests) == (1, 0)
+
+
+async def test_invalid_entry():
+    store = MemoryCacheStore()
+    model = CachedModel(TestModel(), store=store)
+    agent_model = await model.agent_model(function_tools=[], allow_text_result=True, result_tools=[])
+    assert isinstance(agent_model, CachedAgentModel)
+
+    await store.set(agent_model.cache_key([], None), b'not a response')
+    response, _ = await agent_model.request([], None)
+    assert response.parts == [TextPart(content='success (no tool calls)')]
+    # the invalid entry is replaced
+    assert await store.get(agent_model.cache_key([], None)) != b'not a response'
+
+
+async def test_memory_store():
+    store = MemoryCacheStore(maxsize=2)
+    await store.set('a', b'1')
+    await store.set('b', b'2')
+    assert await store.get('a') == b'1'
+    await store.set('c', b'3')
+    # 'b' was the least recently used
+    assert [await store.get(k) for k in 'abc'] == [b'1', None, b'3']
+
+
+async def test_sqlite_store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    db_path = tmp_path / 'cache.sqlite'
+    counting = CountingModel()
+    store = SQLiteCacheStore(db_path)
+    agent = Agent(CachedModel(counting.model(), store=store))
+    assert (await agent.run('Hello')).data == snapshot('response 1')
+    store.close()
+
+    # responses are kept between stores using the same database
+    store = SQLiteCacheStore(db_path, ttl=60)
+    agent = Agent(CachedModel(counting.model(), store=store))
+    assert (await agent.run('Hello')).data == snapshot('response 1')
+    assert counting.requests == 1
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert (await agent.run('Hello')).data == snapshot('response 2')
+    assert await store.get('missing') is None
+    store.close()
+
+
+def test_name():
+    assert CachedModel('test').name() == 'test-model'
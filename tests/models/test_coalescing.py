@@ -0,0 +1,196 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models.coalescing import CoalescingModel
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+pytestmark = pytest.mark.anyio
+
+
+class GatedModel:
+    """Function model implementations which count requests and wait to be released before responding."""
+
+    def __init__(self):
+        self.requests = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.cancelled = False
+
+    async def function(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        self.requests += 1
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return ModelResponse.from_text(f'response {self.requests}')
+
+    async def stream_function(self, messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        self.requests += 1
+        yield 'streamed '
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        yield f'response {self.requests}'
+
+    def model(self) -> FunctionModel:
+        return FunctionModel(self.function, stream_function=self.stream_function)
+
+
+async def test_request_coalesced():
+    gated = GatedModel()
+    model = CoalescingModel(gated.model())
+    agent = Agent(model)
+
+    tasks = [asyncio.create_task(agent.run('Hello')) for _ in range(3)]
+    other_task = asyncio.create_task(agent.run('Goodbye'))
+    await gated.started.wait()
+    await asyncio.sleep(0)
+    assert model.in_flight_requests() == 2
+    gated.release.set()
+
+    results = await asyncio.gather(*tasks)
+    assert [r.data for r in results] == snapshot(['response 2', 'response 2', 'response 2'])
+    assert (await other_task).data == snapshot('response 2')
+    assert gated.requests == 2
+    assert model.in_flight_requests() == 0
+
+    # each run gets its own copy of the response
+    responses = [r.all_messages()[-1] for r in results]
+    assert responses[0] == responses[1]
+    assert responses[0] is not responses[1]
+    assert all(r.usage() == results[0].usage() for r in results)
+
+    # completed requests aren't cached
+    assert (await agent.run('Hello')).data == snapshot('response 3')
+    assert gated.requests == 3
+
+
+async def test_request_cancelled():
+    gated = GatedModel()
+    agent = Agent(CoalescingModel(gated.model()))
+
+    tasks = [asyncio.create_task(agent.run('Hello')) for _ in range(2)]
+    await gated.started.wait()
+
+    # the request continues while any run is waiting for it
+    tasks[0].cancel()
+    await asyncio.sleep(0)
+    assert not gated.cancelled
+
+    tasks[1].cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await tasks[1]
+    assert gated.cancelled
+
+
+async def test_request_error():
+    requests = 0
+
+    async def failing(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(0)
+        raise RuntimeError('model error')
+
+    agent = Agent(CoalescingModel(FunctionModel(failing)))
+    results = await asyncio.gather(agent.run('Hello'), agent.run('Hello'), return_exceptions=True)
+    assert [str(r) for r in results] == snapshot(['model error', 'model error'])
+    assert requests == 1
+
+
+async def test_stream_coalesced():
+    gated = GatedModel()
+    agent = Agent(CoalescingModel(gated.model()))
+
+    async def stream_text() -> list[str]:
+        async with agent.run_stream('Hello') as result:
+            return [c async for c in result.stream_text(debounce_by=None)]
+
+    first = asyncio.create_task(stream_text())
+    await gated.started.wait()
+    # joins after the first chunk was received, it's replayed
+    late = asyncio.create_task(stream_text())
+    await asyncio.sleep(0)
+    gated.release.set()
+
+    assert await first == snapshot(['streamed ', 'streamed response 1'])
+    assert await late == snapshot(['streamed ', 'streamed response 1'])
+    assert gated.requests == 1
+
+
+async def test_stream_usage():
+    gated = GatedModel()
+    gated.release.set()
+
+    async with Agent(gated.model()).run_stream('Hello') as result:
+        await result.get_data()
+    expected_usage = result.usage()
+
+    async with Agent(CoalescingModel(gated.model())).run_stream('Hello') as result:
+        await result.get_data()
+    assert result.usage() == expected_usage
+
+
+async def test_stream_cancelled():
+    gated = GatedModel()
+    agent = Agent(CoalescingModel(gated.model()))
+
+    async def stream_text() -> None:
+        async with agent.run_stream('Hello') as result:
+            async for _ in result.stream_text(debounce_by=None):
+                pass
+
+    tasks = [asyncio.create_task(stream_text()) for _ in range(2)]
+    await gated.started.wait()
+    await asyncio.sleep(0)
+
+    tasks[0].cancel()
+    await asyncio.sleep(0)
+    assert not gated.cancelled
+
+    tasks[1].cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    assert gated.cancelled
+
+
+async def test_stream_error():
+    async def failing(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        raise RuntimeError('model error')
+        yield
+
+    agent = Agent(CoalescingModel(FunctionModel(stream_function=failing)))
+    with pytest.raises(RuntimeError, match='model error'):
+        async with agent.run_stream('Hello'):
+            pass
+
+
+async def test_stream_error_after_start():
+    async def failing(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        yield 'hello '
+        await asyncio.sleep(0)
+        raise RuntimeError('model error')
+
+    agent = Agent(CoalescingModel(FunctionModel(stream_function=failing)))
+
+    async def stream_text() -> list[str]:
+        async with agent.run_stream('Hello') as result:
+            return [c async for c in result.stream_text(debounce_by=None)]
+
+    results = await asyncio.gather(stream_text(), stream_text(), return_exceptions=True)
+    assert [str(r) for r in results] == snapshot(['model error', 'model error'])
+
+
+def test_name():
+    assert CoalescingModel('test').name() == 'test-model'
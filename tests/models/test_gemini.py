@@ -6,11 +6,12 @@ import json
 from collections.abc import AsyncIterator, Callable, Sequence
 from dataclasses import dataclass
 from datetime import timezone
+from typing import Any
 
 import httpx
 import pytest
 from inline_snapshot import snapshot
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing_extensions import Literal, TypeAlias
 
 from pydantic_ai import Agent, ModelRetry, UnexpectedModelBehavior, UserError
@@ -31,7 +32,6 @@ from pydantic_ai.models.gemini import (
     _content_model_response,
     _function_call_part_from_call,
     _gemini_response_ta,
-    _gemini_streamed_response_ta,
     _GeminiCandidates,
     _GeminiContent,
     _GeminiFunction,
@@ -41,6 +41,7 @@ from pydantic_ai.models.gemini import (
     _GeminiToolConfig,
     _GeminiTools,
     _GeminiUsageMetaData,
+    _JsonArrayFramer,
 )
 from pydantic_ai.result import Usage
 from pydantic_ai.tools import ToolDefinition
@@ -49,6 +50,9 @@ from ..conftest import ClientWithHandler, IsNow, TestEnv
 
 pytestmark = pytest.mark.anyio
 
+# stream requests return a list of https://ai.google.dev/api/generate-content#method:-models.streamgeneratecontent
+_gemini_streamed_response_ta = TypeAdapter(list[_GeminiResponse])
+
 
 def test_api_key_arg(env: TestEnv):
     env.set('GEMINI_API_KEY', 'via-env-var')
@@ -143,6 +147,30 @@ async def test_agent_model_tools(allow_model_requests: None):
     assert agent_model.tool_config is None
 
 
+async def test_agent_model_tools_cached(allow_model_requests: None):
+    m = GeminiModel('gemini-1.5-flash', api_key='via-arg')
+    tool = ToolDefinition('foo', 'This is foo', {'type': 'object', 'properties': {'bar': {'type': 'number'}}})
+    agent_model_1 = await m.agent_model(function_tools=[tool], allow_text_result=True, result_tools=[])
+    agent_model_2 = await m.agent_model(function_tools=[tool], allow_text_result=True, result_tools=[])
+    assert agent_model_1.tools is not None and agent_model_2.tools is not None
+    # the same definitions get the same list of mapped tools
+    assert agent_model_1.tools['function_declarations'] is agent_model_2.tools['function_declarations']
+
+    tool.description = 'This is the new foo'
+    agent_model_3 = await m.agent_model(function_tools=[tool], allow_text_result=True, result_tools=[])
+    assert agent_model_3.tools == snapshot(
+        {
+            'function_declarations': [
+                {
+                    'name': 'foo',
+                    'description': 'This is the new foo',
+                    'parameters': {'type': 'object', 'properties': {'bar': {'type': 'number'}}},
+                }
+            ]
+        }
+    )
+
+
 async def test_require_response_tool(allow_model_requests: None):
     m = GeminiModel('gemini-1.5-flash', api_key='via-arg')
     result_tool = ToolDefinition(
@@ -772,6 +800,38 @@ async def test_stream_text_heterogeneous(get_gemini_client: GetGeminiClient):
     assert data == 'Hello foo'
 
 
+@pytest.mark.parametrize('chunk_size', [1, 7, 1000])
+def test_json_array_framer(chunk_size: int):
+    elements: list[dict[str, Any]] = [
+        {'text': 'brackets ] } [ { in a string', 'n': [1, [2, {}]]},
+        {'text': 'escaped \\ and " quotes \\'},
+        {'unicode': 'é'},
+    ]
+    encoded = [json.dumps(e, ensure_ascii=False).encode() for e in elements]
+    data = b'[\n' + b',\r\n'.join(encoded) + b'\n]'
+    framer = _JsonArrayFramer()
+    framed: list[Any] = []
+    for i in range(0, len(data), chunk_size):
+        framed.extend(json.loads(e) for e in framer.feed(data[i : i + chunk_size]))
+        # only the bytes of the element being received are kept
+        assert len(framer._buffer) <= max(map(len, encoded)) + chunk_size
+    assert framed == elements
+    assert framer.feed(b'') == []
+
+
+async def test_stream_responses_as_completed(get_gemini_client: GetGeminiClient):
+    responses = [gemini_response(_content_model_response(ModelResponse.from_text(f'{i} '))) for i in range(100)]
+    json_data = _gemini_streamed_response_ta.dump_json(responses, by_alias=True)
+    stream = AsyncByteStreamList([json_data[i : i + 50] for i in range(0, len(json_data), 50)])
+    m = GeminiModel('gemini-1.5-flash', http_client=get_gemini_client(stream))
+    agent = Agent(m)
+
+    async with agent.run_stream('Hello') as result:
+        chunks = [chunk async for chunk in result.stream_text(delta=True, debounce_by=None)]
+    assert chunks == [f'{i} ' for i in range(100)]
+    assert result.usage().response_tokens == 200
+
+
 async def test_empty_text_ignored():
     content = _content_model_response(
         ModelResponse(
@@ -0,0 +1,208 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent, AllModelsFailed, UserError
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.hedged import HedgedModel, ModelStats
+
+pytestmark = pytest.mark.anyio
+
+
+class DelayedModel:
+    """Function model implementations which respond after a delay, or fail."""
+
+    def __init__(self, name: str, delay: float = 0, error: bool = False):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.requests = 0
+        self.cancelled = 0
+
+    async def _wait(self) -> None:
+        self.requests += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise RuntimeError(f'{self.name} failed')
+
+    async def function(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await self._wait()
+        return ModelResponse.from_text(f'response from {self.name}')
+
+    async def stream_function(self, messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        await self._wait()
+        yield 'streamed '
+        yield f'response from {self.name}'
+
+    def model(self) -> FunctionModel:
+        return FunctionModel(self.function, stream_function=self.stream_function)
+
+
+async def test_primary_responds():
+    primary, backup = DelayedModel('primary'), DelayedModel('backup')
+    model = HedgedModel(primary.model(), backup.model())
+    agent = Agent(model)
+
+    assert (await agent.run('Hello')).data == snapshot('response from primary')
+    assert (primary.requests, backup.requests) == (1, 0)
+    assert len(model.stats[0].latencies) == 1
+    assert list(model.stats[0].outcomes) == [True]
+
+
+async def test_hedged_request():
+    primary, backup = DelayedModel('primary', delay=10), DelayedModel('backup')
+    model = HedgedModel(primary.model(), backup.model(), default_hedge_delay=0.01)
+    agent = Agent(model)
+
+    assert (await agent.run('Hello')).data == snapshot('response from backup')
+    assert (primary.requests, primary.cancelled, backup.requests) == (1, 1, 1)
+    # the cancelled request's latency was at least the time until it was cancelled
+    assert list(model.stats[0].latencies) == []
+    assert model.stats[0].lower_bounds[0] >= 0.01
+    assert list(model.stats[0].outcomes) == []
+    # the backup is faster, so it becomes the primary
+    assert model.ranked() == [1, 0]
+
+
+async def test_backup_loses():
+    primary, backup = DelayedModel('primary', delay=0.05), DelayedModel('backup', delay=10)
+    model = HedgedModel(primary.model(), backup.model(), min_samples=1, window=2)
+    model.stats[0].latencies.append(0.01)
+    model.stats[1].latencies.append(0.5)
+    agent = Agent(model)
+
+    for _ in range(3):
+        assert (await agent.run('Hello')).data == snapshot('response from primary')
+    assert backup.requests == backup.cancelled >= 1
+    # the backup was cancelled sooner than the primary responded, so that isn't recorded as its latency
+    assert list(model.stats[1].latencies) == [0.5]
+    assert list(model.stats[1].lower_bounds) == []
+    assert model.ranked() == [0, 1]
+
+
+async def test_caller_cancels():
+    primary = DelayedModel('primary', delay=10)
+    model = HedgedModel(primary.model(), 'test')
+    agent = Agent(model)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(agent.run('Hello'), timeout=0.01)
+    assert primary.cancelled == 1
+    assert (list(model.stats[0].latencies), list(model.stats[0].lower_bounds)) == ([], [])
+
+
+async def test_fallback():
+    primary, backup = DelayedModel('primary', error=True), DelayedModel('backup')
+    model = HedgedModel(primary.model(), backup.model(), default_hedge_delay=10)
+    agent = Agent(model)
+
+    assert (await agent.run('Hello')).data == snapshot('response from backup')
+    assert model.stats[0].error_rate == 1
+    assert model.ranked() == [1, 0]
+
+    assert (await agent.run('Hello')).data == snapshot('response from backup')
+    assert (primary.requests, backup.requests) == (1, 2)
+
+
+async def test_all_failed():
+    models = [DelayedModel('a', error=True), DelayedModel('b', error=True, delay=0.01)]
+    agent = Agent(HedgedModel(*(m.model() for m in models)))
+
+    with pytest.raises(AllModelsFailed) as exc_info:
+        await agent.run('Hello')
+    assert str(exc_info.value) == snapshot("All models failed: RuntimeError('a failed'), RuntimeError('b failed')")
+    assert len(exc_info.value.errors) == 2
+
+
+async def test_failure_while_hedging():
+    """A failure with no models left to try waits for the requests still in progress."""
+    primary, backup = DelayedModel('primary', delay=0.05), DelayedModel('backup', error=True)
+    agent = Agent(HedgedModel(primary.model(), backup.model(), default_hedge_delay=0.01))
+
+    assert (await agent.run('Hello')).data == snapshot('response from primary')
+    assert (primary.cancelled, backup.requests) == (0, 1)
+
+
+async def test_failure_alongside_winner():
+    """A failure finishing at the same time as the winning request is still recorded."""
+    finished = asyncio.Event()
+
+    async def fail(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await finished.wait()
+        raise RuntimeError('primary failed')
+
+    async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await finished.wait()
+        return ModelResponse.from_text('response from backup')
+
+    model = HedgedModel(FunctionModel(fail), FunctionModel(respond), default_hedge_delay=0.01)
+    asyncio.get_running_loop().call_later(0.05, finished.set)
+
+    assert (await Agent(model).run('Hello')).data == snapshot('response from backup')
+    assert list(model.stats[0].outcomes) == [False]
+    assert list(model.stats[1].outcomes) == [True]
+
+
+async def test_hedged_stream():
+    primary, backup = DelayedModel('primary', delay=10), DelayedModel('backup')
+    model = HedgedModel(primary.model(), backup.model(), default_hedge_delay=0.01)
+    agent = Agent(model)
+
+    async with agent.run_stream('Hello') as result:
+        assert [c async for c in result.stream_text(debounce_by=None)] == snapshot(
+            ['streamed ', 'streamed response from backup']
+        )
+    assert (primary.cancelled, backup.requests) == (1, 1)
+
+
+async def test_stream_fallback():
+    primary, backup = DelayedModel('primary', error=True), DelayedModel('backup')
+    agent = Agent(HedgedModel(primary.model(), backup.model()))
+
+    async with agent.run_stream('Hello') as result:
+        assert await result.get_data() == snapshot('streamed response from backup')
+
+    backup.error = True
+    with pytest.raises(AllModelsFailed):
+        async with agent.run_stream('Hello'):
+            pass
+
+
+def test_ranking():
+    model = HedgedModel('test', 'test', 'test', min_samples=3)
+    # models without statistics keep their order
+    assert model.ranked() == [0, 1, 2]
+    assert model.hedge_delay(0) == 2.0
+
+    model.stats[0].latencies.extend([0.1, 0.2, 0.3])
+    model.stats[1].latencies.extend([0.1, 0.1, 0.1])
+    model.stats[1].outcomes.extend([True, False, False, False])
+    assert model.ranked() == [2, 0, 1]
+    assert model.hedge_delay(0) == 0.3
+
+
+def test_model_stats():
+    stats = ModelStats(window=20)
+    assert stats.latency_quantile(0.95) is None
+    assert stats.error_rate == 0
+
+    stats.latencies.extend(i / 10 for i in range(1, 31))
+    assert len(stats.latencies) == 20
+    assert stats.latency_quantile(0.5) == snapshot(2.0)
+    assert stats.latency_quantile(0.95) == snapshot(2.9)
+    assert stats.latency_quantile(1) == snapshot(3.0)
+
+
+def test_name():
+    assert HedgedModel('test', 'test').name() == 'hedged:test-model,test-model'
+    with pytest.raises(UserError, match='At least one model is required'):
+        HedgedModel()
@@ -0,0 +1,121 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from pydantic_ai.models import cached_async_http_client
+from pydantic_ai.models.http_pool import HTTPPoolRegistry, PoolLimits, default_registry
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def server_url() -> AsyncIterator[str]:
+    """A minimal HTTP/1.1 server with keep-alive, requests to `/slow` take 50ms."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line, *_ = (await reader.readuntil(b'\r\n\r\n')).split(b'\r\n')
+                method, path, _ = request_line.split(b' ')
+                if path == b'/slow':
+                    await asyncio.sleep(0.05)
+                body = b'' if method == b'HEAD' else b'ok'
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n' + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f'http://127.0.0.1:{port}'
+    server.close()
+    await server.wait_closed()
+
+
+async def test_pool_per_host_and_loop():
+    registry = HTTPPoolRegistry(hosts={'b': PoolLimits(http2=False, max_connections=1)})
+    pool = registry.pool('a')
+    assert registry.pool('a') is pool
+    assert registry.pool('b') is not pool
+
+    async def get_pool() -> httpx.AsyncHTTPTransport:
+        return registry.pool('a')
+
+    # event loops in other threads get their own pools
+    other_pool = await asyncio.to_thread(asyncio.run, get_pool())
+    assert other_pool is not pool
+
+
+async def test_wait_time(server_url: str):
+    registry = HTTPPoolRegistry(hosts={'127.0.0.1': PoolLimits(max_connections=1)})
+    async with httpx.AsyncClient(transport=registry) as client:
+        responses = await asyncio.gather(*(client.get(f'{server_url}/slow') for _ in range(3)))
+        assert [r.text for r in responses] == ['ok', 'ok', 'ok']
+
+        metrics = registry.metrics('127.0.0.1')
+        assert (metrics.pools, metrics.connections_in_use, metrics.connections_idle) == (1, 0, 1)
+        assert (metrics.requests, metrics.requests_waiting) == (3, 0)
+        # the last request waited for both the others
+        assert metrics.max_wait_time >= 0.09
+        assert 0 < metrics.mean_wait_time < metrics.max_wait_time
+
+    # closing the client closes the pools
+    assert registry.metrics('127.0.0.1').pools == 0
+
+
+async def test_connections_in_use(server_url: str):
+    registry = HTTPPoolRegistry()
+    client = httpx.AsyncClient(transport=registry)
+    async with client.stream('GET', f'{server_url}/slow') as response:
+        metrics = registry.metrics('127.0.0.1')
+        assert (metrics.connections_in_use, metrics.connections_idle) == (1, 0)
+        await response.aread()
+    assert registry.metrics('127.0.0.1').connections_idle == 1
+    await registry.aclose()
+
+
+async def test_failed_request():
+    registry = HTTPPoolRegistry()
+    # nothing is listening on port 1
+    with pytest.raises(httpx.ConnectError):
+        async with httpx.AsyncClient(transport=registry) as client:
+            await client.get('http://127.0.0.1:1/')
+    assert registry.metrics('127.0.0.1').requests_waiting == 0
+
+
+async def test_prewarm(server_url: str):
+    registry = HTTPPoolRegistry()
+    await registry.prewarm(server_url, 3)
+    assert registry.metrics('127.0.0.1').connections_idle == 3
+
+    traced: list[str] = []
+
+    async def trace(event_name: str, info: object) -> None:
+        traced.append(event_name)
+
+    # requests reuse the connections, and the trace extension still works
+    async with httpx.AsyncClient(transport=registry) as client:
+        await client.get(server_url, extensions={'trace': trace})
+    assert 'connection.connect_tcp.started' not in traced
+    assert 'http11.send_request_headers.started' in traced
+
+
+async def test_cached_client_in_threads(server_url: str):
+    """The cached client works from several threads, each running its own event loop."""
+    client = cached_async_http_client()
+    assert client._transport is default_registry  # pyright: ignore[reportPrivateUsage]
+
+    async def get() -> str:
+        return (await client.get(server_url)).text
+
+    def run_twice() -> list[str]:
+        return [asyncio.run(get()), asyncio.run(get())]
+
+    results = await asyncio.gather(*(asyncio.to_thread(run_twice) for _ in range(3)))
+    assert results == [['ok', 'ok']] * 3
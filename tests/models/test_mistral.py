@@ -4,7 +4,7 @@ import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import cached_property
-from typing import Any, cast
+from typing import Any, Union, cast
 
 import pytest
 from inline_snapshot import snapshot
@@ -51,7 +51,7 @@ with try_import() as imports_successful:
     from pydantic_ai.models.mistral import (
         MistralAgentModel,
         MistralModel,
-        MistralStreamedResponse,
+        _required_fields_checker,  # pyright: ignore[reportPrivateUsage]
     )
 
 pytestmark = [
@@ -930,6 +930,82 @@ async def test_stream_result_type_basemodel_with_default_params(allow_model_requ
         assert result.usage().response_tokens == len(stream)
 
 
+async def test_stream_result_args_streamed_as_json(allow_model_requests: None):
+    class MyTypedBaseModel(BaseModel):
+        items: list[str]
+
+    # Given
+    text = json.dumps({'items': [f'item {i}' for i in range(100)]})
+    stream = [text_chunk(text[i : i + 5]) for i in range(0, len(text), 5)] + [chunk([])]
+
+    mock_client = MockMistralAI.create_stream_mock(stream)
+    model = MistralModel('mistral-large-latest', client=mock_client)
+    agent = Agent(model=model, result_type=MyTypedBaseModel)
+
+    # When
+    async with agent.run_stream('User prompt value') as result:
+        # Then
+        v = [c async for c in result.stream(debounce_by=None)]
+        assert v[0] == MyTypedBaseModel(items=['ite'])
+        assert v[-1] == MyTypedBaseModel(items=[f'item {i}' for i in range(100)])
+
+    # the text received after the result tool was found is added to its arguments, rather than reparsed
+    response = result.all_messages()[-2]
+    assert isinstance(response, ModelResponse)
+    assert response.parts == [ToolCallPart(tool_name='final_result', args=ArgsJson(args_json=text), tool_call_id=None)]
+
+
+async def test_stream_result_tool_kept(allow_model_requests: None):
+    """The first result tool matching the arguments is kept, even if a tool listed before it matches later."""
+
+    class WithScore(BaseModel):
+        name: str
+        score: int
+
+    class NameOnly(BaseModel):
+        name: str
+
+    # Given
+    stream = [text_chunk('{"name": "x'), text_chunk('", "score'), text_chunk('": 1}'), chunk([])]
+
+    mock_client = MockMistralAI.create_stream_mock(stream)
+    model = MistralModel('mistral-large-latest', client=mock_client)
+    agent = Agent(model=model, result_type=Union[WithScore, NameOnly])  # type: ignore[arg-type]
+
+    # When
+    async with agent.run_stream('User prompt value') as result:
+        # Then
+        v = [c async for c in result.stream(debounce_by=None)]
+        assert v[0] == v[-1] == NameOnly(name='x')
+        assert result.is_complete
+
+    response = result.all_messages()[-2]
+    assert isinstance(response, ModelResponse)
+    assert response.parts == [
+        ToolCallPart(tool_name='final_result_NameOnly', args=ArgsJson(args_json='{"name": "x", "score": 1}'))
+    ]
+
+
+async def test_stream_result_type_basemodel_without_content(allow_model_requests: None):
+    class MyTypedBaseModel(BaseModel):
+        first: str = ''
+        second: str = ''
+
+    # Given
+    stream = [text_chunk('{"first"'), text_chunk(': ""'), text_chunk('}'), chunk([])]
+
+    mock_client = MockMistralAI.create_stream_mock(stream)
+    model = MistralModel('mistral-large-latest', client=mock_client)
+    agent = Agent(model=model, result_type=MyTypedBaseModel)
+
+    # When
+    async with agent.run_stream('User prompt value') as result:
+        # Then
+        v = [c async for c in result.stream(debounce_by=None)]
+        assert v == snapshot([MyTypedBaseModel(first='', second=''), MyTypedBaseModel(first='', second='')])
+        assert result.is_complete
+
+
 async def test_stream_result_type_basemodel_with_required_params(allow_model_requests: None):
     class MyTypedBaseModel(BaseModel):
         first: str  # Note: Required params
@@ -1740,5 +1816,5 @@ def test_generate_user_output_format_multiple():
     ],
 )
 def test_validate_required_json_schema(desc: str, schema: dict[str, Any], data: dict[str, Any], expected: bool) -> None:
-    result = MistralStreamedResponse._validate_required_json_schema(data, schema)  # pyright: ignore[reportPrivateUsage]
+    result = _required_fields_checker(schema)(data)
     assert result == expected, f'{desc} — expected {expected}, got {result}'
@@ -1,7 +1,7 @@
 from __future__ import annotations as _annotations
 
 import json
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import cached_property
@@ -13,6 +13,7 @@ from typing_extensions import TypedDict
 
 from pydantic_ai import Agent, ModelRetry, UnexpectedModelBehavior
 from pydantic_ai.messages import (
+    ModelMessage,
     ModelRequest,
     ModelResponse,
     RetryPromptPart,
@@ -40,7 +41,7 @@ with try_import() as imports_successful:
     from openai.types.chat.chat_completion_message_tool_call import Function
     from openai.types.completion_usage import CompletionUsage, PromptTokensDetails
 
-    from pydantic_ai.models.openai import OpenAIModel
+    from pydantic_ai.models.openai import OpenAIAgentModel, OpenAIModel
 
 pytestmark = [
     pytest.mark.skipif(not imports_successful(), reason='openai not installed'),
@@ -320,6 +321,61 @@ async def test_request_tool_call(allow_model_requests: None):
     )
 
 
+async def test_message_mapping_cached(allow_model_requests: None, monkeypatch: pytest.MonkeyPatch):
+    mapped: list[ModelMessage] = []
+    map_message = OpenAIAgentModel._map_message  # pyright: ignore[reportPrivateUsage]
+
+    def counting_map_message(message: ModelMessage) -> Iterable[chat.ChatCompletionMessageParam]:
+        mapped.append(message)
+        return map_message(message)
+
+    monkeypatch.setattr(OpenAIAgentModel, '_map_message', staticmethod(counting_map_message))
+
+    responses = [
+        completion_message(
+            ChatCompletionMessage(
+                content=None,
+                role='assistant',
+                tool_calls=[
+                    chat.ChatCompletionMessageToolCall(
+                        id='1', function=Function(arguments='{}', name='get_location'), type='function'
+                    )
+                ],
+            )
+        ),
+        completion_message(ChatCompletionMessage(content='first response', role='assistant')),
+        completion_message(ChatCompletionMessage(content='second response', role='assistant')),
+    ]
+    m = OpenAIModel('gpt-4', openai_client=MockOpenAI.create_mock(responses))
+    agent = Agent(m)
+    prompt_runs = 0
+
+    @agent.system_prompt(dynamic=True)
+    def dynamic_prompt() -> str:
+        nonlocal prompt_runs
+        prompt_runs += 1
+        return f'prompt {prompt_runs}'
+
+    @agent.tool_plain
+    def get_location() -> str:
+        return 'London'
+
+    result = await agent.run('Hello')
+    assert result.data == 'first response'
+    # each message is only mapped once across the two steps of the run
+    assert mapped == result.all_messages()[:3]
+
+    mapped.clear()
+    result = await agent.run('Again', message_history=result.all_messages())
+    assert result.data == 'second response'
+    # the first request is mapped again since its dynamic system prompt was reevaluated, the messages which weren't
+    # sent in the first run are mapped, everything else is reused
+    messages = result.all_messages()
+    first_request = messages[0]
+    assert mapped == [first_request, *messages[3:5]]
+    assert first_request.parts[0] == SystemPromptPart(content='prompt 2', dynamic_ref=dynamic_prompt.__qualname__)
+
+
 FinishReason = Literal['stop', 'length', 'tool_calls', 'content_filter', 'function_call']
 
 
@@ -0,0 +1,171 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+from inline_snapshot import snapshot
+from pytest_mock import MockerFixture
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage, ModelRequest, UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.rate_limited import (
+    RateLimit,
+    RateLimitedModel,
+    RequestScheduler,
+    SchedulingPriority,
+    estimate_tokens,
+)
+from pydantic_ai.models.test import TestModel
+from pydantic_ai.usage import Usage
+
+from ..conftest import IsFloat
+
+pytestmark = pytest.mark.anyio
+
+
+@dataclass
+class VirtualClock:
+    now: float = 0
+
+
+@pytest.fixture
+async def virtual_clock(mocker: MockerFixture) -> VirtualClock:
+    """Fire the scheduler's timers straight away, advancing a fake clock by their delay, so waits take no real time."""
+    clock = VirtualClock()
+    mocker.patch('pydantic_ai.models.rate_limited.time.monotonic', side_effect=lambda: clock.now)
+    loop = asyncio.get_running_loop()
+
+    def call_later(delay: float, callback: Any, *args: Any, context: Any = None) -> asyncio.Handle:
+        clock.now += delay
+        return loop.call_soon(callback, *args, context=context)
+
+    mocker.patch.object(loop, 'call_later', side_effect=call_later)
+    return clock
+
+
+async def test_priority_and_fairness():
+    # one request at a time, every 10ms
+    scheduler = RequestScheduler(RateLimit(requests_per_minute=6000, burst_seconds=0.01))
+    order: list[str] = []
+
+    async def request(name: str, priority: SchedulingPriority, tenant: str) -> None:
+        await scheduler.acquire('model', priority=priority, tenant=tenant)
+        order.append(name)
+
+    await request('first', 'interactive', 'a')
+    tasks = [
+        asyncio.create_task(request('batch a1', 'batch', 'a')),
+        asyncio.create_task(request('a1', 'interactive', 'a')),
+        asyncio.create_task(request('a2', 'interactive', 'a')),
+        asyncio.create_task(request('a3', 'interactive', 'a')),
+        asyncio.create_task(request('b1', 'interactive', 'b')),
+        asyncio.create_task(request('b2', 'interactive', 'b')),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.metrics('model').queue_depth == 6
+
+    await asyncio.gather(*tasks)
+    assert order == snapshot(['first', 'a1', 'b1', 'a2', 'b2', 'a3', 'batch a1'])
+
+    metrics = scheduler.metrics('model')
+    assert metrics.queue_depth == 0
+    assert metrics.requests == 7
+    assert metrics.max_wait_time >= 0.05
+    assert 0 < metrics.mean_wait_time < metrics.max_wait_time
+
+
+async def test_models_limited_separately():
+    scheduler = RequestScheduler(
+        RateLimit(requests_per_minute=1), limits={'unlimited': RateLimit(tokens_per_minute=None)}
+    )
+    await scheduler.acquire('a')
+    await scheduler.acquire('b')
+    for _ in range(10):
+        await scheduler.acquire('unlimited')
+
+    # the limit of 'a' is reached
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(scheduler.acquire('a'), timeout=0.01)
+    assert scheduler.metrics('a').queue_depth == 0
+    assert scheduler.metrics('unlimited').requests == 10
+
+
+async def test_cancelled_waiter():
+    scheduler = RequestScheduler(RateLimit(requests_per_minute=6000, burst_seconds=0.01))
+    await scheduler.acquire('model')
+
+    cancelled = asyncio.create_task(scheduler.acquire('model'))
+    waiting = asyncio.create_task(scheduler.acquire('model'))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await waiting
+    assert cancelled.cancelled()
+    metrics = scheduler.metrics('model')
+    assert (metrics.queue_depth, metrics.requests) == (0, 2)
+
+
+async def test_token_limit_reconciled():
+    # the bucket holds 100 tokens, refilled at 1000 per second
+    scheduler = RequestScheduler(RateLimit(tokens_per_minute=60000, burst_seconds=0.1))
+    await scheduler.acquire('model', 100)
+    scheduler.reconcile('model', 100, Usage(request_tokens=10, response_tokens=5))
+    # the unused tokens are returned, so the next request doesn't have to wait
+    await asyncio.wait_for(scheduler.acquire('model', 50), timeout=0.005)
+
+    # a request larger than the bucket waits for it to be full, then leaves it in debt
+    await scheduler.acquire('model', 200)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(scheduler.acquire('model', 1), timeout=0.05)
+
+    metrics = scheduler.metrics('model')
+    assert (metrics.estimated_tokens, metrics.tokens) == (350, 15)
+
+
+async def test_rate_limited_model():
+    scheduler = RequestScheduler()
+    agent = Agent(RateLimitedModel(TestModel(), scheduler, priority='batch', tenant='a'))
+
+    result = await agent.run('Hello')
+    assert result.data == snapshot('success (no tool calls)')
+    async with agent.run_stream('Hello') as stream:
+        await stream.get_data()
+
+    metrics = scheduler.metrics('test-model')
+    assert metrics.requests == 2
+    assert metrics.tokens == (result.usage() + stream.usage()).total_tokens
+    assert metrics.estimated_tokens > 0
+
+
+async def test_rate_limited_model_waits(virtual_clock: VirtualClock):
+    # one request at a time, every 100ms
+    scheduler = RequestScheduler(RateLimit(requests_per_minute=600, burst_seconds=0.1))
+
+    async def stream_function(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        yield 'hello'
+
+    agent = Agent(RateLimitedModel(FunctionModel(stream_function=stream_function), scheduler))
+
+    async def run() -> None:
+        async with agent.run_stream('Hello') as result:
+            await result.get_data()
+
+    await asyncio.gather(*(run() for _ in range(3)))
+    metrics = scheduler.metrics('function:stream-stream_function')
+    assert metrics.requests == 3
+    # the second and third requests each waited for the bucket to refill
+    assert virtual_clock.now == IsFloat(approx=0.2)
+    assert metrics.max_wait_time > 0
+
+
+def test_estimate_tokens():
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart('Hello ' * 100)])]
+    assert estimate_tokens(messages, [], None) == snapshot(178)
+    assert estimate_tokens(messages, [], {'max_tokens': 100}) == snapshot(278)
+
+
+def test_name():
+    assert RateLimitedModel('test', RequestScheduler()).name() == 'test-model'
@@ -1,4 +1,7 @@
+import asyncio
+import functools
 import json
+import operator
 import re
 import sys
 from datetime import timezone
@@ -6,7 +9,7 @@ from typing import Any, Callable, Union
 
 import httpx
 import pytest
-from dirty_equals import IsJson
+from dirty_equals import IsInstance, IsJson
 from inline_snapshot import snapshot
 from pydantic import BaseModel, field_validator
 from pydantic_core import to_json
@@ -1417,6 +1420,77 @@ def test_dynamic_true_reevaluate_system_prompt(set_event_loop: None):
     )
 
 
+def test_system_prompt_cache_ttl(set_event_loop: None):
+    agent = Agent('test', deps_type=str)
+    calls: list[str] = []
+
+    @agent.system_prompt(cache_ttl=60)
+    def cached() -> str:
+        calls.append('cached')
+        return 'template'
+
+    @agent.system_prompt(cache_ttl=60, cache_by_deps=True)
+    def cached_by_deps(ctx: RunContext[str]) -> str:
+        calls.append(f'cached_by_deps {ctx.deps}')
+        return f'config for {ctx.deps}'
+
+    @agent.system_prompt(cache_ttl=0)
+    def expires_immediately() -> str:
+        calls.append('expires_immediately')
+        return 'fresh'
+
+    for deps in 'a', 'b', 'a':
+        result = agent.run_sync('Hello', deps=deps)
+        assert result.all_messages()[0].parts[:3] == [
+            SystemPromptPart('template'),
+            SystemPromptPart(f'config for {deps}'),
+            SystemPromptPart('fresh'),
+        ]
+    assert calls == [
+        'cached',
+        'cached_by_deps a',
+        'expires_immediately',
+        'cached_by_deps b',
+        'expires_immediately',
+        'expires_immediately',
+    ]
+
+
+def test_dynamic_prompts_index(set_event_loop: None):
+    agent = Agent('test')
+    dynamic_value = 'A'
+
+    @agent.system_prompt(dynamic=True)
+    async def func():
+        return dynamic_value
+
+    messages = agent.run_sync('Hello').all_messages()
+    for value in 'B', 'C':
+        dynamic_value = value
+        messages = agent.run_sync('Hello', message_history=messages).all_messages()
+        assert messages[0].parts[0] == SystemPromptPart(value, dynamic_ref=func.__qualname__)
+
+    # a dynamic part added to a history which was indexed is found
+    messages.append(ModelRequest(parts=[SystemPromptPart('old', dynamic_ref=func.__qualname__)]))
+    dynamic_value = 'D'
+    messages = agent.run_sync('Hello', message_history=messages).all_messages()
+    assert [p.content for m in messages for p in m.parts if isinstance(p, SystemPromptPart)] == ['D', 'D']
+
+    # a history shorter than the one indexed is scanned again
+    messages = messages[:2] + [ModelRequest(parts=[SystemPromptPart('old', dynamic_ref=func.__qualname__)])]
+    dynamic_value = 'E'
+    messages = agent.run_sync('Hello', message_history=messages).all_messages()
+    assert [p.content for m in messages for p in m.parts if isinstance(p, SystemPromptPart)] == ['E', 'E']
+
+    # a history with an indexed message replaced in the middle is scanned again
+    messages = agent.run_sync('Hello', message_history=messages).all_messages()
+    assert isinstance(messages[2].parts[0], SystemPromptPart)
+    messages[2] = ModelRequest(parts=[UserPromptPart('Hi'), SystemPromptPart('old', dynamic_ref=func.__qualname__)])
+    dynamic_value = 'F'
+    messages = agent.run_sync('Hello', message_history=messages).all_messages()
+    assert [p.content for m in messages for p in m.parts if isinstance(p, SystemPromptPart)] == ['F', 'F']
+
+
 def test_capture_run_messages_tool_agent(set_event_loop: None) -> None:
     agent_outer = Agent('test')
     agent_inner = Agent(TestModel(custom_result_text='inner agent result'))
@@ -1475,6 +1549,25 @@ async def test_custom_result_type_async() -> None:
     assert result.data == snapshot(0)
 
 
+async def test_custom_result_type_cached() -> None:
+    result_tools: list[ToolDefinition] = []
+
+    def return_model(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        result_tools.extend(info.result_tools)
+        return ModelResponse(parts=[ToolCallPart.from_raw_args(info.result_tools[0].name, {'c': 1, 'd': 'x'})])
+
+    agent = Agent(FunctionModel(return_model), result_type=Foo)
+    for _ in range(2):
+        result = await agent.run('Hello', result_type=Bar)
+        assert result.data == Bar(c=1, d='x')
+    # the schema is shared between runs, and agents with the same result tool name and description
+    await Agent(FunctionModel(return_model)).run('Hello', result_type=Bar)
+    await Agent(FunctionModel(return_model), result_tool_name='bar').run('Hello', result_type=Bar)
+    assert result_tools[0] is result_tools[1] is result_tools[2]
+    assert result_tools[3] is not result_tools[0]
+    assert result_tools[3].name == 'bar'
+
+
 def test_custom_result_type_invalid(set_event_loop: None) -> None:
     agent = Agent('test')
 
@@ -1484,3 +1577,101 @@ def test_custom_result_type_invalid(set_event_loop: None) -> None:
 
     with pytest.raises(UserError, match='Cannot set a custom run `result_type` when the agent has result validators'):
         agent.run_sync('Hello', result_type=int)
+
+
+async def test_run_many():
+    running = 0
+    max_running = 0
+
+    async def llm(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        user_prompt = messages[0].parts[-1]
+        assert isinstance(user_prompt, UserPromptPart)
+        # finish later prompts first, so completion order differs from prompt order
+        await asyncio.sleep(0.01 / len(user_prompt.content))
+        running -= 1
+        return ModelResponse.from_text(user_prompt.content.upper())
+
+    agent = Agent(FunctionModel(llm))
+    prompts = ['a' * i for i in range(1, 11)]
+    usage = Usage()
+
+    results = await agent.run_many(prompts, max_concurrency=3, usage=usage)
+    assert [r.data for r in results] == [p.upper() for p in prompts]
+    assert max_running == 3
+    assert usage.requests == 10
+    assert usage == functools.reduce(operator.add, (r.usage() for r in results))
+
+
+async def test_run_many_as_completed():
+    async def llm(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        user_prompt = messages[0].parts[-1]
+        assert isinstance(user_prompt, UserPromptPart)
+        await asyncio.sleep(0.01 / int(user_prompt.content))
+        return ModelResponse.from_text(user_prompt.content)
+
+    agent = Agent(FunctionModel(llm))
+
+    async with agent.run_many_as_completed(['1', '2', '4']) as completed:
+        assert [(index, r.data) async for index, r in completed] == snapshot([(2, '4'), (1, '2'), (0, '1')])
+
+
+async def test_run_many_exceptions():
+    started: list[str] = []
+
+    async def llm(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        user_prompt = messages[0].parts[-1]
+        assert isinstance(user_prompt, UserPromptPart)
+        started.append(user_prompt.content)
+        if user_prompt.content == 'fail':
+            raise RuntimeError('model failed')
+        await asyncio.sleep(0)
+        return ModelResponse.from_text(user_prompt.content)
+
+    agent = Agent(FunctionModel(llm))
+
+    results = await agent.run_many(['a', 'fail', 'b'], max_concurrency=2, return_exceptions=True)
+    assert [r if isinstance(r, Exception) else r.data for r in results] == ['a', IsInstance(RuntimeError), 'b']
+
+    started.clear()
+    with pytest.raises(RuntimeError, match='model failed'):
+        await agent.run_many(['fail', 'a', 'b', 'c'], max_concurrency=1)
+    # the remaining prompts are never started
+    assert started == ['fail']
+
+    with pytest.raises(UserError, match='`max_concurrency` must be at least 1'):
+        await agent.run_many(['a'], max_concurrency=0)
+
+
+async def test_run_many_base_exception():
+    async def llm(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        user_prompt = messages[0].parts[-1]
+        assert isinstance(user_prompt, UserPromptPart)
+        if user_prompt.content == 'cancel':
+            raise asyncio.CancelledError()
+        await asyncio.sleep(0.01)
+        return ModelResponse.from_text(user_prompt.content)
+
+    agent = Agent(FunctionModel(llm))
+
+    # the worker running the prompt ends, so the batch fails rather than waiting for it forever
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(agent.run_many(['a', 'cancel', 'b'], max_concurrency=2, return_exceptions=True), 5)
+
+
+async def test_concurrent_runs_tool_retries():
+    """Retries are tracked per run, so many concurrent runs can share one agent."""
+    agent = Agent(TestModel(), deps_type=int)
+
+    @agent.tool(retries=1)
+    async def flaky(ctx: RunContext[int]) -> str:
+        # yield to other runs between checking and raising, so their retries interleave with this one's
+        await asyncio.sleep(0)
+        if ctx.retry == 0:
+            raise ModelRetry(f'try again {ctx.deps}')
+        return f'{ctx.deps} succeeded on retry {ctx.retry}'
+
+    results = await asyncio.gather(*(agent.run('Hello', deps=i) for i in range(500)))
+    assert [r.data for r in results] == [f'{{"flaky":"{i} succeeded on retry 1"}}' for i in range(500)]
@@ -0,0 +1,35 @@
+from __future__ import annotations as _annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.agent_overhead import cases, main
+
+
+def test_cases():
+    keys = [case.key for case in cases()]
+    assert len(keys) == len(set(keys))
+    assert 'tools tools=200' in keys
+    assert 'history messages=500' in keys
+    assert 'concurrent_runs concurrency=1000' in keys
+
+
+def test_output_and_compare(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    output = tmp_path / 'results.json'
+    main(['--quick', '--repeat', '1', '-k', 'run_sync', '--output', str(output)])
+    data = json.loads(output.read_text())
+    assert set(data['metadata']) == {'pydantic_ai_version', 'python_version', 'platform', 'commit', 'timestamp'}
+    (result,) = data['results']
+    assert result['key'] == 'run_sync'
+    assert result['unit'] == 'run'
+    assert result['per_second'] > 0
+    assert result['us_per_step'] == result['us_per_unit']
+
+    main(['--quick', '--repeat', '1', '-k', '_deltas', '--compare', str(output)])
+    out = capsys.readouterr().out
+    assert 'text_deltas' in out
+    assert 'tool_call_deltas' in out
+    # only benchmarks in both runs are compared
+    assert out.split('Compared with')[1].count('\n') == 1
@@ -0,0 +1,159 @@
+from __future__ import annotations as _annotations
+
+import importlib.util
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from pydantic_ai import Agent, RunContext, Tool, UserError
+from pydantic_ai.executors import InlineExecutor, LoopExecutor, ProcessExecutor, ThreadExecutor, default_executor
+from pydantic_ai.models.test import TestModel
+
+pytestmark = pytest.mark.anyio
+
+
+def current_thread() -> str:
+    return threading.current_thread().name
+
+
+async def test_inline_executor():
+    executor = InlineExecutor()
+    agent = Agent(TestModel(), executor=executor)
+    threads: list[str] = []
+
+    @agent.system_prompt
+    def system_prompt() -> str:
+        threads.append(current_thread())
+        return 'system prompt'
+
+    @agent.tool_plain
+    def get_thread() -> str:
+        threads.append(current_thread())
+        return 'thread'
+
+    @agent.result_validator
+    def validate_result(data: str) -> str:
+        threads.append(current_thread())
+        return data
+
+    await agent.run('Hello')
+    assert threads == [current_thread()] * 3
+
+    metrics = executor.metrics()
+    assert (metrics.submitted, metrics.completed, metrics.in_flight) == (3, 3, 0)
+    assert metrics.max_queue_wait < 0.01
+
+
+async def test_default_executor():
+    agent = Agent(TestModel())
+    assert agent.executor is None
+    threads: list[str] = []
+
+    @agent.tool_plain
+    def get_thread() -> str:
+        threads.append(current_thread())
+        return 'thread'
+
+    submitted = default_executor.metrics().submitted
+    await agent.run('Hello')
+    assert threads != [current_thread()]
+    assert default_executor.metrics().submitted == submitted + 1
+    assert isinstance(default_executor, LoopExecutor)
+
+
+async def test_thread_executor_queue_wait():
+    executor = ThreadExecutor(max_workers=1, thread_name_prefix='tools')
+    threads: list[str] = []
+
+    def slow_tool() -> str:
+        threads.append(current_thread())
+        time.sleep(0.05)
+        return 'done'
+
+    agent = Agent(TestModel(), tools=[Tool(slow_tool, name='a'), Tool(slow_tool, name='b')], executor=executor)
+    await agent.run('Hello')
+
+    assert [t.startswith('tools_') for t in threads] == [True, True]
+    metrics = executor.metrics()
+    assert metrics.completed == 2
+    # with a single worker, one tool waited for the other
+    assert metrics.max_queue_wait >= 0.04
+    assert metrics.total_run_time >= 0.1
+    assert 0 < metrics.mean_queue_wait < metrics.max_queue_wait
+    executor.shutdown()
+
+
+async def test_tool_executor():
+    """A tool's executor takes precedence over the agent's."""
+    tool_executor = ThreadExecutor(thread_name_prefix='tool')
+    agent = Agent(TestModel(), executor=InlineExecutor())
+    threads: dict[str, str] = {}
+
+    @agent.tool_plain(executor=tool_executor)
+    def own_executor() -> str:
+        threads['own_executor'] = current_thread()
+        return 'thread'
+
+    @agent.tool
+    def agent_executor(ctx: RunContext[None]) -> str:
+        threads['agent_executor'] = current_thread()
+        return 'thread'
+
+    await agent.run('Hello')
+    assert threads['own_executor'].startswith('tool_')
+    assert threads['agent_executor'] == current_thread()
+    assert tool_executor.metrics().completed == 1
+    tool_executor.shutdown()
+
+
+async def test_executor_exception():
+    executor = ThreadExecutor()
+
+    def fail() -> None:
+        raise ValueError('failed')
+
+    with pytest.raises(ValueError, match='failed'):
+        await executor.run(fail)
+    metrics = executor.metrics()
+    assert (metrics.submitted, metrics.completed, metrics.in_flight) == (1, 1, 0)
+    executor.shutdown()
+
+
+def fibonacci(n: int) -> int:
+    """Get a Fibonacci number, slowly."""
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+def get_pid() -> int:
+    return os.getpid()
+
+
+async def test_process_executor(monkeypatch: pytest.MonkeyPatch):
+    if importlib.util.find_spec('logfire'):
+        # logfire sends its configuration to worker processes, but the test configuration can't be pickled
+        monkeypatch.setattr('logfire._internal.integrations.executors.serialize_config', lambda: None)
+
+    executor = ProcessExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        assert await executor.run(fibonacci, 20) == 6765
+        assert await executor.run(get_pid) != os.getpid()
+
+        agent = Agent(TestModel(), tools=[Tool(fibonacci, executor=executor)])
+        result = await agent.run('Hello')
+        assert result.data == '{"fibonacci":0}'
+        assert executor.metrics().completed == 3
+    finally:
+        executor.shutdown()
+
+
+def test_process_executor_context():
+    def takes_ctx(ctx: RunContext[None]) -> str:
+        return 'hello'
+
+    with pytest.raises(UserError, match="A `ProcessExecutor` can't run functions which take `RunContext`"):
+        Tool(takes_ctx, executor=ProcessExecutor())
+    with pytest.raises(UserError, match="A `ProcessExecutor` can't run functions which take `RunContext`"):
+        Agent(TestModel(), executor=ProcessExecutor())
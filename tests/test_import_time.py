@@ -0,0 +1,55 @@
+"""Check importing PydanticAI's lightweight modules doesn't import its heavy dependencies, using `python -X importtime`."""
+
+from __future__ import annotations as _annotations
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = 'logfire_api', 'logfire', 'httpx', 'griffe', 'pydantic_ai.agent', 'pydantic_ai.tools'
+# a loose budget in microseconds, well above the time these imports take, to catch gross regressions without flaking
+IMPORT_TIME_BUDGET = 1_000_000
+
+
+def import_times(code: str) -> dict[str, int]:
+    """Run `code` in a new process and get the cumulative import time in microseconds of each module imported."""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True, check=True
+    )
+    times: dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('imported package'):
+            _, cumulative, module = line.removeprefix('import time:').split('|')
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    'module,heavy_modules',
+    [
+        ('pydantic_ai', HEAVY_MODULES),
+        ('pydantic_ai.messages', HEAVY_MODULES),
+        ('pydantic_ai.exceptions', HEAVY_MODULES),
+        ('pydantic_ai.models.test', HEAVY_MODULES[:4]),
+        ('pydantic_graph', HEAVY_MODULES[:3]),
+    ],
+)
+def test_lazy_imports(module: str, heavy_modules: tuple[str, ...]):
+    times = import_times(f'import {module}')
+    assert 0 < times[module] < IMPORT_TIME_BUDGET
+    assert [m for m in heavy_modules if m in times] == []
+
+
+def test_lazy_attributes():
+    code = 'import sys\nfrom pydantic_ai import Agent, Tool\nprint(*sorted(sys.modules))'
+    process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    modules = process.stdout.split()
+    assert 'pydantic_ai.agent' in modules
+    assert [m for m in ('logfire_api', 'httpx', 'griffe') if m in modules] == []
+
+    import pydantic_ai
+
+    assert pydantic_ai.Agent.__module__ == 'pydantic_ai.agent'
+    with pytest.raises(AttributeError, match="module 'pydantic_ai' has no attribute 'Missing'"):
+        pydantic_ai.Missing
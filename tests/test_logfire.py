@@ -108,6 +108,8 @@ def test_logfire(get_logfire_summary: Callable[[], LogfireSummary], set_event_lo
                     },
                     'name': 'my_agent',
                     'end_strategy': 'early',
+                    'eager_tool_execution': False,
+                    'executor': None,
                     'model_settings': None,
                 }
             ),
@@ -0,0 +1,72 @@
+from __future__ import annotations as _annotations
+
+import pytest
+from pydantic_core import from_json
+
+from pydantic_ai._partial_json import PartialJsonParser
+
+DOCUMENTS = [
+    '{"a": 12, "b": [1, {"c": "x\\"y\\u00e9\\\\"}, true, false, null, -1.5e3], "d": {}, "e": [], "f": ""}',
+    ' [ 1 , "a" , { "b" : [ false ] } ] ',
+    '"abc"',
+    '123',
+]
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('chunk_size', [1, 3, 1000])
+def test_partial_value_matches_from_json(document: str, chunk_size: int):
+    parser = PartialJsonParser()
+    for end in range(chunk_size, len(document) + chunk_size, chunk_size):
+        parser.feed(document[end - chunk_size : end])
+        text = document[:end]
+        try:
+            expected = from_json(text, allow_partial='trailing-strings')
+        except ValueError:
+            # e.g. only whitespace has been received
+            expected = None
+        assert parser.partial_value() == expected, text
+
+
+def test_partial_value_updated_in_place():
+    parser = PartialJsonParser()
+    parser.feed('{"items": [{"name": "a"}, {"na')
+    value = parser.partial_value()
+    assert value == {'items': [{'name': 'a'}, {}]}
+    parser.feed('me": "b')
+    assert parser.partial_value() is value
+    assert value == {'items': [{'name': 'a'}, {'name': 'b'}]}
+    # an incomplete value is only added by `partial_value`, until more of the document is parsed
+    parser.feed('c"}], "count": 1')
+    assert value == {'items': [{'name': 'a'}, {'name': 'bc'}]}
+    assert parser.partial_value() == {'items': [{'name': 'a'}, {'name': 'bc'}], 'count': 1}
+    parser.feed('0}')
+    assert value == {'items': [{'name': 'a'}, {'name': 'bc'}], 'count': 10}
+
+
+def test_incomplete_tail_omitted():
+    parser = PartialJsonParser()
+    parser.feed('{"a": "x\\')
+    assert parser.partial_value() == {}
+    parser.feed('n", "b": tr')
+    assert parser.partial_value() == {'a': 'x\n'}
+    parser.feed('ue, "c": 1.')
+    assert parser.partial_value() == {'a': 'x\n', 'b': True}
+
+
+def test_content_after_document_ignored():
+    parser = PartialJsonParser()
+    parser.feed('{"a": 1')
+    assert not parser.complete
+    parser.feed('} and some ')
+    assert parser.complete
+    parser.feed('text')
+    assert parser.partial_value() == {'a': 1}
+
+
+@pytest.mark.parametrize('document', ['{"a" 1}', '{"a": tru}', '[1,]', '{,}', '{"a": 01}', '{"a": "\\x"}'])
+def test_invalid_json(document: str):
+    parser = PartialJsonParser()
+    with pytest.raises(ValueError):
+        for char in document:
+            parser.feed(char)
@@ -78,6 +78,30 @@ def test_handle_dovetailed_text_deltas():
     )
 
 
+def test_handle_many_text_deltas():
+    manager = ModelResponsePartsManager()
+    start_event = manager.handle_text_delta(vendor_part_id='content', content='0 ')
+    events = [manager.handle_text_delta(vendor_part_id='content', content=f'{i} ') for i in range(1, 1000)]
+
+    assert start_event == PartStartEvent(index=0, part=TextPart(content='0 '))
+    assert events[-1] == PartDeltaEvent(index=0, delta=TextPartDelta(content_delta='999 '))
+    expected = ''.join(f'{i} ' for i in range(1000))
+    assert manager.get_parts() == [TextPart(content=expected)]
+
+    # deltas after the parts are requested are applied the next time they're requested
+    manager.handle_text_delta(vendor_part_id='content', content='end')
+    manager.handle_tool_call_part(vendor_part_id='tool', tool_name='tool', args='{}')
+    assert manager.get_parts() == [TextPart(content=expected + 'end'), ToolCallPart.from_raw_args('tool', '{}')]
+
+
+def test_text_part_overwritten_by_tool_call():
+    manager = ModelResponsePartsManager()
+    manager.handle_text_delta(vendor_part_id='part', content='hello ')
+    manager.handle_text_delta(vendor_part_id='part', content='world')
+    manager.handle_tool_call_part(vendor_part_id='part', tool_name='tool', args='{}')
+    assert manager.get_parts() == [ToolCallPart.from_raw_args('tool', '{}')]
+
+
 def test_handle_tool_call_deltas():
     manager = ModelResponsePartsManager()
 
@@ -137,6 +161,28 @@ def test_handle_tool_call_deltas():
     )
 
 
+def test_handle_many_tool_call_args_deltas():
+    manager = ModelResponsePartsManager()
+    manager.handle_tool_call_delta(vendor_part_id='call', tool_name='tool', args='{"x": "', tool_call_id='id')
+    events = [
+        manager.handle_tool_call_delta(vendor_part_id='call', tool_name=None, args=f'{i} ', tool_call_id=None)
+        for i in range(1000)
+    ]
+    assert events[-1] == PartDeltaEvent(index=0, delta=ToolCallPartDelta(args_delta='999 '))
+    manager.handle_tool_call_delta(vendor_part_id='call', tool_name=None, args='"}', tool_call_id='id')
+    expected_args = '{"x": "' + ''.join(f'{i} ' for i in range(1000)) + '"}'
+    assert manager.get_parts() == [ToolCallPart.from_raw_args('tool', expected_args, 'id')]
+
+    # deltas which don't only add arguments are applied after the pending arguments
+    manager.handle_tool_call_delta(vendor_part_id='call', tool_name=None, args=' ', tool_call_id=None)
+    manager.handle_tool_call_delta(vendor_part_id='call', tool_name='_v2', args=None, tool_call_id=None)
+    assert manager.get_parts() == [ToolCallPart.from_raw_args('tool_v2', expected_args + ' ', 'id')]
+
+    manager.handle_tool_call_delta(vendor_part_id='call', tool_name=None, args='x', tool_call_id=None)
+    with pytest.raises(UnexpectedModelBehavior, match='Cannot apply a new tool_call_id to a ToolCallPart'):
+        manager.handle_tool_call_delta(vendor_part_id='call', tool_name=None, args='y', tool_call_id='other')
+
+
 def test_handle_tool_call_deltas_without_vendor_id():
     # Note, tool_name should not be specified in subsequent deltas when the vendor_part_id is None
     manager = ModelResponsePartsManager()
@@ -0,0 +1,158 @@
+# pyright: reportPrivateUsage=false
+from __future__ import annotations as _annotations
+
+from pathlib import Path
+from typing import Any
+from weakref import WeakKeyDictionary
+
+import pytest
+from pydantic import BaseModel, create_model
+
+from pydantic_ai import Agent, Tool, _pydantic, schema_cache
+from pydantic_ai._result import ResultTool
+from pydantic_ai.models.test import TestModel
+from pydantic_ai.schema_cache import SchemaCache, get_schema_cache, set_schema_cache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def reset_schema_cache(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(schema_cache, '_schema_cache', schema_cache._UNSET)
+    monkeypatch.setattr(_pydantic, '_schema_cache', WeakKeyDictionary[Any, Any]())
+
+
+def simulate_new_process(monkeypatch: pytest.MonkeyPatch) -> list[object]:
+    """Forget schemas built in this process, and record the functions whose schema is built from now on."""
+    built: list[object] = []
+    build = _pydantic._build_function_schema
+
+    def build_function_schema(function: object, *args: object):
+        built.append(function)
+        return build(function, *args)  # type: ignore
+
+    monkeypatch.setattr(_pydantic, '_schema_cache', WeakKeyDictionary[Any, Any]())
+    monkeypatch.setattr(_pydantic, '_build_function_schema', build_function_schema)
+    return built
+
+
+def get_weather(city: str, days: int = 1) -> str:
+    """Get the weather forecast.
+
+    Args:
+        city: The city to get the weather for.
+        days: The number of days to forecast.
+    """
+    return f'{city} {days}'
+
+
+class Forecast(BaseModel):
+    """A weather forecast."""
+
+    city: str
+    summary: str
+
+
+async def test_tool_schema_loaded_from_disk(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    set_schema_cache(SchemaCache(tmp_path))
+    tool_def = Tool(get_weather)._build_tool_def()
+    assert len(list(tmp_path.glob('*.json'))) == 1
+
+    built = simulate_new_process(monkeypatch)
+    tool = Tool(get_weather)
+    assert tool._build_tool_def() == tool_def
+    assert tool.description == 'Get the weather forecast.'
+    assert built == []
+
+    # the validator is built when the tool is first called
+    result = await Agent(TestModel(), tools=[tool]).run('Hello')
+    assert result.data == '{"get_weather":"a 0"}'
+    assert built == [get_weather]
+
+
+def test_result_schema_loaded_from_disk(tmp_path: Path):
+    set_schema_cache(SchemaCache(tmp_path))
+    result_tools: list[ResultTool[Any]] = []
+    for response_type in Forecast, list[Forecast]:
+        tool_def = ResultTool(response_type, 'final_result', None, False).tool_def
+
+        result_tool = ResultTool(response_type, 'final_result', None, False)
+        assert result_tool.tool_def == tool_def
+        assert result_tool._type_adapter is None
+        result_tools.append(result_tool)
+
+    assert len(list(tmp_path.glob('*.json'))) == 2
+    assert result_tools[0].type_adapter.validate_python({'city': 'a', 'summary': 'b'}) == Forecast(
+        city='a', summary='b'
+    )
+    assert result_tools[1].type_adapter.validate_python({'response': [{'city': 'a', 'summary': 'b'}]}) == {
+        'response': [Forecast(city='a', summary='b')]
+    }
+
+
+def test_corrupt_entries_ignored(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    set_schema_cache(SchemaCache(tmp_path))
+    tool_def = Tool(get_weather)._build_tool_def()
+    (path,) = tmp_path.glob('*.json')
+    path.write_text('{"description":')
+
+    built = simulate_new_process(monkeypatch)
+    assert Tool(get_weather)._build_tool_def() == tool_def
+    assert built == [get_weather]
+
+
+def test_uncacheable_functions(tmp_path: Path):
+    set_schema_cache(SchemaCache(tmp_path))
+    namespace: dict[str, object] = {}
+    exec('def interactive(x: int) -> int:\n    return x', namespace)
+    assert schema_cache.function_key(namespace['interactive']) is None  # type: ignore
+    assert Tool(namespace['interactive'])._build_tool_def().parameters_json_schema['required'] == ['x']  # type: ignore
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_keys():
+    assert schema_cache.function_key(get_weather, True) != schema_cache.function_key(get_weather, False)
+    assert schema_cache.type_key(Forecast) == schema_cache.type_key(Forecast)
+    assert schema_cache.type_key(Forecast) != schema_cache.type_key(list[Forecast])
+    assert schema_cache.type_key(int) is not None
+
+
+def test_dynamic_types_not_cached(tmp_path: Path):
+    def result_model(field_name: str) -> type[BaseModel]:
+        fields: dict[str, Any] = {field_name: (int, ...)}
+        return create_model('Result', **fields)
+
+    class Local(BaseModel):
+        x: int
+
+    set_schema_cache(SchemaCache(tmp_path))
+    # both models have the same repr and module, so can't be told apart by the cache
+    for field_name in 'a', 'b':
+        model = result_model(field_name)
+        assert schema_cache.type_key(model) is None
+        result_tool = ResultTool(model, 'final_result', None, False)
+        assert result_tool.tool_def.parameters_json_schema['required'] == [field_name]
+        assert result_tool.type_adapter.validate_python({field_name: 1}) == model(**{field_name: 1})
+    assert schema_cache.type_key(Local) is None
+    assert schema_cache.type_key(list[Local]) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_env_var(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv('PYDANTIC_AI_SCHEMA_CACHE_DIR', str(tmp_path / 'schemas'))
+    cache = get_schema_cache()
+    assert cache is not None
+    assert cache.directory == tmp_path / 'schemas'
+
+    Tool(get_weather)._build_tool_def()
+    assert len(list(cache.directory.glob('*.json'))) == 1
+    cache.clear()
+    assert list(cache.directory.glob('*.json')) == []
+
+    set_schema_cache(None)
+    assert get_schema_cache() is None
+
+
+def test_disabled_by_default(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv('PYDANTIC_AI_SCHEMA_CACHE_DIR', raising=False)
+    assert get_schema_cache() is None
@@ -1,15 +1,18 @@
 from __future__ import annotations as _annotations
 
+import asyncio
 import datetime
 import json
 from collections.abc import AsyncIterator
 from datetime import timezone
+from typing import Any, Union
 
 import pytest
 from inline_snapshot import snapshot
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError, field_validator
+from pydantic_core import from_json
 
-from pydantic_ai import Agent, UnexpectedModelBehavior, UserError, capture_run_messages
+from pydantic_ai import Agent, ModelRetry, UnexpectedModelBehavior, UserError, capture_run_messages
 from pydantic_ai.messages import (
     ArgsDict,
     ArgsJson,
@@ -576,7 +579,7 @@ async def test_early_strategy_with_final_result_in_middle():
             ModelRequest(
                 parts=[
                     UserPromptPart(
-                        content='test early strategy with final ' 'result in middle',
+                        content='test early strategy with final result in middle',
                         timestamp=IsNow(tz=datetime.timezone.utc),
                         part_kind='user-prompt',
                     )
@@ -617,7 +620,7 @@ async def test_early_strategy_with_final_result_in_middle():
                 parts=[
                     ToolReturnPart(
                         tool_name='regular_tool',
-                        content='Tool not executed - a final ' 'result was already processed.',
+                        content='Tool not executed - a final result was already processed.',
                         tool_call_id=None,
                         timestamp=IsNow(tz=datetime.timezone.utc),
                         part_kind='tool-return',
@@ -631,7 +634,7 @@ async def test_early_strategy_with_final_result_in_middle():
                     ),
                     ToolReturnPart(
                         tool_name='another_tool',
-                        content='Tool not executed - a final ' 'result was already processed.',
+                        content='Tool not executed - a final result was already processed.',
                         tool_call_id=None,
                         timestamp=IsNow(tz=datetime.timezone.utc),
                         part_kind='tool-return',
@@ -722,3 +725,288 @@ async def test_custom_result_type_default_structured() -> None:
     async with agent.run_stream('test', result_type=str) as result:
         response = await result.get_data()
         assert response == snapshot('success (no tool calls)')
+
+
+async def test_eager_tool_execution():
+    events: list[str] = []
+    london_started = asyncio.Event()
+
+    async def sf(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str | DeltaToolCalls]:
+        if len(messages) == 1:
+            yield {0: DeltaToolCall('get_weather', '{"city": ')}
+            yield {0: DeltaToolCall(json_args='"London"}')}
+            # the tool has started before the rest of the response is streamed
+            await asyncio.wait_for(london_started.wait(), timeout=1)
+            events.append('streaming')
+            yield {1: DeltaToolCall('get_weather', '{"city": "Paris"}')}
+            # arguments which look complete but later change: the started call is cancelled and run again
+            yield {2: DeltaToolCall('get_weather', '{"city": "Rome"}')}
+            yield {2: DeltaToolCall(json_args=' ')}
+        else:
+            yield 'done'
+
+    agent = Agent(FunctionModel(stream_function=sf), eager_tool_execution=True)
+
+    @agent.tool_plain
+    async def get_weather(city: str) -> str:
+        events.append(f'start {city}')
+        if city == 'London':
+            london_started.set()
+        await asyncio.sleep(0)
+        events.append(f'end {city}')
+        return f'sunny in {city}'
+
+    async with agent.run_stream('weather?') as result:
+        assert await result.get_data() == 'done'
+
+    assert events == snapshot(
+        ['start London', 'end London', 'streaming', 'start Paris', 'start Rome', 'end Paris', 'end Rome']
+    )
+    assert result.all_messages()[2] == snapshot(
+        ModelRequest(
+            parts=[
+                ToolReturnPart(tool_name='get_weather', content='sunny in London', timestamp=IsNow(tz=timezone.utc)),
+                ToolReturnPart(tool_name='get_weather', content='sunny in Paris', timestamp=IsNow(tz=timezone.utc)),
+                ToolReturnPart(tool_name='get_weather', content='sunny in Rome', timestamp=IsNow(tz=timezone.utc)),
+            ]
+        )
+    )
+
+
+async def test_eager_tool_execution_retries():
+    """Retries of calls which were started but not used because their arguments changed aren't counted."""
+    calls = 0
+
+    async def sf(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str | DeltaToolCalls]:
+        if len(messages) == 1:
+            yield {0: DeltaToolCall('get_weather', '{"city": "Rome"}')}
+            await asyncio.sleep(0)
+            yield {0: DeltaToolCall(json_args=' ')}
+        elif len(messages) == 3:
+            yield {0: DeltaToolCall('get_weather', '{"city": "Rome"}')}
+        else:
+            yield 'done'
+
+    agent = Agent(FunctionModel(stream_function=sf), eager_tool_execution=True)
+
+    @agent.tool_plain(retries=1)
+    async def get_weather(city: str) -> str:
+        nonlocal calls
+        calls += 1
+        if calls <= 2:
+            raise ModelRetry('try again')
+        return f'sunny in {city}'
+
+    async with agent.run_stream('weather?') as result:
+        assert await result.get_data() == 'done'
+    assert calls == 3
+
+
+async def test_eager_tool_execution_final_result():
+    """With the 'early' end strategy, tools started before a final result are cancelled."""
+    tool_started = asyncio.Event()
+    tool_cancelled = False
+
+    async def sf(_: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str | DeltaToolCalls]:
+        yield {0: DeltaToolCall('slow_tool', '{}')}
+        await tool_started.wait()
+        yield {1: DeltaToolCall('final_result', '{"value": "final"}')}
+
+    agent = Agent(FunctionModel(stream_function=sf), result_type=ResultType, eager_tool_execution=True)
+
+    @agent.tool_plain
+    async def slow_tool() -> str:
+        nonlocal tool_cancelled
+        tool_started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            tool_cancelled = True
+            raise
+        return 'never'  # pragma: no cover
+
+    async with agent.run_stream('test') as result:
+        assert (await result.get_data()).value == 'final'
+
+    await asyncio.sleep(0)
+    assert tool_cancelled
+    assert result.all_messages()[-1] == snapshot(
+        ModelRequest(
+            parts=[
+                ToolReturnPart(
+                    tool_name='slow_tool',
+                    content='Tool not executed - a final result was already processed.',
+                    timestamp=IsNow(tz=timezone.utc),
+                ),
+                ToolReturnPart(
+                    tool_name='final_result', content='Final result processed.', timestamp=IsNow(tz=timezone.utc)
+                ),
+            ]
+        )
+    )
+
+
+def stream_result_json(*chunks: str):
+    async def stream_function(_messages: list[ModelMessage], agent_info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        assert agent_info.result_tools is not None
+        yield {0: DeltaToolCall(name=agent_info.result_tools[0].name)}
+        for chunk in chunks:
+            yield {0: DeltaToolCall(json_args=chunk)}
+
+    return FunctionModel(stream_function=stream_function)
+
+
+async def test_stream_list_validated_incrementally():
+    validated: list[int] = []
+
+    class Item(BaseModel):
+        x: int
+        label: str = ''
+
+        @field_validator('x')
+        @classmethod
+        def record_x(cls, x: int) -> int:
+            validated.append(x)
+            return x
+
+    chunks = [
+        '{"response": [',
+        *(f'{{"x": {i}, "label": "item {i}"}}, ' for i in range(19)),
+        '{"x": 19, "lab',
+        'el": "la',
+        'st"}]}',
+    ]
+    agent = Agent(stream_result_json(*chunks), result_type=list[Item])
+
+    async with agent.run_stream('') as result:
+        items = [[item.x for item in data] async for data in result.stream(debounce_by=None)]
+
+    assert items[:3] == snapshot([[], [0], [0, 1]])
+    assert items[-4:] == snapshot([list(range(20)), list(range(20)), list(range(20)), list(range(20))])
+    assert (await result.get_data())[-1] == Item(x=19, label='last')
+    # each item is validated once while it's the last item and once when it's complete, plus by the final validation
+    assert len(validated) < 3 * 20 + len(chunks)
+
+
+async def test_stream_list_partial_matches_full_validation():
+    json_data = json.dumps({'response': [{'a': 'x' * 3, 'b': [1, 2]}, {'a': 'y', 'b': []}, {'a': 'zz', 'b': [3]}]})
+    # the partial result is only valid once the `response` key has been received
+    start = len('{"response": [')
+    chunks = [json_data[:start]] + [json_data[i : i + 4] for i in range(start, len(json_data), 4)]
+    agent = Agent(stream_result_json(*chunks), result_type=list[dict[str, Union[str, list[int]]]])
+    type_adapter = TypeAdapter(list[dict[str, Union[str, list[int]]]])
+
+    async with agent.run_stream('') as result:
+        data = [d async for d in result.stream(debounce_by=None)]
+
+    received = ''
+    expected: list[Any] = []
+    for chunk in chunks:
+        received += chunk
+        partial = from_json(received, allow_partial='trailing-strings')
+        expected.append(type_adapter.validate_python(partial['response'], experimental_allow_partial=True))
+    assert data[:-1] == expected
+
+
+async def test_stream_list_strict_items():
+    class Event(BaseModel, strict=True):
+        name: str
+        at: datetime.datetime
+
+    json_data = json.dumps(
+        {'response': [{'name': f'event {i}', 'at': f'2024-01-0{i + 1}T00:00:00Z'} for i in range(3)]}
+    )
+    start = len('{"response": [')
+    chunks = [json_data[:start]] + [json_data[i : i + 10] for i in range(start, len(json_data), 10)]
+    agent = Agent(stream_result_json(*chunks), result_type=list[Event])
+
+    async with agent.run_stream('') as result:
+        data = [d async for d in result.stream(debounce_by=None)]
+        # the items were valid, so didn't need validating from scratch
+        assert result._partial_validators['final_result']._incremental  # pyright: ignore[reportPrivateUsage]
+
+    type_adapter = TypeAdapter(list[Event])
+    received = ''
+    expected: list[Any] = []
+    for chunk in chunks:
+        received += chunk
+        response = received[len('{"response": ') :].removesuffix('}')
+        expected.append(type_adapter.validate_json(response, experimental_allow_partial='trailing-strings'))
+    # items are validated in JSON mode, where strict models accept datetimes as strings
+    assert data[:-1] == expected
+    assert [e.name for e in data[-1]] == snapshot(['event 0', 'event 1', 'event 2'])
+
+
+async def test_stream_list_invalid_item():
+    agent = Agent(stream_result_json('{"response": [1, "a", ', '3]}'), result_type=list[int])
+
+    async with agent.run_stream('') as result:
+        with pytest.raises(ValidationError) as exc_info:
+            async for _ in result.stream(debounce_by=None):
+                pass
+
+    assert [e['loc'] for e in exc_info.value.errors()] == snapshot([('response', 1)])
+
+
+async def test_stream_validator_not_partial():
+    partial_calls: list[Any] = []
+    final_calls: list[Any] = []
+    agent = Agent(stream_result_json('{"response": [1, ', '2, ', '3]}'), result_type=list[int])
+
+    @agent.result_validator
+    def partial_validator(data: list[int]) -> list[int]:
+        partial_calls.append(data)
+        return data
+
+    @agent.result_validator(partial=False)
+    def final_validator(data: list[int]) -> list[int]:
+        final_calls.append(data)
+        return [x * 10 for x in data]
+
+    async with agent.run_stream('') as result:
+        data = [d async for d in result.stream(debounce_by=None)]
+
+    assert data == snapshot([[1], [1, 2], [1, 2, 3], [10, 20, 30]])
+    assert partial_calls == snapshot([[1], [1, 2], [1, 2, 3], [1, 2, 3]])
+    assert final_calls == snapshot([[1, 2, 3]])
+
+
+async def test_stream_text_validator_not_partial():
+    agent = Agent(TestModel(custom_result_text='The cat sat on the mat.'))
+
+    @agent.result_validator(partial=False)
+    async def final_validator(data: str) -> str:
+        return data.upper()
+
+    async with agent.run_stream('') as result:
+        data = [d async for d in result.stream_text(debounce_by=None)]
+
+    assert data == snapshot(
+        [
+            'The ',
+            'The cat ',
+            'The cat sat ',
+            'The cat sat on ',
+            'The cat sat on the ',
+            'The cat sat on the mat.',
+            'THE CAT SAT ON THE MAT.',
+        ]
+    )
+    assert await result.get_data() == snapshot('THE CAT SAT ON THE MAT.')
+
+
+async def test_stream_text_validator_not_partial_unchanged():
+    final_calls: list[str] = []
+    agent = Agent(TestModel(custom_result_text='The cat sat on the mat.'))
+
+    @agent.result_validator(partial=False)
+    async def final_validator(data: str) -> str:
+        final_calls.append(data)
+        return data
+
+    async with agent.run_stream('') as result:
+        data = [d async for d in result.stream_text(debounce_by=None)]
+
+    # the final text isn't yielded again, since the validator didn't change it
+    assert data[-2:] == snapshot(['The cat sat on the ', 'The cat sat on the mat.'])
+    assert final_calls == snapshot(['The cat sat on the mat.'])
@@ -0,0 +1,164 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+from pydantic_ai.timings import RunTimings, StepTimings, measure_message_mapping
+
+pytestmark = pytest.mark.anyio
+
+
+async def call_tool_then_respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+    with measure_message_mapping():
+        time.sleep(0.01)
+    if len(messages) == 1:
+        return ModelResponse(parts=[ToolCallPart.from_raw_args('slow_tool', {'x': 1}, tool_call_id='call-1')])
+    await asyncio.sleep(0.02)
+    return ModelResponse.from_text('done')
+
+
+async def test_run_timings():
+    agent = Agent(FunctionModel(call_tool_then_respond))
+
+    @agent.tool_plain
+    async def slow_tool(x: int) -> int:
+        await asyncio.sleep(0.02)
+        return x
+
+    @agent.result_validator
+    def validate_result(data: str) -> str:
+        time.sleep(0.01)
+        return data
+
+    result = await agent.run('Hello')
+    timings = result.timings()
+
+    assert [step.run_step for step in timings.steps] == [1, 2]
+    first, second = timings.steps
+    assert [(t.tool_name, t.tool_call_id) for t in first.tools] == [('slow_tool', 'call-1')]
+    assert first.tools[0].duration >= 0.02
+    assert second.tools == []
+
+    for step in timings.steps:
+        assert step.message_mapping >= 0.01
+        assert step.model_request >= step.message_mapping
+        assert step.network_wait == step.model_request - step.message_mapping
+        assert step.time_to_first_token is None
+        assert step.stream_duration is None
+    assert second.network_wait >= 0.02
+
+    assert first.result_validators == 0
+    assert second.result_validators >= 0.01
+    assert timings.total is not None
+    assert timings.total >= sum(step.model_request for step in timings.steps) + first.tools[0].duration
+
+
+class Foo(BaseModel):
+    a: int
+
+
+async def test_result_validation_timings():
+    async def return_result(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        assert info.result_tools is not None
+        return ModelResponse(parts=[ToolCallPart.from_raw_args(info.result_tools[0].name, '{"a": 1}')])
+
+    agent = Agent(FunctionModel(return_result), result_type=Foo)
+    result = await agent.run('Hello')
+    assert result.data == Foo(a=1)
+    (step,) = result.timings().steps
+    assert step.result_validation > 0
+    assert step.result_validators == 0
+
+
+async def test_stream_timings():
+    async def stream_text(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str | DeltaToolCalls]:
+        await asyncio.sleep(0.02)
+        if len(messages) == 1:
+            yield {0: DeltaToolCall('get_location', '{"city": "London"}')}
+            await asyncio.sleep(0.01)
+        else:
+            yield 'hello '
+            await asyncio.sleep(0.02)
+            yield 'world'
+
+    agent = Agent(FunctionModel(stream_function=stream_text))
+
+    @agent.tool_plain
+    def get_location(city: str) -> str:
+        return city
+
+    async with agent.run_stream('Hello') as result:
+        assert [step.run_step for step in result.timings().steps] == [1, 2]
+        assert result.timings().steps[-1].stream_duration is None
+        assert result.timings().total is None
+        assert await result.get_data() == 'hello world'
+
+    timings = result.timings()
+    assert timings.total is not None
+    first, second = timings.steps
+    assert [t.tool_name for t in first.tools] == ['get_location']
+    for step in timings.steps:
+        assert step.time_to_first_token is not None
+        assert step.time_to_first_token >= 0.02
+        assert step.time_to_first_token >= step.model_request
+    assert first.stream_duration is not None and first.stream_duration >= 0.01
+    assert second.stream_duration is not None and second.stream_duration >= 0.02
+
+
+async def test_stream_caller_not_recorded():
+    """Time the caller spends consuming a stream isn't counted as the model mapping messages."""
+
+    async def stream_text(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        yield 'hello'
+
+    agent = Agent(FunctionModel(stream_function=stream_text))
+    async with agent.run_stream('Hello') as result:
+        with measure_message_mapping():
+            time.sleep(0.01)
+        assert await result.get_data() == 'hello'
+
+    (step,) = result.timings().steps
+    assert step.message_mapping < 0.01
+
+
+async def test_stream_validators_timings():
+    async def stream_text(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        yield 'hello '
+        yield 'world'
+
+    agent = Agent(FunctionModel(stream_function=stream_text))
+
+    @agent.result_validator
+    def validate_result(data: str) -> str:
+        time.sleep(0.01)
+        return data
+
+    async with agent.run_stream('Hello') as result:
+        assert [c async for c in result.stream_text(debounce_by=None)] == ['hello ', 'hello world']
+
+    (step,) = result.timings().steps
+    assert step.result_validators >= 0.02
+
+
+def test_measure_message_mapping():
+    # outside a run, nothing is recorded
+    with measure_message_mapping():
+        pass
+
+    timings = RunTimings()
+    step = timings.start_step(1)
+    with step.record_message_mapping():
+        with measure_message_mapping():
+            time.sleep(0.01)
+    with measure_message_mapping():
+        pass
+    assert step.message_mapping >= 0.01
+    assert timings.steps == [step]
+    assert step == StepTimings(1, message_mapping=step.message_mapping)
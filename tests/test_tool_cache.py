@@ -0,0 +1,161 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent, ModelRetry, RunContext, Tool, ToolCache
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.cached import MemoryCacheStore
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+pytestmark = pytest.mark.anyio
+
+
+def tool_returns(messages: list[ModelMessage]) -> list[Any]:
+    return [part.content for m in messages for part in m.parts if isinstance(part, ToolReturnPart)]
+
+
+async def test_cache_hit():
+    calls: list[int] = []
+    cache = ToolCache()
+
+    def double(x: int) -> int:
+        calls.append(x)
+        return x * 2
+
+    agent = Agent(TestModel(), tools=[Tool(double, cache=cache)])
+
+    first = await agent.run('Hello')
+    second = await agent.run('Hello')
+    assert calls == [0]
+    assert tool_returns(first.all_messages()) == tool_returns(second.all_messages()) == [0]
+    assert (cache.hits, cache.misses, cache.coalesced) == (1, 1, 0)
+
+    cache.clear()
+    await agent.run('Hello')
+    assert calls == [0, 0]
+
+
+def call_tool(*args: dict[str, Any]):
+    """Call `tool` once with each of `args` in the first response, then respond with text."""
+
+    def model_function(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if len(messages) == 1:
+            return ModelResponse(
+                parts=[ToolCallPart.from_raw_args('tool', a, tool_call_id=str(i)) for i, a in enumerate(args)]
+            )
+        return ModelResponse.from_text('done')
+
+    return FunctionModel(model_function)
+
+
+async def test_cache_key_function():
+    calls: list[tuple[str, int]] = []
+    cache = ToolCache(key=lambda args: args['city'].lower())
+    agent = Agent(call_tool({'city': 'London', 'request_id': 1}, {'city': 'london', 'request_id': 2}))
+
+    @agent.tool_plain(cache=cache)
+    async def tool(city: str, request_id: int) -> str:
+        calls.append((city, request_id))
+        await asyncio.sleep(0.01)
+        return f'weather in {city}'
+
+    result = await agent.run('Hello')
+    assert calls == [('London', 1)]
+    assert tool_returns(result.all_messages()) == ['weather in London', 'weather in London']
+    assert (cache.hits, cache.misses, cache.coalesced) == (0, 1, 1)
+
+
+async def test_coalesce_concurrent_calls():
+    started = 0
+    cache = ToolCache()
+    agent = Agent(call_tool({'x': 1}, {'x': 1}, {'x': 2}))
+
+    @agent.tool_plain(cache=cache)
+    async def tool(x: int) -> int:
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.01)
+        return x
+
+    result = await agent.run('Hello')
+    assert started == 2
+    assert tool_returns(result.all_messages()) == [1, 1, 2]
+    assert (cache.hits, cache.misses, cache.coalesced) == (0, 2, 1)
+
+
+async def test_scope_by_deps():
+    calls: list[str] = []
+    cache = ToolCache(scope_by_deps=True)
+    agent = Agent(TestModel(), deps_type=str)
+
+    @agent.tool(cache=cache)
+    def greet(ctx: RunContext[str]) -> str:
+        calls.append(ctx.deps)
+        return f'hello {ctx.deps}'
+
+    await agent.run('Hello', deps='alice')
+    await agent.run('Hello', deps='bob')
+    result = await agent.run('Hello', deps='alice')
+    assert calls == ['alice', 'bob']
+    assert tool_returns(result.all_messages()) == ['hello alice']
+
+
+async def test_ttl():
+    calls = 0
+    agent = Agent(TestModel())
+
+    @agent.tool_plain(cache=ToolCache(ttl=0.05))
+    def tool() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    await agent.run('Hello')
+    await agent.run('Hello')
+    assert calls == 1
+    await asyncio.sleep(0.06)
+    result = await agent.run('Hello')
+    assert calls == 2
+    assert tool_returns(result.all_messages()) == [2]
+
+
+async def test_errors_not_cached():
+    calls = 0
+    cache = ToolCache()
+    agent = Agent(TestModel())
+
+    @agent.tool_plain(cache=cache, retries=2)
+    def tool() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ModelRetry('try again')
+        return 'ok'
+
+    result = await agent.run('Hello')
+    assert calls == 2
+    assert tool_returns(result.all_messages()) == ['ok']
+    await agent.run('Hello')
+    assert calls == 2
+
+
+async def test_store():
+    store = MemoryCacheStore()
+    calls = 0
+
+    def get_user(user_id: int) -> dict[str, Any]:
+        nonlocal calls
+        calls += 1
+        return {'id': user_id, 'name': 'Alice'}
+
+    # two agents share results through the store
+    for _ in range(2):
+        agent = Agent(TestModel(), tools=[Tool(get_user, cache=ToolCache(store=store))])
+        result = await agent.run('Hello')
+        assert tool_returns(result.all_messages()) == snapshot([{'id': 0, 'name': 'Alice'}])
+    assert calls == 1
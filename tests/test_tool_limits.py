@@ -0,0 +1,163 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+import time
+
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent, Tool, ToolTimeout, UsageLimitExceeded
+from pydantic_ai.messages import ModelMessage, ModelResponse, RetryPromptPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+from pydantic_ai.usage import UsageLimits
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_timeout_retry():
+    calls = 0
+    agent = Agent(TestModel())
+
+    @agent.tool_plain(timeout=0.05)
+    async def slow_tool() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return 'done'
+
+    result = await agent.run('Hello')
+    assert calls == 2
+    assert result.data == snapshot('{"slow_tool":"done"}')
+    retries = [p for m in result.all_messages() for p in m.parts if isinstance(p, RetryPromptPart)]
+    assert [p.content for p in retries] == snapshot(
+        ['Timed out after 0.05 seconds, try again with different arguments if possible']
+    )
+
+
+async def test_timeout_raise():
+    agent = Agent(TestModel())
+
+    @agent.tool_plain(timeout=0.05, on_timeout='raise')
+    def slow_sync_tool() -> str:
+        time.sleep(0.2)
+        return 'done'
+
+    start = time.perf_counter()
+    with pytest.raises(ToolTimeout, match="Tool 'slow_sync_tool' timed out after 0.05 seconds") as exc_info:
+        await agent.run('Hello')
+    assert time.perf_counter() - start < 0.2
+    assert (exc_info.value.tool_name, exc_info.value.timeout) == ('slow_sync_tool', 0.05)
+
+
+async def test_timeout_tool_raises_timeout_error():
+    """A tool raising `TimeoutError` itself isn't treated as the call timing out."""
+    agent = Agent(TestModel())
+
+    @agent.tool_plain(timeout=1)
+    async def tool() -> str:
+        raise asyncio.TimeoutError()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await agent.run('Hello')
+
+
+async def test_max_concurrency():
+    running = 0
+    max_running = 0
+    agent = Agent(TestModel())
+
+    @agent.tool_plain(max_concurrency=2)
+    async def tool() -> str:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return 'done'
+
+    # the limit applies across runs
+    results = await asyncio.gather(*(agent.run('Hello') for _ in range(5)))
+    assert [r.data for r in results] == ['{"tool":"done"}'] * 5
+    assert max_running == 2
+
+
+async def test_max_concurrency_per_agent():
+    running = 0
+    max_running = 0
+
+    async def tool() -> str:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return 'done'
+
+    shared = Tool(tool, max_retries=1, max_concurrency=1)
+    agents = [Agent(TestModel(), tools=[shared]), Agent(TestModel(), tools=[shared])]
+    assert agents[0]._function_tools['tool'] is not agents[1]._function_tools['tool']  # pyright: ignore[reportPrivateUsage]
+
+    # each agent has its own limit
+    results = await asyncio.gather(*(agent.run('Hello') for agent in agents))
+    assert [r.data for r in results] == ['{"tool":"done"}'] * 2
+    assert max_running == 2
+
+
+def call_tools(*tool_names: str):
+    def model_function(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if len(messages) == 1:
+            return ModelResponse(parts=[ToolCallPart.from_raw_args(name, {}) for name in tool_names])
+        return ModelResponse.from_text('done')  # pragma: no cover
+
+    return FunctionModel(model_function)
+
+
+async def test_cancel_siblings_on_error():
+    cancelled = False
+    agent = Agent(call_tools('slow_tool', 'use_sub_agent'))
+    sub_agent = Agent(TestModel())
+
+    @agent.tool_plain
+    async def slow_tool() -> str:
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return 'done'  # pragma: no cover
+
+    @agent.tool_plain
+    async def use_sub_agent() -> str:
+        await asyncio.sleep(0.01)
+        result = await sub_agent.run('Hello', usage_limits=UsageLimits(request_limit=0))
+        return result.data  # pragma: no cover
+
+    with pytest.raises(UsageLimitExceeded):
+        await agent.run('Hello')
+    assert cancelled
+
+
+async def test_cancel_tools_with_run():
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+    agent = Agent(call_tools('slow_tool'))
+
+    @agent.tool_plain
+    async def slow_tool() -> str:
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return 'done'  # pragma: no cover
+
+    task = asyncio.create_task(agent.run('Hello'))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cancelled.is_set()
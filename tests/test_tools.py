@@ -1,3 +1,4 @@
+import dataclasses
 import json
 from dataclasses import dataclass
 from typing import Annotated, Any, Callable, Literal, Union
@@ -524,6 +525,70 @@ def test_dynamic_tool_use_messages(set_event_loop: None):
     )
 
 
+def test_tool_def_reused_without_prepare(set_event_loop: None):
+    function_tools: list[list[ToolDefinition]] = []
+
+    async def call_tools(_messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        function_tools.append(info.function_tools)
+        if len(function_tools) == 1:
+            return ModelResponse(parts=[ToolCallPart.from_raw_args(t.name, {'x': 1}) for t in info.function_tools])
+        else:
+            return ModelResponse.from_text('done')
+
+    agent = Agent(FunctionModel(call_tools))
+
+    async def prepare_tool_def(ctx: RunContext[None], tool_def: ToolDefinition) -> ToolDefinition:
+        return tool_def
+
+    @agent.tool_plain(prepare=prepare_tool_def)
+    def prepared(x: int) -> int:
+        return x
+
+    @agent.tool_plain
+    def static(x: int) -> int:
+        return x
+
+    agent.run_sync('')
+    assert [[t.name for t in tools] for tools in function_tools] == snapshot(
+        [['prepared', 'static'], ['prepared', 'static']]
+    )
+    (prepared_1, static_1), (prepared_2, static_2) = function_tools
+    assert static_1 is static_2
+    assert prepared_1 is not prepared_2
+
+    agent._function_tools['static'].description = 'new description'
+    agent.run_sync('')
+    assert function_tools[-1][1].description == 'new description'
+
+
+def test_static_tool_def_built_once_per_run(set_event_loop: None, monkeypatch: pytest.MonkeyPatch):
+    prepared: list[str] = []
+    prepare_tool_def = Tool.prepare_tool_def
+
+    async def counting_prepare_tool_def(self: Tool[Any], ctx: RunContext[Any]) -> ToolDefinition | None:
+        prepared.append(self.name)
+        return await prepare_tool_def(self, ctx)
+
+    monkeypatch.setattr(Tool, 'prepare_tool_def', counting_prepare_tool_def)
+
+    async def prepare(ctx: RunContext[None], tool_def: ToolDefinition) -> ToolDefinition:
+        return tool_def
+
+    agent = Agent(TestModel())
+
+    @agent.tool_plain(prepare=prepare)
+    def dynamic(x: int) -> int:
+        return x
+
+    @agent.tool_plain
+    def static(x: int) -> int:
+        return x
+
+    # two steps: the tool calls, then the final result
+    agent.run_sync('')
+    assert sorted(prepared) == ['dynamic', 'dynamic', 'static']
+
+
 def test_future_run_context(set_event_loop: None, create_module: Callable[[str], Any]):
     mod = create_module("""
 from __future__ import annotations
@@ -591,3 +656,83 @@ def test_enforce_parameter_descriptions() -> None:
         'bar',
     ]
     assert all(err_part in error_reason for err_part in error_parts)
+
+
+def shared_tool(x: int) -> int:
+    """Double a number.
+
+    Args:
+        x: The number to double.
+    """
+    return x * 2
+
+
+def test_schema_built_lazily_and_shared(set_event_loop: None, monkeypatch: pytest.MonkeyPatch):
+    from pydantic_ai import _pydantic
+
+    builds: list[str] = []
+    build_function_schema = _pydantic._build_function_schema
+
+    def counting_build(function: Callable[..., Any], *args: Any) -> _pydantic.FunctionSchema:
+        builds.append(function.__name__)
+        return build_function_schema(function, *args)
+
+    monkeypatch.setattr(_pydantic, '_build_function_schema', counting_build)
+    monkeypatch.setattr(_pydantic, '_schema_cache', type(_pydantic._schema_cache)())
+
+    agents = [Agent(TestModel(), tools=[shared_tool]) for _ in range(3)]
+    assert builds == []
+
+    for agent in agents:
+        assert agent.run_sync('Hello').data == snapshot('{"shared_tool":0}')
+    assert builds == ['shared_tool']
+
+    tool = Tool(shared_tool, description='Custom description.')
+    assert tool.description == 'Custom description.'
+    assert Tool(shared_tool).description == 'Double a number.'
+    assert builds == ['shared_tool']
+
+
+def test_shared_schema_copied(set_event_loop: None):
+    """Tools sharing a function's schema can't modify each other's JSON schema."""
+    first = Tool(shared_tool)
+    second = Tool(shared_tool)
+
+    async def prepare(ctx: RunContext[None], tool_def: ToolDefinition) -> ToolDefinition:
+        tool_def.parameters_json_schema['properties']['x']['description'] = 'Modified.'
+        return tool_def
+
+    first.prepare = prepare
+    Agent(TestModel(), tools=[first]).run_sync('Hello')
+    tool_def = second._build_tool_def()
+    assert tool_def.parameters_json_schema['properties']['x'] == snapshot(
+        {'description': 'The number to double.', 'title': 'X', 'type': 'integer'}
+    )
+
+
+def test_registered_tool_keeps_description():
+    tool = Tool(shared_tool, description='Custom description.')
+    agent = Agent(TestModel(), tools=[tool])
+    registered = agent._function_tools['shared_tool']
+    assert registered is not tool
+    assert (registered.description, registered.max_retries) == ('Custom description.', 1)
+    assert tool.max_retries is None
+
+    # tools which don't need changing are only copied when they're registered with another agent
+    tool = Tool(shared_tool, max_retries=2)
+    assert Agent(TestModel(), tools=[tool])._function_tools['shared_tool'] is tool
+    assert Agent(TestModel(), tools=[tool])._function_tools['shared_tool'] is not tool
+
+
+def test_replace_keeps_description():
+    tool = Tool(shared_tool, description='Custom description.')
+    replaced = dataclasses.replace(tool, name='renamed')
+    assert (replaced.name, replaced.description) == ('renamed', 'Custom description.')
+    assert replaced._build_tool_def().description == 'Custom description.'
+    assert dataclasses.replace(tool) == tool
+    assert dataclasses.replace(tool, description='Other description.') != tool
+
+    replaced = dataclasses.replace(Tool(shared_tool), name='renamed')
+    assert replaced.description == 'Double a number.'
+    assert Tool(shared_tool) == Tool(shared_tool)
+    assert repr(Tool(shared_tool)).count("description='Double a number.'") == 1
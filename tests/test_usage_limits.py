@@ -168,3 +168,27 @@ async def test_multi_agent_usage_sync():
     result = await controller_agent.run('foobar')
     assert result.data == snapshot('{"delegate_to_other_agent":0}')
     assert result.usage() == snapshot(Usage(requests=7, request_tokens=105, response_tokens=16, total_tokens=120))
+
+
+async def test_run_many_batch_limits() -> None:
+    test_agent = Agent(TestModel())
+    usage = Usage()
+
+    results = await test_agent.run_many(
+        ['a', 'b', 'c'], batch_usage_limits=UsageLimits(request_limit=3), usage=usage, return_exceptions=True
+    )
+    assert [r.data for r in results if not isinstance(r, Exception)] == snapshot(
+        ['success (no tool calls)', 'success (no tool calls)', 'success (no tool calls)']
+    )
+    assert usage == snapshot(Usage(requests=3, request_tokens=153, response_tokens=12, total_tokens=165))
+
+    # concurrent runs can't start more requests than the batch allows between them
+    results = await test_agent.run_many(
+        ['a', 'b', 'c'], batch_usage_limits=UsageLimits(request_limit=2), max_concurrency=3, return_exceptions=True
+    )
+    assert [type(r).__name__ for r in results] == snapshot(['RunResult', 'RunResult', 'UsageLimitExceeded'])
+
+    with pytest.raises(
+        UsageLimitExceeded, match=re.escape('Exceeded the total_tokens_limit of 100 (total_tokens=110)')
+    ):
+        await test_agent.run_many(['a', 'b', 'c'], batch_usage_limits=UsageLimits(total_tokens_limit=100))
@@ -1,13 +1,25 @@
 from __future__ import annotations as _annotations
 
 import asyncio
+import gc
 from collections.abc import AsyncIterator
+from dataclasses import dataclass
 
 import pytest
 from inline_snapshot import snapshot
+from pytest_mock import MockerFixture
 
 from pydantic_ai import UserError
-from pydantic_ai._utils import UNSET, Either, PeekableAsyncStream, check_object_json_schema, group_by_temporal
+from pydantic_ai._utils import (
+    UNSET,
+    Either,
+    IdentityCache,
+    IdentitySequenceCache,
+    LRUCache,
+    PeekableAsyncStream,
+    check_object_json_schema,
+    group_by_temporal,
+)
 
 from .models.mock_async_stream import MockAsyncStream
 
@@ -76,3 +88,84 @@ async def test_peekable_async_stream(peek_first: bool):
     assert await peekable_async_stream.is_exhausted()
     assert await peekable_async_stream.peek() is UNSET
     assert items == [1, 2, 3]
+
+
+def test_identity_cache():
+    @dataclass
+    class Thing:
+        parts: list[str]
+
+    cache = IdentityCache[Thing, str]()
+    calls: list[Thing] = []
+
+    def compute(t: Thing) -> str:
+        calls.append(t)
+        return ','.join(t.parts)
+
+    a, b = Thing(['x']), Thing(['x'])
+    assert cache.get(a, compute, a.parts) == 'x'
+    assert cache.get(a, compute, a.parts) == 'x'
+    # equal but not identical objects don't share an entry
+    assert cache.get(b, compute, b.parts) == 'x'
+    assert calls == [a, b]
+
+    # replacing a dependency invalidates the entry
+    a.parts[0] = 'y'
+    assert cache.get(a, compute, a.parts) == 'y'
+    assert len(calls) == 3
+
+    del calls[:], b
+    gc.collect()
+    assert len(cache) == 1
+
+
+def test_identity_sequence_cache():
+    @dataclass
+    class Thing:
+        name: str
+
+    cache = IdentitySequenceCache[Thing, str](maxsize=1)
+    calls: list[Thing] = []
+
+    def compute(t: Thing) -> str:
+        calls.append(t)
+        return t.name
+
+    def dependencies(t: Thing) -> list[object]:
+        return [t.name]
+
+    a, b, c = Thing('a'), Thing('b'), Thing('c')
+    values = cache.get([a, b], compute, dependencies)
+    assert values == ['a', 'b']
+    assert cache.get((a, b), compute, dependencies) is values
+    assert calls == [a, b]
+
+    # a different sequence only computes the values of new objects
+    assert cache.get([a, c], compute, dependencies) == ['a', 'c']
+    assert calls == [a, b, c]
+
+    # replacing a dependency invalidates the cached sequence and the object's value
+    c.name = 'd'
+    assert cache.get([a, c], compute, dependencies) == ['a', 'd']
+    assert calls == [a, b, c, c]
+
+
+def test_lru_cache(mocker: MockerFixture):
+    now = 0.0
+    mocker.patch('pydantic_ai._utils.time.monotonic', side_effect=lambda: now)
+
+    cache = LRUCache[str, int](maxsize=2, ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+    assert len(cache) == 2
+
+    now = 10
+    assert cache.get('a') is None
+    assert cache.pop('c') == 3
+    assert cache.pop('c') is None
+    cache.set('d', 4)
+    cache.clear()
+    assert len(cache) == 0
@@ -127,6 +127,11 @@ async def ok_validator_ctx(ctx: RunContext[MyDeps], data: str) -> str:
     return data
 
 
+@typed_agent.result_validator(partial=False)
+def ok_validator_not_partial(data: str) -> str:
+    return data
+
+
 # we have overloads for every possible signature of result_validator, so the type of decorated functions is correct
 assert_type(ok_validator_simple, Callable[[str], str])
 assert_type(ok_validator_ctx, Callable[[RunContext[MyDeps], str], Awaitable[str]])